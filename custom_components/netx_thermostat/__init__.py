@@ -1,51 +1,299 @@
 """The NetX Thermostat integration."""
+import asyncio
 import logging
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD, CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
-from .const import DOMAIN, DEFAULT_PORT
+from .const import (
+    DOMAIN,
+    DEFAULT_PORT,
+    CONF_BACKGROUND_SETUP,
+    DEFAULT_BACKGROUND_SETUP,
+    CONF_ENABLE_HTTP,
+    DEFAULT_ENABLE_HTTP,
+    CAPABILITIES_HTTP,
+    CAPABILITIES_COMMANDS,
+    CONF_QUICK_POLLS,
+    DEFAULT_QUICK_POLLS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_COMMAND_TIMEOUT,
+    CONF_HTTP_TIMEOUT,
+    CONF_MAX_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_CO2_DEADBAND,
+    CONF_MIN_REPORT_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_CO2_DEADBAND,
+    DEFAULT_MIN_REPORT_INTERVAL,
+    DEADBAND_TEMPERATURE,
+    DEADBAND_HUMIDITY,
+    DEADBAND_CO2,
+    CONF_EXTERNAL_STATISTICS,
+    DEFAULT_EXTERNAL_STATISTICS,
+    CONNECTION_TIMEOUT,
+    COMMAND_TIMEOUT,
+    HTTP_TIMEOUT,
+    UPDATE_INTERVAL,
+    HTTP_ENDPOINT_PATHS,
+    DATA_SETUP_LIMITER,
+    DATA_STATISTICS,
+    MAX_CONCURRENT_SETUPS,
+)
 from .api import NetXThermostatAPI
 from .coordinator import NetXDataUpdateCoordinator
+from .entity import build_device_info
+from .handoff import async_claim_client
+from .services import async_setup_services
+from . import capabilities
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.CLIMATE, Platform.SENSOR, Platform.SWITCH, Platform.NUMBER]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services shared by every thermostat."""
+    async_setup_services(hass)
+    return True
+
+
+def _setup_limiter(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent first connections."""
+    if (limiter := hass.data.get(DATA_SETUP_LIMITER)) is None:
+        limiter = hass.data[DATA_SETUP_LIMITER] = asyncio.Semaphore(MAX_CONCURRENT_SETUPS)
+    return limiter
+
+
+@callback
+def _async_apply_options(
+    entry: ConfigEntry, api: NetXThermostatAPI, coordinator: NetXDataUpdateCoordinator
+) -> None:
+    """Apply the entry options to a running client and coordinator."""
+    options = entry.options
+    api.configure(
+        connect_timeout=options.get(CONF_CONNECT_TIMEOUT, CONNECTION_TIMEOUT),
+        command_timeout=options.get(CONF_COMMAND_TIMEOUT, COMMAND_TIMEOUT),
+        http_timeout=options.get(CONF_HTTP_TIMEOUT, HTTP_TIMEOUT),
+        enable_http=options.get(CONF_ENABLE_HTTP, DEFAULT_ENABLE_HTTP),
+        max_concurrency=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+    )
+    coordinator.set_poll_interval(
+        options.get(CONF_SCAN_INTERVAL, UPDATE_INTERVAL),
+        options.get(CONF_QUICK_POLLS, DEFAULT_QUICK_POLLS),
+    )
+    coordinator.set_reporting(
+        {
+            DEADBAND_TEMPERATURE: options.get(
+                CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+            ),
+            DEADBAND_HUMIDITY: options.get(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND),
+            DEADBAND_CO2: options.get(CONF_CO2_DEADBAND, DEFAULT_CO2_DEADBAND),
+        },
+        options.get(CONF_MIN_REPORT_INTERVAL, DEFAULT_MIN_REPORT_INTERVAL),
+    )
+    if options.get(CONF_EXTERNAL_STATISTICS, DEFAULT_EXTERNAL_STATISTICS):
+        coordinator.set_statistics(
+            f"{DOMAIN}:{slugify(entry.unique_id or entry.entry_id)}", entry.title
+        )
+    else:
+        coordinator.set_statistics(None)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options live, keeping the TCP session and entities."""
+    if (data := hass.data[DOMAIN].get(entry.entry_id)) is None:
+        return
+    # Capability writes update the entry too, without touching the options
+    if entry.options == data["options"]:
+        return
+    data["options"] = dict(entry.options)
+    _async_apply_options(entry, data["api"], data["coordinator"])
+    _async_add_http_sensors(hass, entry)
+
+
+@callback
+def _async_add_http_sensors(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Add the sensors of HTTP endpoints polled since the platform was set up."""
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data and data["api"].enable_http and (add_http_sensors := data.get("add_http_sensors")):
+        add_http_sensors()
+
+
+async def _async_background_first_refresh(
+    hass: HomeAssistant, coordinator: NetXDataUpdateCoordinator
+) -> None:
+    """Run the first handshake and snapshot after the platforms are up."""
+    async with _setup_limiter(hass):
+        await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        _LOGGER.warning(
+            "NetX Thermostat at %s not reachable yet, will keep retrying: %s",
+            coordinator.api.host,
+            coordinator.api.state.last_error,
+        )
+
+
+async def _async_deferred_setup(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: NetXDataUpdateCoordinator,
+    first_refresh: bool,
+    probe_http: bool,
+    probe_commands: bool,
+) -> None:
+    """Finish the setup steps that do not need to hold up startup."""
+    if first_refresh:
+        await _async_background_first_refresh(hass, coordinator)
+    if probe_http:
+        await _async_probe_http_capabilities(hass, entry, coordinator.api)
+    if probe_commands and coordinator.last_update_success:
+        await _async_probe_command_capabilities(hass, entry, coordinator.api)
+
+
+async def _async_probe_http_capabilities(
+    hass: HomeAssistant, entry: ConfigEntry, api: NetXThermostatAPI
+) -> None:
+    """Probe the HTTP endpoints, cache the result and stop polling missing ones."""
+    supported = await api.async_probe_http()
+    complete = len(supported) == len(HTTP_ENDPOINT_PATHS)
+    capabilities.async_store_section(
+        hass, entry, CAPABILITIES_HTTP, capabilities.build_section(supported, complete)
+    )
+    api.http_endpoints = capabilities.http_endpoints(entry)
+    _async_add_http_sensors(hass, entry)
+    _LOGGER.debug("HTTP capabilities of %s: %s", api.host, supported)
+
+
+async def _async_probe_command_capabilities(
+    hass: HomeAssistant, entry: ConfigEntry, api: NetXThermostatAPI
+) -> None:
+    """Probe the read commands over the live session and cache the result."""
+    results = await api.async_probe_commands()
+    capabilities.async_store_section(
+        hass, entry, CAPABILITIES_COMMANDS, capabilities.build_command_section(results)
+    )
+    _LOGGER.debug("Read command capabilities of %s: %s", api.host, results)
+
+
+@callback
+def _enabled_platforms(hass: HomeAssistant, entry: ConfigEntry) -> list[Platform]:
+    """Return the platforms to set up, skipping those whose entities are all disabled.
+
+    A platform never set up before is always included, and enabling one of
+    its entities reloads the entry, which brings it back.
+    """
+    registry = er.async_get(hass)
+    entities = er.async_entries_for_config_entry(registry, entry.entry_id)
+    return [
+        platform
+        for platform in PLATFORMS
+        if not (known := [e for e in entities if e.domain == platform])
+        or any(not e.disabled for e in known)
+    ]
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up NetX Thermostat from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    api = NetXThermostatAPI(
-        host=entry.data[CONF_HOST],
-        username=entry.data[CONF_USERNAME],
-        password=entry.data[CONF_PASSWORD],
-        port=entry.data.get(CONF_PORT, DEFAULT_PORT),
-    )
-    
-    if not await api.test_connection():
-        raise ConfigEntryNotReady(
-            f"Failed to connect to NetX Thermostat at {entry.data[CONF_HOST]}: {api.state.last_error}"
+    # Reuse the session the config flow authenticated, if it is still parked
+    api = async_claim_client(hass, entry.unique_id)
+    if api is None:
+        api = NetXThermostatAPI(
+            host=entry.data[CONF_HOST],
+            username=entry.data[CONF_USERNAME],
+            password=entry.data[CONF_PASSWORD],
+            port=entry.data.get(CONF_PORT, DEFAULT_PORT),
+            enable_http=entry.options.get(CONF_ENABLE_HTTP, DEFAULT_ENABLE_HTTP),
+            http_endpoints=capabilities.http_endpoints(entry),
         )
-    
+
+    api.set_command_capabilities(*capabilities.command_capabilities(entry))
+
     coordinator = NetXDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    # Kept until setup succeeds, so a retried setup still finds the hour
+    suspended = hass.data.setdefault(DATA_STATISTICS, {})
+    if (aggregator := suspended.get(entry.entry_id)) is not None:
+        coordinator.async_resume_statistics(aggregator)
+    _async_apply_options(entry, api, coordinator)
+    background = entry.options.get(
+        CONF_BACKGROUND_SETUP, entry.data.get(CONF_BACKGROUND_SETUP, DEFAULT_BACKGROUND_SETUP)
+    )
+
+    # Entities are created from cached capabilities; a unit never probed
+    # polls every endpoint until the background probe has cached its result
+    probe_http = api.enable_http and capabilities.is_stale(entry, CAPABILITIES_HTTP)
+
+    if api.state.connected and api.state.updated_at:
+        # The config flow already took the first snapshot; a session from
+        # a network scan is only logged in and still needs its first poll
+        coordinator.async_set_updated_data(api.state)
+    elif background:
+        # Entities stay unavailable until the background refresh lands
+        coordinator.last_update_success = False
+    else:
+        # connect, login and first poll happen in one pass
+        try:
+            async with _setup_limiter(hass):
+                await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await api.disconnect()
+            raise
 
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "api": api,
+        "device_info": build_device_info(entry),
+        "options": dict(entry.options),
+        "platforms": _enabled_platforms(hass, entry),
     }
+    suspended.pop(entry.entry_id, None)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(
+        entry, hass.data[DOMAIN][entry.entry_id]["platforms"]
+    )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Read commands are probed over the live session, after the first poll
+    first_refresh = background and coordinator.data is None
+    probe_commands = capabilities.is_stale(entry, CAPABILITIES_COMMANDS)
+    if first_refresh or probe_http or probe_commands:
+        entry.async_create_background_task(
+            hass,
+            _async_deferred_setup(hass, entry, coordinator, first_refresh, probe_http, probe_commands),
+            f"{DOMAIN} deferred setup {api.host}",
+        )
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    platforms = hass.data[DOMAIN][entry.entry_id]["platforms"]
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
         data = hass.data[DOMAIN].pop(entry.entry_id)
+        if (aggregator := data["coordinator"].async_suspend_statistics()) is not None:
+            hass.data.setdefault(DATA_STATISTICS, {})[entry.entry_id] = aggregator
         await data["api"].disconnect()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the hours in progress kept for a removed entry."""
+    hass.data.get(DATA_STATISTICS, {}).pop(entry.entry_id, None)
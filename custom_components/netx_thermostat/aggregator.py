@@ -0,0 +1,60 @@
+"""Hourly mean, min and max of polled readings, kept in memory."""
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+HOUR = 3600
+
+
+@dataclass(slots=True)
+class HourBucket:
+    """Readings of one metric within one clock hour."""
+
+    start: float  # Epoch seconds at the top of the hour
+    unit: str | None
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the readings."""
+        return self.total / self.count
+
+    def add(self, value: float) -> None:
+        """Count one reading."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+class HourlyAggregator:
+    """Folds readings into one bucket per metric and hour.
+
+    A bucket closes when a reading of the same metric arrives in a later
+    hour or with another unit; ``add`` returns the closed buckets, so
+    each is written out exactly once. Memory is one open bucket per
+    metric, however long the entry runs.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no open buckets."""
+        self._open: dict[str, HourBucket] = {}
+
+    def add(
+        self, samples: Mapping[str, tuple[float, str | None]], when: float | None = None
+    ) -> list[tuple[str, HourBucket]]:
+        """Count ``{metric: (value, unit)}`` readings; return the buckets they closed."""
+        when = time.time() if when is None else when
+        start = when - when % HOUR
+        closed = []
+        for metric, (value, unit) in samples.items():
+            bucket = self._open.get(metric)
+            if bucket is None or bucket.start != start or bucket.unit != unit:
+                if bucket is not None:
+                    closed.append((metric, bucket))
+                bucket = self._open[metric] = HourBucket(start, unit)
+            bucket.add(value)
+        return closed
@@ -1,24 +1,27 @@
 """NetX Thermostat TCP API Client with HTTP sensor support."""
 import asyncio
-import hashlib
-import base64
 import logging
-import re
-import aiohttp
-from dataclasses import dataclass
+import time
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING, NamedTuple
 
 from .const import (
     DEFAULT_PORT,
     CONNECTION_TIMEOUT,
     COMMAND_TIMEOUT,
-    CMD_LOGIN,
+    MAX_STALE_REPLIES,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_REFRESH,
+    PRIORITY_BACKGROUND,
+    WATCH_QUEUE_SIZE,
+    WATCH_DROP_OLDEST,
+    HTTP_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY,
+    HTTP_ENDPOINT_PATHS,
+    HTTP_SCHEDULE_PATH,
     CMD_GET_TEMP_SCALE,
     CMD_GET_ALL_STATES,
-    CMD_GET_OPERATION_MODE,
     CMD_GET_RELAY_MODE,
-    CMD_GET_HUMIDIFICATION,
-    CMD_GET_DEHUMIDIFICATION,
-    CMD_GET_RELAY_STATE,
     CMD_SET_MODE_MANUAL,
     CMD_SET_MODE_SCHEDULE,
     CMD_SET_FAN_MANUAL,
@@ -30,74 +33,57 @@ from .const import (
     CMD_SET_RELAY_MODE,
     CMD_SET_HUMIDIFICATION,
     CMD_SET_DEHUMIDIFICATION,
-    RESP_LOGIN_OK,
-    RESP_TEMP_SCALE,
-    RESP_ALL_STATES,
-    RESP_OPERATION_MODE,
-    RESP_RELAY_MODE,
-    RESP_HUMIDIFICATION,
-    RESP_DEHUMIDIFICATION,
-    RESP_RELAY_STATE,
-    OPERATION_MODE_MANUAL,
+    PROBE_SUPPORTED,
+    PROBE_TIMEOUT,
+    DEVICE_BREAKER_THRESHOLD,
+    DEVICE_BREAKER_RESET,
+    DEVICE_BREAKER_MAX_RESET,
+    DEVICE_BREAKER_JITTER,
 )
+from .circuit import STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+from .planner import SourcePlanner
+from .protocol import (
+    HTTP_ENDPOINT_FIELDS,
+    HTTP_FIELDS,
+    READ_COMMANDS,
+    STAGE_FIELDS,
+    NetXThermostatState,
+    ReadCommand,
+    build_login,
+    classify_response,
+    is_login_ok,
+    is_write_ok,
+    strip_prefix,
+)
+from .rtt import RttEstimator
+from .schedule import parse_schedule
+from .scheduler import CommandScheduler
+from .transport import ExchangeTimeout, NetXTransport
+from .watch import StateBroadcaster, StateChange
+
+if TYPE_CHECKING:
+    from .http_sensors import NetXHttpSensors
 
 _LOGGER = logging.getLogger(__name__)
 
+__all__ = ["NetXThermostatAPI", "NetXThermostatState", "StateChange"]
+
+
+class PollPlan(NamedTuple):
+    """The read commands and HTTP endpoints one kind of poll reads."""
+
+    commands: tuple[ReadCommand, ...]
+    endpoints: frozenset[str]
 
-@dataclass
-class NetXThermostatState:
-    """Representation of thermostat state from TCP API."""
-    
-    # Basic state from RAS1
-    indoor_temp: float | None = None
-    outdoor_temp: float | None = None
-    hvac_mode: str | None = None
-    fan_mode: str | None = None
-    override_active: bool = False
-    recovery_active: bool = False
-    cool_setpoint: int | None = None
-    heat_setpoint: int | None = None
-    operating_status: str | None = None
-    stage: int | None = None
-    event: str | None = None
-    
-    # Derived state
-    is_idle: bool = True  # True when stage=0
-    
-    # From other commands
-    temp_scale: str = "F"
-    is_manual_mode: bool = True
-    operation_mode: str = "Manual"
-    
-    # Humidity relay
-    relay1_mode: str | None = None
-    relay2_mode: str | None = None
-    relay_state: str | None = None
-    
-    # Humidification settings
-    hum_control_mode: str | None = None
-    hum_setpoint: int | None = None
-    hum_variance: int | None = None
-    
-    # Dehumidification settings
-    dehum_control_mode: str | None = None
-    dehum_setpoint: int | None = None
-    dehum_variance: int | None = None
-    
-    # HTTP-sourced sensor data
-    humidity: int | None = None  # From index.xml
-    co2_level: int | None = None  # From co2.json
-    co2_peak_level: int | None = None  # Peak CO2 from co2.json
-    co2_alert_level: int | None = None  # Alert threshold
-    co2_in_alert: bool = False  # Currently in alert state
-    
-    # Connection status
-    connected: bool = False
-    last_error: str | None = None
 
 
 class NetXThermostatAPI:
-    """TCP API client for NetX Thermostat with HTTP sensor support."""
+    """TCP API client for NetX Thermostat with HTTP sensor support.
+
+    Composes the TCP transport with the protocol codec. The HTTP sensor
+    client is imported and created on first use, only when ``enable_http``
+    is set.
+    """
 
     def __init__(
         self,
@@ -105,389 +91,595 @@ class NetXThermostatAPI:
         username: str,
         password: str,
         port: int = DEFAULT_PORT,
+        enable_http: bool = True,
+        http_endpoints: Iterable[str] | None = None,
+        connect_timeout: float = CONNECTION_TIMEOUT,
+        command_timeout: float = COMMAND_TIMEOUT,
+        http_timeout: float = HTTP_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ) -> None:
         """Initialize the API client."""
         self.host = host
         self.port = port
         self.username = username
         self.password = password
-        
+        self.enable_http = enable_http
+        self._http_endpoints = None if http_endpoints is None else set(http_endpoints)
+
+        # Tunables, see configure()
+        self.connect_timeout = connect_timeout
+        self.command_timeout = command_timeout
+        self.http_timeout = http_timeout
+        self.max_concurrency = max_concurrency
+
         # TCP connection
-        self._reader: asyncio.StreamReader | None = None
-        self._writer: asyncio.StreamWriter | None = None
-        self._lock = asyncio.Lock()
+        self._transport = NetXTransport(host, port)
+        self._transport.rtt.max_timeout = command_timeout
         self._authenticated = False
-        
-        # HTTP session for sensor data
-        self._http_session: aiohttp.ClientSession | None = None
-        self._http_auth = aiohttp.BasicAuth(username, password)
-        
+
+        # HTTP sensor client, created lazily
+        self._http: "NetXHttpSensors | None" = None
+
+        # Read command support from the capability probe (command -> bool)
+        # and the latency measured for each command, in seconds
+        self.command_support: dict[str, bool] = {}
+        self.command_latency: dict[str, float] = {}
+        self.command_failures = 0
+        self.connects = 0
+        # Stops polling an unreachable unit, see async_update
+        self.breaker = CircuitBreaker(
+            DEVICE_BREAKER_THRESHOLD,
+            DEVICE_BREAKER_RESET,
+            DEVICE_BREAKER_MAX_RESET,
+            DEVICE_BREAKER_JITTER,
+        )
+        self._static_done: set[str] = set()
+        # Measures every source and picks the cheapest ones, see poll_plan
+        self.planner = SourcePlanner()
+        self._plans: dict[bool, PollPlan] = {}
+        # Sources of the last full and quick plans, kept across rebuilds
+        self._chosen: dict[bool, list[str]] = {}
+        # Fields something shows, see set_wanted_fields; None wants them all
+        self._wanted: frozenset[str] | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
         self.state = NetXThermostatState()
+        self._changes = StateBroadcaster()
 
-    def _generate_auth_hash(self) -> str:
-        """Generate the authentication hash."""
-        auth_string = f"{self.username}:{self.password}"
-        sha256_hash = hashlib.sha256(auth_string.encode()).digest()
-        return base64.b64encode(sha256_hash).decode()
+        # Weekly schedule from the last read of /schedule.xml
+        self.schedule: dict[str, str] | None = None
+        self._schedule_read = 0.0
 
-    async def connect(self) -> bool:
-        """Connect and authenticate with the thermostat."""
+    async def connect(self, timeout: float | None = None) -> bool:
+        """Connect and authenticate with the thermostat.
+
+        ``timeout`` lowers the configured connect timeout for this attempt.
+        """
+        self._authenticated = False
+        connect_timeout = self.connect_timeout
+        if timeout is not None:
+            connect_timeout = min(timeout, connect_timeout)
         try:
-            async with self._lock:
-                await self._close_connection_locked()
-                
-                _LOGGER.debug("Connecting to %s:%s", self.host, self.port)
-                self._reader, self._writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.host, self.port),
-                    timeout=CONNECTION_TIMEOUT
-                )
-                
-                auth_hash = self._generate_auth_hash()
-                login_cmd = f"{CMD_LOGIN}{self.username},{auth_hash}\r\n"
-                
-                self._writer.write(login_cmd.encode())
-                await self._writer.drain()
-                
-                response = await asyncio.wait_for(
-                    self._reader.readline(),
-                    timeout=COMMAND_TIMEOUT
-                )
-                response_str = response.decode().strip()
-                
-                if response_str.startswith(RESP_LOGIN_OK):
-                    self._authenticated = True
-                    self.state.connected = True
-                    self.state.last_error = None
-                    _LOGGER.info("Connected to NetX Thermostat at %s", self.host)
-                    return True
-                else:
-                    self._authenticated = False
-                    self.state.connected = False
-                    self.state.last_error = f"Authentication failed: {response_str}"
-                    _LOGGER.error("Authentication failed: %s", response_str)
-                    return False
-                    
+            response_str = await self._transport.open(
+                build_login(self.username, self.password), connect_timeout
+            )
+
+            if is_login_ok(response_str):
+                self._authenticated = True
+                self.connects += 1
+                self._static_done.clear()
+                self.state.connected = True
+                self.state.last_error = None
+                _LOGGER.info("Connected to NetX Thermostat at %s", self.host)
+                return True
+
+            self.state.connected = False
+            self.state.last_error = f"Authentication failed: {response_str}"
+            _LOGGER.error("Authentication failed: %s", response_str)
+            await self._transport.close()
+            return False
+
         except asyncio.TimeoutError:
             self.state.connected = False
             self.state.last_error = "Connection timeout"
             _LOGGER.error("Connection timeout to %s:%s", self.host, self.port)
-            return False
         except OSError as err:
             self.state.connected = False
             self.state.last_error = f"Connection failed: {err}"
             _LOGGER.error("Connection error: %s", err)
-            return False
         except Exception as err:
             self.state.connected = False
             self.state.last_error = str(err)
             _LOGGER.error("Unexpected error: %s", err)
-            return False
 
-    async def _close_connection_locked(self) -> None:
-        """Close connection (must hold lock)."""
-        if self._writer:
-            try:
-                self._writer.close()
-                await self._writer.wait_closed()
-            except Exception:
-                pass
-        self._reader = None
-        self._writer = None
-        self._authenticated = False
+        await self._transport.close()
+        return False
 
     async def disconnect(self) -> None:
         """Disconnect from the thermostat."""
-        async with self._lock:
-            await self._close_connection_locked()
-            self.state.connected = False
-        
+        await self._transport.close()
+        self._authenticated = False
+        self.state.connected = False
+
         # Close HTTP session
-        if self._http_session and not self._http_session.closed:
-            await self._http_session.close()
-            self._http_session = None
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def _send_command(
+        self,
+        command: str,
+        timeout: float | None = None,
+        limit: float | None = None,
+        priority: int = PRIORITY_REFRESH,
+        raw: bool = False,
+    ) -> str | bytes | None:
+        """Send a command and receive response.
+
+        Without ``timeout`` the deadline adapts to the unit's measured
+        response time, bounded by ``command_timeout`` and ``limit``.
+        ``priority`` orders the command against the others waiting, and
+        ``raw`` returns the undecoded line.
+        """
+        response, _ = await self._send_command_timed(command, timeout, limit, priority, raw)
+        return response
+
+    async def _send_command_timed(
+        self,
+        command: str,
+        timeout: float | None = None,
+        limit: float | None = None,
+        priority: int = PRIORITY_REFRESH,
+        raw: bool = False,
+    ) -> tuple[str | bytes | None, float | None]:
+        """Like ``_send_command``, also returning the seconds spent on the wire.
 
-    async def _send_command(self, command: str) -> str | None:
-        """Send a command and receive response."""
+        The time is None when the command was never exchanged, e.g. while
+        the unit is unreachable or the session broke.
+        """
         if not self._authenticated:
-            if not await self.connect():
-                return None
-        
+            # Fail fast while the unit is known to be unreachable
+            if self.breaker.state == STATE_OPEN or not await self.connect():
+                return None, None
+
         try:
-            async with self._lock:
-                if not self._writer or not self._reader:
-                    return None
-                
-                self._writer.write(f"{command}\r\n".encode())
-                await self._writer.drain()
-                
-                response = await asyncio.wait_for(
-                    self._reader.readline(),
-                    timeout=COMMAND_TIMEOUT
-                )
-                response_str = response.decode().strip()
-                
-                _LOGGER.debug("Command: %s -> %s", command, response_str)
-                return response_str
-                
-        except asyncio.TimeoutError:
-            _LOGGER.warning("Command timeout: %s", command)
+            response_str, elapsed = await self._transport.request_timed(
+                command, timeout, limit, priority, raw
+            )
+            _LOGGER.debug("Command: %s -> %s", command, response_str)
+            return response_str, elapsed
+
+        except asyncio.TimeoutError as err:
+            # The late reply is skipped by the transport, so the session
+            # survives unless too many replies are owed
+            elapsed = err.elapsed if isinstance(err, ExchangeTimeout) else None
+            self.command_failures += 1
+            self.state.last_error = f"Command timeout: {command}"
+            if self._transport.stale < MAX_STALE_REPLIES:
+                _LOGGER.warning("Command timeout: %s", command)
+                return None, elapsed
+            _LOGGER.warning(
+                "Command timeout: %s, %s replies outstanding, reconnecting",
+                command,
+                self._transport.stale,
+            )
             self._authenticated = False
             self.state.connected = False
-            return None
+            return None, elapsed
         except Exception as err:
             _LOGGER.error("Command error: %s - %s", command, err)
+            self.command_failures += 1
             self._authenticated = False
             self.state.connected = False
-            return None
+            return None, None
+
+    def configure(
+        self,
+        *,
+        connect_timeout: float | None = None,
+        command_timeout: float | None = None,
+        http_timeout: float | None = None,
+        enable_http: bool | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        """Change tunables on a live client without dropping the session.
+
+        Takes effect from the next command. Disabling HTTP clears the
+        HTTP-sourced readings so their entities go unavailable.
+        """
+        if connect_timeout is not None:
+            self.connect_timeout = connect_timeout
+        if command_timeout is not None:
+            self.command_timeout = command_timeout
+            self._transport.rtt.max_timeout = command_timeout
+        if http_timeout is not None:
+            self.http_timeout = http_timeout
+            if self._http is not None:
+                self._http.timeout = http_timeout
+        if max_concurrency is not None:
+            self.max_concurrency = max(1, max_concurrency)
+        if enable_http is not None and enable_http != self.enable_http:
+            self.enable_http = enable_http
+            self._plans.clear()
+            if not enable_http:
+                for name in HTTP_FIELDS:
+                    setattr(self.state, name, None)
+                self.state.co2_in_alert = False
+                self._changes.publish(self.state)
+                if self._http is not None:
+                    self._http_endpoints = set(self._http.endpoints)
+                    self._close_http_later()
+
+    def _close_http_later(self) -> None:
+        """Drop the HTTP client, closing its session in the background."""
+        http, self._http = self._http, None
+        task = asyncio.get_running_loop().create_task(http.close())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @property
+    def rtt(self) -> RttEstimator:
+        """Return the response time estimator of this unit."""
+        return self._transport.rtt
+
+    @property
+    def scheduler(self) -> CommandScheduler:
+        """Return the command scheduler of this unit, with its queue metrics."""
+        return self._transport.scheduler
+
+    def is_command_supported(self, command: str) -> bool:
+        """Return True if a read command is worth sending to this unit."""
+        supported = self.command_support.get(command)
+        if supported is None:
+            return READ_COMMANDS[command].core
+        return supported
+
+    def set_command_capabilities(
+        self, support: dict[str, bool], latency: dict[str, float] | None = None
+    ) -> None:
+        """Apply cached probe results and rebuild the poll plans."""
+        self.command_support = dict(support)
+        if latency:
+            self.command_latency.update(latency)
+            self.planner.priors.update(latency)
+        self._plans.clear()
+
+    @property
+    def wanted_fields(self) -> frozenset[str] | None:
+        """Return the state fields polled for, None for all of them."""
+        return self._wanted
 
-    async def async_update(self) -> NetXThermostatState:
-        """Fetch all data from the thermostat."""
+    def set_wanted_fields(self, fields: Iterable[str] | None) -> None:
+        """Only poll the sources of ``fields`` from now on; None polls everything."""
+        wanted = None if fields is None else frozenset(fields)
+        if wanted != self._wanted:
+            self._wanted = wanted
+            self._plans.clear()
+
+    def planned_endpoints(self) -> frozenset[str]:
+        """Return the HTTP endpoints a full poll reads."""
+        return self._plan(True).endpoints
+
+    def poll_plan(self, full: bool = True) -> tuple[ReadCommand, ...]:
+        """Return the read commands for a full or a quick poll."""
+        return self._plan(full).commands
+
+    def _plan(self, full: bool) -> PollPlan:
+        """Return the sources of a full or a quick poll, planning them if needed.
+
+        A full poll covers the wanted fields (all fields when nothing is
+        wanted), a quick poll the stage fields. Among the supported
+        commands, and the polled HTTP endpoints for a full poll, the
+        planner picks the cheapest set carrying them, e.g. RAS1 or RSS1 for
+        the stage and RRHS1 or /index.xml for humidity. Plans are rebuilt
+        when the measured costs call for it. A plan reads RAS1 when it
+        would read nothing else, which keeps the session checked.
+        """
+        if self.planner.needs_review:
+            self._plans.clear()
+        if (plan := self._plans.get(full)) is not None:
+            return plan
+
+        sources = {
+            rc.command: rc.fields
+            for rc in READ_COMMANDS.values()
+            if self.is_command_supported(rc.command)
+        }
+        if full and self.enable_http:
+            sources.update(
+                (HTTP_ENDPOINT_PATHS[name], HTTP_ENDPOINT_FIELDS[name])
+                for name in HTTP_ENDPOINT_PATHS
+                if name in self.http_endpoints
+            )
+        if not full:
+            needed = STAGE_FIELDS
+        elif self._wanted is None:
+            needed = set().union(*sources.values())
+        else:
+            needed = self._wanted
+
+        previous = self._chosen.get(full, [])
+        chosen = self._chosen[full] = self.planner.choose(sources, needed, previous)
+        if previous and chosen != previous:
+            _LOGGER.debug(
+                "%s: %s poll now reads %s instead of %s",
+                self.host,
+                "Full" if full else "Quick",
+                ", ".join(chosen),
+                ", ".join(previous),
+            )
+        commands = tuple(READ_COMMANDS[source] for source in chosen if source in READ_COMMANDS)
+        plan = PollPlan(
+            commands or (READ_COMMANDS[CMD_GET_ALL_STATES],),
+            frozenset(name for name, path in HTTP_ENDPOINT_PATHS.items() if path in chosen),
+        )
+        self._plans[full] = plan
+        return plan
+
+    async def async_update(
+        self, full: bool = True, budget: float | None = None
+    ) -> NetXThermostatState:
+        """Fetch data from the thermostat and notify watchers of changes.
+
+        See ``_async_update`` for the cycle itself. Cycles that refresh
+        nothing trip ``breaker``: once open, updates return at once
+        without touching the network until the backoff has passed. The
+        next update then only tries to connect and log in, and polls only
+        if that succeeds, so a unit still down costs one connect timeout.
+        """
+        if self.breaker.allow() and (
+            self.breaker.state != STATE_HALF_OPEN or await self._async_trial(budget)
+        ):
+            started = time.time()
+            ok = False
+            try:
+                await self._async_update(full, budget)
+                ok = self.state.updated_since(started)
+            finally:
+                # Also on cancellation, so a half-open trial is never left pending
+                self._record_cycle(ok)
+        elif self.breaker.state == STATE_OPEN:
+            self.state.last_error = (
+                f"Unreachable, next attempt in {self.breaker.retry_in:.0f}s"
+            )
+        self._changes.publish(self.state)
+        return self.state
+
+    async def _async_trial(self, budget: float | None) -> bool:
+        """Run the breaker's half-open trial: a connect and login, nothing more."""
+        ok = False
         try:
-            # === TCP API DATA ===
-            
-            # Temperature scale
-            response = await self._send_command(CMD_GET_TEMP_SCALE)
-            if response and response.startswith(RESP_TEMP_SCALE):
-                scale = response.replace(RESP_TEMP_SCALE, "").strip()
-                self.state.temp_scale = "F" if "FAHRENHEIT" in scale.upper() else "C"
-            
-            # All states (main data)
-            response = await self._send_command(CMD_GET_ALL_STATES)
-            if response and response.startswith(RESP_ALL_STATES):
-                self._parse_all_states(response.replace(RESP_ALL_STATES, ""))
-            
-            # Operation mode (manual vs schedule)
-            response = await self._send_command(CMD_GET_OPERATION_MODE)
-            if response and response.startswith(RESP_OPERATION_MODE):
-                mode = response.replace(RESP_OPERATION_MODE, "").strip()
-                self.state.is_manual_mode = (mode == OPERATION_MODE_MANUAL)
-                self.state.operation_mode = "Manual" if self.state.is_manual_mode else "Schedule"
-            
-            # Humidity relay mode
-            response = await self._send_command(CMD_GET_RELAY_MODE)
-            if response and response.startswith(RESP_RELAY_MODE):
-                self._parse_relay_mode(response.replace(RESP_RELAY_MODE, ""))
-            
-            # Humidification settings
-            response = await self._send_command(CMD_GET_HUMIDIFICATION)
-            if response and response.startswith(RESP_HUMIDIFICATION):
-                self._parse_humidification(response.replace(RESP_HUMIDIFICATION, ""))
-            
-            # Dehumidification settings
-            response = await self._send_command(CMD_GET_DEHUMIDIFICATION)
-            if response and response.startswith(RESP_DEHUMIDIFICATION):
-                self._parse_dehumidification(response.replace(RESP_DEHUMIDIFICATION, ""))
-            
-            # Relay state
-            response = await self._send_command(CMD_GET_RELAY_STATE)
-            if response and response.startswith(RESP_RELAY_STATE):
-                self.state.relay_state = response.replace(RESP_RELAY_STATE, "").strip()
-            
-            # === HTTP SENSOR DATA ===
-            await self._fetch_http_sensors()
-            
-            self.state.connected = True
-            self.state.last_error = None
-            
+            ok = await self.connect(budget)
+        finally:
+            self._record_cycle(ok)
+        return ok
+
+    def _record_cycle(self, ok: bool) -> None:
+        """Feed the outcome of a cycle to the breaker."""
+        breaker = self.breaker
+        if ok:
+            if breaker.trips:
+                _LOGGER.info("NetX Thermostat at %s is reachable again", self.host)
+            breaker.record_success()
+            return
+        breaker.record_failure()
+        if breaker.state == STATE_OPEN:
+            _LOGGER.warning(
+                "NetX Thermostat at %s is unreachable, next attempt in %.0fs",
+                self.host,
+                breaker.retry_in,
+            )
+            # Hold no socket while open; the trial after the backoff reconnects
+            self._authenticated = False
+            self.state.connected = False
+            task = asyncio.get_running_loop().create_task(self._transport.close())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    def watch(
+        self,
+        fields: Iterable[str] | None = None,
+        *,
+        maxsize: int = WATCH_QUEUE_SIZE,
+        policy: str = WATCH_DROP_OLDEST,
+        initial: bool = True,
+    ) -> AsyncIterator[StateChange]:
+        """Return an async iterator of changes to ``fields`` (all by default).
+
+        The first item holds the current values unless ``initial`` is
+        False. Each later item holds only the fields an update changed.
+        Up to ``maxsize`` items are buffered per subscriber, see
+        ``watch.py`` for the overflow policies. Close the iterator (or
+        break out of ``async for``) to unsubscribe. Unknown fields or
+        policies and a ``maxsize`` below 1 raise ValueError here, not on
+        the first iteration.
+        """
+        return self._changes.watch(self.state, fields, maxsize, policy, initial)
+
+    async def _async_update(self, full: bool, budget: float | None) -> None:
+        """Run one poll cycle.
+
+        Connects and logs in first when there is no live session, so the
+        first call doubles as the connection handshake. A quick update
+        (``full=False``) only refreshes the running stage.
+
+        The cycle stops at the first transport failure rather than
+        reconnecting for each remaining command, and with a ``budget`` (in
+        seconds) no command is started that could not finish in time.
+        Fields read until then are kept: ``state.partial`` flags the early
+        stop and ``state.updated_at`` gives each field's age.
+        """
+        deadline = None if budget is None else time.monotonic() + budget
+        failures = self.command_failures
+        self.state.partial = False
+        if not self._authenticated and not await self.connect(budget):
+            return
+
+        try:
+            # With max_concurrency > 1 the HTTP endpoints are read while the
+            # TCP commands are in flight instead of after them
+            fetch_http = full and self.enable_http and self.planned_endpoints()
+            if fetch_http and self.max_concurrency > 1:
+                await asyncio.gather(
+                    self._async_poll_tcp(full, deadline), self._async_poll_http(deadline)
+                )
+            else:
+                await self._async_poll_tcp(full, deadline)
+                # A unit that just dropped the session is not asked over HTTP either
+                if fetch_http and self._authenticated:
+                    await self._async_poll_http(deadline)
+
+            self.state.connected = self._authenticated
+            if self.state.connected and self.command_failures == failures:
+                self.state.last_error = None
+            elif self.state.last_error is None:
+                self.state.last_error = "Connection lost during update"
+
         except Exception as err:
             _LOGGER.error("Update error: %s", err)
             self.state.last_error = str(err)
             self.state.connected = False
-        
-        return self.state
 
-    async def _get_http_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
-        if self._http_session is None or self._http_session.closed:
-            timeout = aiohttp.ClientTimeout(total=10)
-            self._http_session = aiohttp.ClientSession(timeout=timeout)
-        return self._http_session
+    async def async_probe_commands(self) -> dict[str, dict[str, str | float]]:
+        """Probe every known read command once.
 
-    async def _fetch_http_sensors(self) -> None:
-        """Fetch humidity and CO2 data via HTTP."""
-        try:
-            session = await self._get_http_session()
-            
-            # Fetch humidity from index.xml
-            await self._fetch_humidity(session)
-            
-            # Fetch CO2 from co2.json
-            await self._fetch_co2(session)
-            
-        except Exception as err:
-            _LOGGER.debug("HTTP sensor fetch error (non-critical): %s", err)
+        Returns ``{command: {"status": ..., "latency": seconds}}``. Usable
+        replies are parsed into the state as a side effect.
+        """
+        results = {}
+        for rc in READ_COMMANDS.values():
+            # Unknown commands may never be answered: the explicit timeout
+            # waits them out in full and keeps them out of the RTT estimate.
+            # The latency is time on the wire, not the wait behind other commands
+            response, latency = await self._send_command_timed(
+                rc.command, self.command_timeout, priority=PRIORITY_BACKGROUND
+            )
+            status = classify_response(rc, response)
+            results[rc.command] = {
+                "status": status,
+                "latency": None if latency is None else round(latency, 4),
+            }
+            if status == PROBE_SUPPORTED:
+                rc.parse(strip_prefix(response, rc.prefix), self.state)
+            _LOGGER.debug("Probe %s: %s in %ss", rc.command, status, latency)
 
-    async def _fetch_humidity(self, session: aiohttp.ClientSession) -> None:
-        """Fetch humidity from index.xml."""
-        try:
-            url = f"http://{self.host}/index.xml"
-            async with session.get(url, auth=self._http_auth) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    
-                    # Parse humidity from XML: <humidity>25</humidity>
-                    match = re.search(r'<humidity>(\d+)</humidity>', text, re.IGNORECASE)
-                    if match:
-                        self.state.humidity = int(match.group(1))
-                        _LOGGER.debug("HTTP humidity: %s%%", self.state.humidity)
-                else:
-                    _LOGGER.debug("HTTP index.xml returned %s", response.status)
-        except asyncio.TimeoutError:
-            _LOGGER.debug("HTTP humidity fetch timeout")
-        except Exception as err:
-            _LOGGER.debug("HTTP humidity fetch error: %s", err)
+        self.set_command_capabilities(
+            {
+                **self.command_support,
+                **{
+                    command: result["status"] == PROBE_SUPPORTED
+                    for command, result in results.items()
+                    if result["status"] != PROBE_TIMEOUT
+                },
+            },
+            {
+                command: result["latency"]
+                for command, result in results.items()
+                if result["status"] == PROBE_SUPPORTED
+            },
+        )
+        return results
 
-    async def _fetch_co2(self, session: aiohttp.ClientSession) -> None:
-        """Fetch CO2 data from co2.json."""
+    async def _async_poll_tcp(self, full: bool, deadline: float | None = None) -> None:
+        """Send the read commands of the current poll plan."""
+        failures = self.command_failures
+        for rc in self.poll_plan(full):
+            if rc.static and rc.command in self._static_done:
+                continue
+            limit = None
+            if deadline is not None:
+                # Commands get at most the rest of the budget, and none is
+                # started that would not even finish on a good day
+                limit = deadline - time.monotonic()
+                if limit < self.rtt.expected:
+                    _LOGGER.debug("Poll budget spent, skipping %s and later commands", rc.command)
+                    self.state.partial = True
+                    return
+            line, latency = await self._send_command_timed(rc.command, limit=limit, raw=True)
+            ok = line is not None and rc.apply(line, self.state)
+            if latency is not None and (line is not None or self._authenticated):
+                # A dropped session says nothing about the command itself
+                self.planner.record(rc.command, latency, ok)
+            if self.command_failures != failures or not self._authenticated:
+                # Keep what was read; a lost session reconnects next cycle
+                self.state.partial = True
+                return
+            if ok:
+                self.state.mark_updated(rc.fields, time.time())
+                if rc.static:
+                    self._static_done.add(rc.command)
+
+    async def _async_poll_http(self, deadline: float | None = None) -> None:
+        """Read the HTTP-only sensors, giving up at the deadline."""
+        fetch = self._get_http().async_fetch(
+            self.state, self.max_concurrency - 1, self.planned_endpoints()
+        )
         try:
-            url = f"http://{self.host}/co2.json"
-            async with session.get(url, auth=self._http_auth) as response:
-                if response.status == 200:
-                    try:
-                        data = await response.json()
-                        
-                        # CO2 data is nested: {"co2": {"level": "635", ...}}
-                        co2_data = data.get("co2", {})
-                        
-                        # Check if valid
-                        if co2_data.get("valid", "").lower() != "true":
-                            _LOGGER.debug("CO2 module reports invalid data")
-                            return
-                        
-                        # Current CO2 level (comes as string)
-                        level_str = co2_data.get("level", "")
-                        if level_str:
-                            try:
-                                self.state.co2_level = int(level_str)
-                                _LOGGER.debug("HTTP CO2 level: %s ppm", self.state.co2_level)
-                            except ValueError:
-                                pass
-                        
-                        # Peak CO2 level
-                        peak_str = co2_data.get("peak_level", "")
-                        if peak_str:
-                            try:
-                                self.state.co2_peak_level = int(peak_str)
-                                _LOGGER.debug("HTTP CO2 peak: %s ppm", self.state.co2_peak_level)
-                            except ValueError:
-                                pass
-                        
-                        # Alert level
-                        alert_str = co2_data.get("alert_level", "")
-                        if alert_str:
-                            try:
-                                self.state.co2_alert_level = int(alert_str)
-                            except ValueError:
-                                pass
-                        
-                        # In alert state
-                        self.state.co2_in_alert = co2_data.get("in_alert", "").lower() == "true"
-                        
-                    except Exception as json_err:
-                        _LOGGER.debug("CO2 JSON parse error: %s", json_err)
-                elif response.status == 404:
-                    _LOGGER.debug("CO2 sensor not available (404)")
-                else:
-                    _LOGGER.debug("HTTP co2.json returned %s", response.status)
+            if deadline is None:
+                results = await fetch
+            else:
+                results = await asyncio.wait_for(fetch, max(0.0, deadline - time.monotonic()))
         except asyncio.TimeoutError:
-            _LOGGER.debug("HTTP CO2 fetch timeout")
-        except Exception as err:
-            _LOGGER.debug("HTTP CO2 fetch error: %s", err)
+            _LOGGER.debug("Poll budget spent during HTTP fetch")
+            self.state.partial = True
+            return
+        for name, (latency, ok) in results.items():
+            self.planner.record(HTTP_ENDPOINT_PATHS[name], latency, ok)
 
-    def _parse_all_states(self, data: str) -> None:
-        """Parse RAS1 response."""
-        try:
-            parts = data.split(",")
-            if len(parts) >= 11:
-                self.state.indoor_temp = self._parse_temp(parts[0])
-                self.state.outdoor_temp = self._parse_temp(parts[1])
-                self.state.hvac_mode = parts[2].strip().upper()
-                
-                fan_str = parts[3].strip().upper()
-                self.state.fan_mode = "ON" if "ON" in fan_str else "AUTO"
-                
-                self.state.override_active = parts[4].strip().upper() in ("YES", "Y", "TRUE", "1")
-                self.state.recovery_active = parts[5].strip().upper() in ("YES", "Y", "TRUE", "1")
-                
-                try:
-                    self.state.cool_setpoint = int(parts[6].strip())
-                except (ValueError, TypeError):
-                    pass
-                
-                try:
-                    self.state.heat_setpoint = int(parts[7].strip())
-                except (ValueError, TypeError):
-                    pass
-                
-                self.state.operating_status = parts[8].strip().upper()
-                
-                try:
-                    self.state.stage = int(parts[9].strip())
-                    # Stage 0 = idle, Stage >= 1 = actively running
-                    self.state.is_idle = (self.state.stage == 0)
-                except (ValueError, TypeError):
-                    self.state.stage = None
-                    self.state.is_idle = True
-                
-                event = parts[10].strip()
-                self.state.event = event if event.upper() != "NONE" else None
-                
-        except Exception as err:
-            _LOGGER.error("Error parsing RAS1 '%s': %s", data, err)
+    async def async_get_schedule(self, max_age: float | None = None) -> dict[str, str]:
+        """Return the weekly schedule, cached while younger than ``max_age`` seconds.
 
-    def _parse_temp(self, temp_str: str) -> float | None:
-        """Parse temperature value."""
-        temp_str = temp_str.strip().upper()
-        if temp_str in ("NA", "--", "", "N/A"):
-            return None
+        The schedule is flattened by ``parse_schedule``. Raises ValueError
+        if the unit has no schedule page or it cannot be parsed.
+        """
+        if (
+            self.schedule is not None
+            and max_age is not None
+            and time.monotonic() - self._schedule_read < max_age
+        ):
+            return self.schedule
+        status, body = await self._get_http().async_get_path(HTTP_SCHEDULE_PATH)
+        if status != 200:
+            raise ValueError(f"{HTTP_SCHEDULE_PATH} returned HTTP {status}")
         try:
-            return float(temp_str)
-        except (ValueError, TypeError):
-            return None
+            self.schedule = parse_schedule(body)
+        except SyntaxError as err:
+            raise ValueError(f"Unreadable {HTTP_SCHEDULE_PATH}: {err}") from err
+        self._schedule_read = time.monotonic()
+        return self.schedule
 
-    def _parse_relay_mode(self, data: str) -> None:
-        """Parse RMRF1 response."""
-        try:
-            parts = data.split(",")
-            if len(parts) >= 2:
-                self.state.relay1_mode = parts[0].strip().upper()
-                self.state.relay2_mode = parts[1].strip().upper()
-            elif len(parts) == 1:
-                self.state.relay1_mode = parts[0].strip().upper()
-        except Exception as err:
-            _LOGGER.error("Error parsing RMRF1 '%s': %s", data, err)
+    def _get_http(self) -> "NetXHttpSensors":
+        """Return the HTTP sensor client, importing it on first use."""
+        if self._http is None:
+            from .http_sensors import NetXHttpSensors
 
-    def _parse_humidification(self, data: str) -> None:
-        """Parse RMHS1 response."""
-        try:
-            parts = data.split(",")
-            if len(parts) >= 3:
-                self.state.hum_control_mode = parts[0].strip().upper()
-                self.state.hum_setpoint = int(parts[1].strip())
-                self.state.hum_variance = int(parts[2].strip())
-        except Exception as err:
-            _LOGGER.error("Error parsing RMHS1 '%s': %s", data, err)
+            self._http = NetXHttpSensors(
+                self.host, self.username, self.password, self._http_endpoints, self.http_timeout
+            )
+        return self._http
 
-    def _parse_dehumidification(self, data: str) -> None:
-        """Parse RMDHS1 response."""
-        try:
-            parts = data.split(",")
-            if len(parts) >= 3:
-                self.state.dehum_control_mode = parts[0].strip().upper()
-                self.state.dehum_setpoint = int(parts[1].strip())
-                self.state.dehum_variance = int(parts[2].strip())
-        except Exception as err:
-            _LOGGER.error("Error parsing RMDHS1 '%s': %s", data, err)
+    @property
+    def http_endpoints(self) -> set[str]:
+        """Return the HTTP endpoints currently polled."""
+        if self._http is not None:
+            return self._http.endpoints
+        if self._http_endpoints is None:
+            return set(HTTP_ENDPOINT_PATHS)
+        return self._http_endpoints
 
-    def _validate_write_response(self, command: str, response: str | None, expected_value: str = None) -> bool:
-        """Validate a write command response."""
-        if response is None:
-            return False
-        if ":" not in response:
-            _LOGGER.warning("Unexpected response format: %s", response)
-            return False
-        _LOGGER.debug("Write successful: %s -> %s", command, response)
-        return True
+    @http_endpoints.setter
+    def http_endpoints(self, endpoints: Iterable[str]) -> None:
+        """Replace the set of HTTP endpoints to poll."""
+        self._http_endpoints = set(endpoints)
+        if self._http is not None:
+            self._http.endpoints = set(endpoints)
+        self._plans.clear()
+
+    async def async_probe_http(self) -> dict[str, bool]:
+        """Probe which HTTP endpoints the unit serves."""
+        if not self.enable_http:
+            return {}
+        return await self._get_http().async_probe()
 
     async def async_set_hvac_mode(self, mode: str) -> bool:
         """Set HVAC mode."""
@@ -500,8 +692,8 @@ class NetXThermostatAPI:
         else:
             command = f"{CMD_SET_MODE_SCHEDULE}{mode}"
         
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        return is_write_ok(command, response)
 
     async def async_set_fan_mode(self, mode: str) -> bool:
         """Set fan mode."""
@@ -514,8 +706,8 @@ class NetXThermostatAPI:
         else:
             command = f"{CMD_SET_FAN_SCHEDULE}{mode}"
         
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        return is_write_ok(command, response)
 
     async def async_set_cool_setpoint(self, temperature: int) -> bool:
         """Set cooling setpoint."""
@@ -524,8 +716,8 @@ class NetXThermostatAPI:
         else:
             command = f"{CMD_SET_COOL_SCHEDULE}{temperature}"
         
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        return is_write_ok(command, response)
 
     async def async_set_heat_setpoint(self, temperature: int) -> bool:
         """Set heating setpoint."""
@@ -534,8 +726,8 @@ class NetXThermostatAPI:
         else:
             command = f"{CMD_SET_HEAT_SCHEDULE}{temperature}"
         
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        return is_write_ok(command, response)
 
     async def async_set_relay_mode(self, mode: str) -> bool:
         """Set humidity relay mode."""
@@ -544,8 +736,12 @@ class NetXThermostatAPI:
             return False
         
         command = f"{CMD_SET_RELAY_MODE}{mode}"
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        if not is_write_ok(command, response):
+            return False
+        # The relay mode is read once per session; read it back next poll
+        self._static_done.discard(CMD_GET_RELAY_MODE)
+        return True
 
     async def async_set_humidification(self, independent: bool, setpoint: int, variance: int = 5) -> bool:
         """Set humidification settings."""
@@ -554,8 +750,8 @@ class NetXThermostatAPI:
         variance = max(2, min(10, variance))
         
         command = f"{CMD_SET_HUMIDIFICATION}{mode},{setpoint},{variance}"
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        return is_write_ok(command, response)
 
     async def async_set_dehumidification(self, independent: bool, setpoint: int, variance: int = 5) -> bool:
         """Set dehumidification settings."""
@@ -564,8 +760,37 @@ class NetXThermostatAPI:
         variance = max(2, min(10, variance))
         
         command = f"{CMD_SET_DEHUMIDIFICATION}{mode},{setpoint},{variance}"
-        response = await self._send_command(command)
-        return self._validate_write_response(command, response)
+        response = await self._send_command(command, priority=PRIORITY_INTERACTIVE)
+        return is_write_ok(command, response)
+
+    async def async_apply(
+        self,
+        hvac_mode: str | None = None,
+        fan_mode: str | None = None,
+        heat_setpoint: int | None = None,
+        cool_setpoint: int | None = None,
+        relay_mode: str | None = None,
+    ) -> dict[str, bool]:
+        """Write the given settings in order; return whether each was accepted.
+
+        Settings left as None are not written. Writing stops at the first
+        rejected setting, and the ones after it are reported as False.
+        """
+        writes = {
+            "hvac_mode": (self.async_set_hvac_mode, hvac_mode),
+            "fan_mode": (self.async_set_fan_mode, fan_mode),
+            "heat_setpoint": (self.async_set_heat_setpoint, heat_setpoint),
+            "cool_setpoint": (self.async_set_cool_setpoint, cool_setpoint),
+            "relay_mode": (self.async_set_relay_mode, relay_mode),
+        }
+        results = {}
+        ok = True
+        for name, (setter, value) in writes.items():
+            if value is None:
+                continue
+            ok = ok and await setter(value)
+            results[name] = ok
+        return results
 
     async def test_connection(self) -> bool:
         """Test connection to the thermostat."""
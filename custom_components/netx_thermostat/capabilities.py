@@ -0,0 +1,104 @@
+"""Device capability cache stored in the config entry.
+
+The cache lives under ``entry.data[CONF_CAPABILITIES]`` as one section per
+kind of capability::
+
+    {
+        "http": {"checked_at": 1700000000.0, "supported": {"index": true, "co2": false}},
+        "commands": {
+            "checked_at": 1700000000.0,
+            "supported": {"RSS1": true, "RRHS1": false, ...},
+            "status": {"RSS1": "supported", "RRHS1": "no_data", ...},
+            "latency": {"RSS1": 0.021, ...},
+        },
+    }
+
+Sections are re-probed once they are older than
+``CAPABILITY_RECHECK_INTERVAL``.
+"""
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_CAPABILITIES,
+    CAPABILITIES_HTTP,
+    CAPABILITIES_COMMANDS,
+    CAPABILITY_RECHECK_INTERVAL,
+    PROBE_SUPPORTED,
+    PROBE_TIMEOUT,
+    HTTP_ENDPOINT_PATHS,
+)
+
+
+def get_section(entry: ConfigEntry, section: str) -> dict[str, Any] | None:
+    """Return a cached capability section, or None if never probed."""
+    return entry.data.get(CONF_CAPABILITIES, {}).get(section)
+
+
+def is_stale(entry: ConfigEntry, section: str) -> bool:
+    """Return True if a section is missing or due for a re-check."""
+    cached = get_section(entry, section)
+    if not cached or cached.get("checked_at") is None:
+        return True
+    return time.time() - cached["checked_at"] > CAPABILITY_RECHECK_INTERVAL
+
+
+def build_section(supported: dict[str, Any], complete: bool = True, **extra: Any) -> dict[str, Any]:
+    """Build a section from probe results.
+
+    An incomplete probe is stored without a timestamp, so it is retried at
+    the next setup instead of waiting out the re-check interval.
+    """
+    return {
+        "checked_at": time.time() if complete else None,
+        "supported": supported,
+        **extra,
+    }
+
+
+@callback
+def async_store_section(
+    hass: HomeAssistant, entry: ConfigEntry, section: str, value: dict[str, Any]
+) -> None:
+    """Persist a capability section in the config entry."""
+    capabilities = {**entry.data.get(CONF_CAPABILITIES, {}), section: value}
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_CAPABILITIES: capabilities}
+    )
+
+
+def http_endpoints(entry: ConfigEntry) -> set[str]:
+    """Return the HTTP endpoints worth polling.
+
+    Endpoints never probed, or whose probe was inconclusive, are assumed
+    present.
+    """
+    cached = get_section(entry, CAPABILITIES_HTTP) or {}
+    supported = cached.get("supported", {})
+    return {name for name in HTTP_ENDPOINT_PATHS if supported.get(name) is not False}
+
+
+def command_capabilities(entry: ConfigEntry) -> tuple[dict[str, bool], dict[str, float]]:
+    """Return the cached read command support and latency maps."""
+    cached = get_section(entry, CAPABILITIES_COMMANDS) or {}
+    return dict(cached.get("supported", {})), dict(cached.get("latency", {}))
+
+
+def build_command_section(results: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Build the command section from ``NetXThermostatAPI.async_probe_commands``."""
+    conclusive = {
+        command: result for command, result in results.items()
+        if result["status"] != PROBE_TIMEOUT
+    }
+    return build_section(
+        {command: result["status"] == PROBE_SUPPORTED for command, result in conclusive.items()},
+        complete=len(conclusive) == len(results),
+        status={command: result["status"] for command, result in results.items()},
+        latency={
+            command: result["latency"] for command, result in conclusive.items()
+            if result["status"] == PROBE_SUPPORTED and result["latency"] is not None
+        },
+    )
@@ -0,0 +1,86 @@
+"""Circuit breaker used to stop calling dependencies that keep failing."""
+import random
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Classic three-state circuit breaker, with optional backoff.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` returns False until ``reset_timeout`` seconds have passed. The
+    next call is then let through as a single half-open trial: success
+    closes the circuit, failure opens it again.
+
+    With ``max_reset_timeout`` above ``reset_timeout``, each reopening
+    without a success in between doubles the wait, up to that cap, and
+    ``jitter`` (a fraction) shortens each wait by a random part so that
+    many breakers opened together do not retry in step.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 300.0,
+        max_reset_timeout: float | None = None,
+        jitter: float = 0.0,
+    ) -> None:
+        """Initialize the breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout or 0.0)
+        self.jitter = jitter
+        self.failures = 0
+        self.trips = 0  # Times opened since the last success
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._wait = reset_timeout
+
+    @property
+    def state(self) -> str:
+        """Return the current state."""
+        return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next trial is allowed, 0 unless open."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._wait - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        if self._state == STATE_CLOSED:
+            return True
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self._wait:
+            self._state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.failures = 0
+        self.trips = 0
+        self._state = STATE_CLOSED
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit past the threshold."""
+        self.failures += 1
+        if self._state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            wait = min(self.max_reset_timeout, self.reset_timeout * 2 ** min(self.trips, 32))
+            self._wait = wait * (1 - self.jitter * random.random())
+            self.trips += 1
+            self._state = STATE_OPEN
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, str | int | float]:
+        """Return the state, failure counts and seconds until the next trial."""
+        return {
+            "state": self._state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in_s": round(self.retry_in, 1),
+        }
@@ -1,5 +1,8 @@
 """Climate platform for NetX Thermostat integration."""
 import logging
+from collections.abc import Awaitable, Callable, Collection, Mapping
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -9,10 +12,9 @@ from homeassistant.components.climate import (
     HVACAction,
 )
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
@@ -23,9 +25,12 @@ from .const import (
     PRESET_DEHUMIDIFY,
     PRESET_TO_RELAY,
     RELAY_TO_PRESET,
+    HVAC_MODE_WRITES,
 )
 from .coordinator import NetXDataUpdateCoordinator
-from .api import NetXThermostatAPI
+from .api import NetXThermostatAPI, NetXThermostatState
+from .entity import NetXOptimisticEntity
+from .protocol import ALL_STATES_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,10 +45,18 @@ async def async_setup_entry(
     coordinator = data["coordinator"]
     api = data["api"]
 
-    async_add_entities([NetXClimate(coordinator, api, config_entry)])
+    async_add_entities([NetXClimate(coordinator, api, config_entry, data["device_info"])])
 
 
-class NetXClimate(CoordinatorEntity[NetXDataUpdateCoordinator], ClimateEntity):
+async def _all_ok(*writes: Callable[[], Awaitable[bool]]) -> bool:
+    """Run writes in order, stopping at the first the device rejects."""
+    for write in writes:
+        if not await write():
+            return False
+    return True
+
+
+class NetXClimate(NetXOptimisticEntity, ClimateEntity):
     """Representation of a NetX Thermostat."""
 
     _attr_has_entity_name = True
@@ -65,216 +78,314 @@ class NetXClimate(CoordinatorEntity[NetXDataUpdateCoordinator], ClimateEntity):
     _attr_preset_modes = [PRESET_NONE, PRESET_HUMIDIFY, PRESET_DEHUMIDIFY]
     _attr_min_temp = MIN_TEMP
     _attr_max_temp = MAX_TEMP
+    # Change with every stage or reading; their own sensors record them
+    _unrecorded_attributes = frozenset(
+        {
+            "operating_status",
+            "stage",
+            "is_idle",
+            "event",
+            "override_active",
+            "recovery_active",
+            "outdoor_temperature",
+            "relay_state",
+            "co2_level",
+            "pending",
+        }
+    )
 
     def __init__(
         self,
         coordinator: NetXDataUpdateCoordinator,
         api: NetXThermostatAPI,
         config_entry: ConfigEntry,
+        device_info: Mapping[str, Any],
     ) -> None:
         """Initialize the climate entity."""
         super().__init__(coordinator)
         self._api = api
+        self._cached_view: ClimateView | None = None
         self._attr_unique_id = f"{config_entry.entry_id}_climate"
-        
-        device_name = config_entry.data.get("device_name", "NetX Thermostat")
-        
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "NetX",
-            "model": "Network Thermostat",
+        self._attr_device_info = device_info
+
+    @property
+    def data_fields(self) -> frozenset[str]:
+        """Return the fields the climate state needs.
+
+        The mode decides which write commands apply; the temperature scale
+        and relay mode (the preset) are only read once per session. The
+        current humidity and the humidify, dehumidify, relay state and CO2
+        attributes are shown only while the entities reading them are
+        enabled, see ``build_climate_view``.
+        """
+        return ALL_STATES_FIELDS | {
+            "temp_scale", "relay1_mode", "operation_mode", "is_manual_mode"
         }
 
+    @property
+    def _view(self) -> "ClimateView":
+        """Return the derived view of the current snapshot, built on first use."""
+        if self._cached_view is None:
+            self._cached_view = build_climate_view(self._state, self._api.wanted_fields)
+        return self._cached_view
+
+    @callback
+    def _async_state_changed(self) -> None:
+        """Drop the derived view of the previous state."""
+        self._cached_view = None
+
     @property
     def temperature_unit(self) -> str:
         """Return the unit of measurement."""
-        if self.coordinator.data and self.coordinator.data.temp_scale == "C":
-            return UnitOfTemperature.CELSIUS
-        return UnitOfTemperature.FAHRENHEIT
+        return self._view.temperature_unit
 
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        if self.coordinator.data:
-            return self.coordinator.data.indoor_temp
-        return None
+        return self._view.current_temperature
 
     @property
     def current_humidity(self) -> int | None:
         """Return the current humidity (from HTTP API)."""
-        if self.coordinator.data and self.coordinator.data.humidity:
-            return self.coordinator.data.humidity
-        return None
+        return self._view.current_humidity
 
     @property
     def target_temperature(self) -> float | None:
         """Return the temperature we try to reach."""
-        if not self.coordinator.data:
-            return None
-        
-        mode = self.hvac_mode
-        if mode == HVACMode.HEAT:
-            return self.coordinator.data.heat_setpoint
-        elif mode == HVACMode.COOL:
-            return self.coordinator.data.cool_setpoint
-        return None
+        return self._view.target_temperature
 
     @property
     def target_temperature_high(self) -> float | None:
         """Return the upper bound target temperature."""
-        if self.coordinator.data:
-            return self.coordinator.data.cool_setpoint
-        return None
+        return self._view.target_temperature_high
 
     @property
     def target_temperature_low(self) -> float | None:
         """Return the lower bound target temperature."""
-        if self.coordinator.data:
-            return self.coordinator.data.heat_setpoint
-        return None
+        return self._view.target_temperature_low
 
     @property
     def hvac_mode(self) -> HVACMode:
         """Return current HVAC mode."""
-        if not self.coordinator.data:
-            return HVACMode.OFF
-        
-        mode = self.coordinator.data.hvac_mode
-        fan = self.coordinator.data.fan_mode
-        
-        if mode == "OFF":
-            if fan == "ON":
-                return HVACMode.FAN_ONLY
-            return HVACMode.OFF
-        elif mode == "HEAT":
-            return HVACMode.HEAT
-        elif mode == "COOL":
-            return HVACMode.COOL
-        elif mode == "AUTO":
-            return HVACMode.HEAT_COOL
-        
-        return HVACMode.OFF
+        return self._view.hvac_mode
 
     @property
     def hvac_action(self) -> HVACAction | None:
         """Return the current running hvac operation."""
-        if not self.coordinator.data:
-            return None
-        
-        state = self.coordinator.data
-        
-        # Use stage to determine if idle
-        if state.is_idle:
-            # Stage is 0, so we're idle
-            if state.fan_mode == "ON":
-                return HVACAction.FAN
-            return HVACAction.IDLE
-        
-        # Stage >= 1, actively running
-        if state.operating_status == "HEAT":
-            return HVACAction.HEATING
-        elif state.operating_status == "COOL":
-            return HVACAction.COOLING
-        
-        return HVACAction.IDLE
+        return self._view.hvac_action
 
     @property
     def fan_mode(self) -> str | None:
         """Return the current fan mode."""
-        if self.coordinator.data:
-            return self.coordinator.data.fan_mode.lower() if self.coordinator.data.fan_mode else "auto"
-        return "auto"
+        return self._view.fan_mode
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode (humidity relay mode)."""
-        if self.coordinator.data and self.coordinator.data.relay1_mode:
-            mode = self.coordinator.data.relay1_mode.upper()
-            return RELAY_TO_PRESET.get(mode, PRESET_NONE)
-        return PRESET_NONE
+        return self._view.preset_mode
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        attrs = {}
-        if self.coordinator.data:
-            state = self.coordinator.data
-            attrs["operation_mode"] = state.operation_mode
-            attrs["is_manual_mode"] = state.is_manual_mode
-            attrs["override_active"] = state.override_active
-            attrs["recovery_active"] = state.recovery_active
-            attrs["operating_status"] = state.operating_status
-            attrs["stage"] = state.stage
-            attrs["is_idle"] = state.is_idle
-            
-            if state.event:
-                attrs["event"] = state.event
-            if state.outdoor_temp is not None:
-                attrs["outdoor_temperature"] = state.outdoor_temp
-            if state.relay_state:
-                attrs["relay_state"] = state.relay_state
-            if state.co2_level is not None:
-                attrs["co2_level"] = state.co2_level
-            
-            # Humidity settings
-            if state.hum_setpoint is not None:
-                attrs["humidify_setpoint"] = state.hum_setpoint
-                attrs["humidify_variance"] = state.hum_variance
-                attrs["humidify_mode"] = "Independent" if state.hum_control_mode == "IH" else "With Heating"
-            if state.dehum_setpoint is not None:
-                attrs["dehumidify_setpoint"] = state.dehum_setpoint
-                attrs["dehumidify_variance"] = state.dehum_variance
-                attrs["dehumidify_mode"] = "Independent" if state.dehum_control_mode == "IC" else "With Cooling"
-        
-        return attrs
+        if self._optimistic.is_pending(self.data_fields):
+            return {**self._view.attributes, "pending": True}
+        return self._view.attributes
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
-        if hvac_mode == HVACMode.OFF:
-            await self._api.async_set_hvac_mode("OFF")
-            await self._api.async_set_fan_mode("AUTO")
-        elif hvac_mode == HVACMode.HEAT:
-            await self._api.async_set_hvac_mode("HEAT")
-        elif hvac_mode == HVACMode.COOL:
-            await self._api.async_set_hvac_mode("COOL")
-        elif hvac_mode == HVACMode.HEAT_COOL:
-            await self._api.async_set_hvac_mode("AUTO")
-        elif hvac_mode == HVACMode.FAN_ONLY:
-            await self._api.async_set_hvac_mode("OFF")
-            await self._api.async_set_fan_mode("ON")
-        
-        await self.coordinator.async_request_refresh()
+        if hvac_mode not in HVAC_MODE_WRITES:
+            return
+        mode, fan_mode = HVAC_MODE_WRITES[hvac_mode]
+        values = {"hvac_mode": mode}
+        writes = [partial(self._api.async_set_hvac_mode, mode)]
+        if fan_mode is not None:
+            values["fan_mode"] = fan_mode
+            writes.append(partial(self._api.async_set_fan_mode, fan_mode))
+        await self._async_write(values, _all_ok(*writes))
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new target fan mode."""
-        await self._api.async_set_fan_mode(fan_mode.upper())
-        await self.coordinator.async_request_refresh()
+        await self._async_write(
+            {"fan_mode": fan_mode.upper()}, self._api.async_set_fan_mode(fan_mode.upper())
+        )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode (humidity relay mode)."""
         relay_mode = PRESET_TO_RELAY.get(preset_mode, "OFF")
-        await self._api.async_set_relay_mode(relay_mode)
-        await self.coordinator.async_request_refresh()
+        await self._async_write(
+            {"relay1_mode": relay_mode}, self._api.async_set_relay_mode(relay_mode)
+        )
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
+        heat = cool = None
         if ATTR_TEMPERATURE in kwargs:
             temp = int(kwargs[ATTR_TEMPERATURE])
             mode = self.hvac_mode
-            
+
             if mode == HVACMode.HEAT:
-                await self._api.async_set_heat_setpoint(temp)
+                heat = temp
             elif mode == HVACMode.COOL:
-                await self._api.async_set_cool_setpoint(temp)
+                cool = temp
             else:
-                await self._api.async_set_heat_setpoint(temp)
-                await self._api.async_set_cool_setpoint(temp + 3)
-        
+                heat, cool = temp, temp + 3
+
         if "target_temp_low" in kwargs:
-            await self._api.async_set_heat_setpoint(int(kwargs["target_temp_low"]))
-        
+            heat = int(kwargs["target_temp_low"])
+
         if "target_temp_high" in kwargs:
-            await self._api.async_set_cool_setpoint(int(kwargs["target_temp_high"]))
-        
-        await self.coordinator.async_request_refresh()
+            cool = int(kwargs["target_temp_high"])
+
+        values = {}
+        writes = []
+        if heat is not None:
+            values["heat_setpoint"] = heat
+            writes.append(partial(self._api.async_set_heat_setpoint, heat))
+        if cool is not None:
+            values["cool_setpoint"] = cool
+            writes.append(partial(self._api.async_set_cool_setpoint, cool))
+        if writes:
+            await self._async_write(values, _all_ok(*writes))
+
+
+@dataclass(frozen=True, slots=True)
+class ClimateView:
+    """Everything the climate entity reports, derived once per snapshot.
+
+    Home Assistant reads most properties several times per state write;
+    they all come from one instance instead of re-deriving from the raw
+    strings each time.
+    """
+
+    temperature_unit: str
+    current_temperature: float | None
+    current_humidity: int | None
+    target_temperature: float | None
+    target_temperature_high: float | None
+    target_temperature_low: float | None
+    hvac_mode: HVACMode
+    hvac_action: HVACAction | None
+    fan_mode: str
+    preset_mode: str
+    attributes: dict[str, Any]
+
+
+_EMPTY_VIEW = ClimateView(
+    temperature_unit=UnitOfTemperature.FAHRENHEIT,
+    current_temperature=None,
+    current_humidity=None,
+    target_temperature=None,
+    target_temperature_high=None,
+    target_temperature_low=None,
+    hvac_mode=HVACMode.OFF,
+    hvac_action=None,
+    fan_mode="auto",
+    preset_mode=PRESET_NONE,
+    attributes={},
+)
+
+_HVAC_MODES = {
+    "HEAT": HVACMode.HEAT,
+    "COOL": HVACMode.COOL,
+    "AUTO": HVACMode.HEAT_COOL,
+}
+
+
+def _hvac_mode(state: NetXThermostatState) -> HVACMode:
+    """Map the device mode and fan mode to an HVAC mode."""
+    if state.hvac_mode == "OFF" and state.fan_mode == "ON":
+        return HVACMode.FAN_ONLY
+    return _HVAC_MODES.get(state.hvac_mode, HVACMode.OFF)
+
+
+def _hvac_action(state: NetXThermostatState) -> HVACAction:
+    """Return the current running hvac operation."""
+    # Use stage to determine if idle
+    if state.is_idle:
+        # Stage is 0, so we're idle
+        if state.fan_mode == "ON":
+            return HVACAction.FAN
+        return HVACAction.IDLE
+
+    # Stage >= 1, actively running
+    if state.operating_status == "HEAT":
+        return HVACAction.HEATING
+    if state.operating_status == "COOL":
+        return HVACAction.COOLING
+    return HVACAction.IDLE
+
+
+def _attributes(state: NetXThermostatState, polled: Callable[[str], bool]) -> dict[str, Any]:
+    """Return the extra state attributes."""
+    attrs = {
+        "operation_mode": state.operation_mode,
+        "is_manual_mode": state.is_manual_mode,
+        "override_active": state.override_active,
+        "recovery_active": state.recovery_active,
+        "operating_status": state.operating_status,
+        "stage": state.stage,
+        "is_idle": state.is_idle,
+    }
+    if state.event:
+        attrs["event"] = state.event
+    if state.outdoor_temp is not None:
+        attrs["outdoor_temperature"] = state.outdoor_temp
+    if state.relay_state and polled("relay_state"):
+        attrs["relay_state"] = state.relay_state
+    if state.co2_level is not None and polled("co2_level"):
+        attrs["co2_level"] = state.co2_level
+
+    # Humidity settings
+    if state.hum_setpoint is not None and polled("hum_setpoint"):
+        attrs["humidify_setpoint"] = state.hum_setpoint
+        attrs["humidify_variance"] = state.hum_variance
+        attrs["humidify_mode"] = "Independent" if state.hum_control_mode == "IH" else "With Heating"
+    if state.dehum_setpoint is not None and polled("dehum_setpoint"):
+        attrs["dehumidify_setpoint"] = state.dehum_setpoint
+        attrs["dehumidify_variance"] = state.dehum_variance
+        attrs["dehumidify_mode"] = "Independent" if state.dehum_control_mode == "IC" else "With Cooling"
+    return attrs
+
+
+def build_climate_view(
+    state: NetXThermostatState | None, polled_fields: Collection[str] | None = None
+) -> ClimateView:
+    """Derive the climate view of a snapshot.
+
+    Optional readings outside ``polled_fields`` (None when everything is
+    polled) are left out instead of showing their last, stale value.
+    """
+    if not state:
+        return _EMPTY_VIEW
+
+    def polled(name: str) -> bool:
+        """Return True if ``name`` is kept up to date."""
+        return polled_fields is None or name in polled_fields
+
+    mode = _hvac_mode(state)
+    if mode == HVACMode.HEAT:
+        target = state.heat_setpoint
+    elif mode == HVACMode.COOL:
+        target = state.cool_setpoint
+    else:
+        target = None
+
+    return ClimateView(
+        temperature_unit=(
+            UnitOfTemperature.CELSIUS if state.temp_scale == "C" else UnitOfTemperature.FAHRENHEIT
+        ),
+        current_temperature=state.indoor_temp,
+        current_humidity=(state.humidity or None) if polled("humidity") else None,
+        target_temperature=target,
+        target_temperature_high=state.cool_setpoint,
+        target_temperature_low=state.heat_setpoint,
+        hvac_mode=mode,
+        hvac_action=_hvac_action(state),
+        fan_mode=state.fan_mode.lower() if state.fan_mode else "auto",
+        preset_mode=(
+            RELAY_TO_PRESET.get(state.relay1_mode.upper(), PRESET_NONE)
+            if state.relay1_mode
+            else PRESET_NONE
+        ),
+        attributes=_attributes(state, polled),
+    )
@@ -3,11 +3,53 @@ import logging
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD, CONF_PORT
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+)
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 
-from .const import DOMAIN, DEFAULT_PORT
+from .const import (
+    DOMAIN,
+    DEFAULT_PORT,
+    CONF_DEVICE_NAME,
+    CONF_BACKGROUND_SETUP,
+    DEFAULT_BACKGROUND_SETUP,
+    CONF_NETWORK,
+    CONF_HOSTS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_COMMAND_TIMEOUT,
+    CONF_HTTP_TIMEOUT,
+    CONF_ENABLE_HTTP,
+    DEFAULT_ENABLE_HTTP,
+    CONF_MAX_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    MAX_CONCURRENCY,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_CO2_DEADBAND,
+    CONF_MIN_REPORT_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_CO2_DEADBAND,
+    DEFAULT_MIN_REPORT_INTERVAL,
+    CONF_EXTERNAL_STATISTICS,
+    DEFAULT_EXTERNAL_STATISTICS,
+    CONF_QUICK_POLLS,
+    DEFAULT_QUICK_POLLS,
+    UPDATE_INTERVAL,
+    CONNECTION_TIMEOUT,
+    COMMAND_TIMEOUT,
+    HTTP_TIMEOUT,
+)
 from .api import NetXThermostatAPI
+from .discovery import DiscoveredThermostat, async_scan, async_login
+from .handoff import async_stash_client
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,36 +59,60 @@ class NetXThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, DiscoveredThermostat] = {}
+        self._clients: dict[str, NetXThermostatAPI] = {}  # Logged in, not yet handed on
+        self._shared_data: dict = {}  # Entry data common to the discovered hosts
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return NetXOptionsFlow()
+
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
-        """Handle the initial step."""
+        """Choose between entering a host and scanning the network."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "discover"])
+
+    async def async_step_manual(self, user_input: dict | None = None) -> FlowResult:
+        """Handle a manually entered host."""
         errors = {}
 
         if user_input is not None:
+            await self.async_set_unique_id(user_input[CONF_HOST])
+            self._abort_if_unique_id_configured()
+
             api = NetXThermostatAPI(
                 host=user_input[CONF_HOST],
                 username=user_input[CONF_USERNAME],
                 password=user_input[CONF_PASSWORD],
                 port=user_input.get(CONF_PORT, DEFAULT_PORT),
             )
-            
+
+            # The first snapshot doubles as the credential check; the live
+            # session is handed to entry setup instead of being rebuilt.
             try:
-                if await api.test_connection():
-                    await self.async_set_unique_id(user_input[CONF_HOST])
-                    self._abort_if_unique_id_configured()
-                    await api.disconnect()
-
-                    return self.async_create_entry(
-                        title=user_input.get("device_name", f"NetX Thermostat ({user_input[CONF_HOST]})"),
-                        data=user_input,
-                    )
-                else:
-                    errors["base"] = "cannot_connect"
-                    _LOGGER.error("Connection failed: %s", api.state.last_error)
+                state = await api.async_update()
             except Exception as err:
-                errors["base"] = "cannot_connect"
+                state = None
                 _LOGGER.error("Connection error: %s", err)
-            finally:
-                await api.disconnect()
+
+            if state is not None and state.connected:
+                # Capabilities are left to the deferred probes of entry
+                # setup, so submitting the form never waits on them
+                async_stash_client(self.hass, user_input[CONF_HOST], api)
+                return self.async_create_entry(
+                    title=user_input.get(CONF_DEVICE_NAME, f"NetX Thermostat ({user_input[CONF_HOST]})"),
+                    data=user_input,
+                )
+
+            errors["base"] = "cannot_connect"
+            if state is not None:
+                _LOGGER.error("Connection failed: %s", state.last_error)
+            await api.disconnect()
 
         data_schema = vol.Schema(
             {
@@ -54,12 +120,198 @@ class NetXThermostatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_USERNAME, default="admin"): str,
                 vol.Required(CONF_PASSWORD): str,
                 vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
-                vol.Optional("device_name", default="NetX Thermostat"): str,
+                vol.Optional(CONF_DEVICE_NAME, default="NetX Thermostat"): str,
+                vol.Optional(CONF_BACKGROUND_SETUP, default=DEFAULT_BACKGROUND_SETUP): bool,
             }
         )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=data_schema,
             errors=errors,
         )
+
+    async def async_step_discover(self, user_input: dict | None = None) -> FlowResult:
+        """Scan a network range and verify the credentials on every hit."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                found = await async_scan(user_input[CONF_NETWORK], port=user_input[CONF_PORT])
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                configured = self._async_current_ids()
+                found = [item for item in found if item.host not in configured]
+                clients = await async_login(
+                    found, user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+                )
+                self._async_release_clients()
+                self._clients = {host: api for host, api in clients.items() if api is not None}
+                self._discovered = {item.host: item for item in found if item.host in self._clients}
+                self._shared_data = {
+                    CONF_USERNAME: user_input[CONF_USERNAME],
+                    CONF_PASSWORD: user_input[CONF_PASSWORD],
+                    CONF_PORT: user_input[CONF_PORT],
+                    CONF_BACKGROUND_SETUP: user_input[CONF_BACKGROUND_SETUP],
+                }
+                if self._discovered:
+                    return await self.async_step_select()
+                errors["base"] = "no_devices_found"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_NETWORK): str,
+                vol.Required(CONF_USERNAME, default="admin"): str,
+                vol.Required(CONF_PASSWORD): str,
+                vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+                vol.Optional(CONF_BACKGROUND_SETUP, default=DEFAULT_BACKGROUND_SETUP): bool,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=data_schema,
+            errors=errors,
+        )
+
+    async def async_step_select(self, user_input: dict | None = None) -> FlowResult:
+        """Pick which verified thermostats to add."""
+        if user_input is not None and user_input[CONF_HOSTS]:
+            first, *rest = user_input[CONF_HOSTS]
+            # Each selected host's session is handed to its entry setup
+            for host in user_input[CONF_HOSTS]:
+                if (api := self._clients.pop(host, None)) is not None:
+                    async_stash_client(self.hass, host, api)
+            self._async_release_clients()
+            # Only one entry per flow: the rest are created through discovery flows
+            for host in rest:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                        data=self._discovered_entry_data(host),
+                    )
+                )
+            await self.async_set_unique_id(first)
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=f"NetX Thermostat ({first})",
+                data=self._discovered_entry_data(first),
+            )
+
+        options = [
+            selector.SelectOptionDict(
+                value=item.host,
+                label=f"{item.host} ({item.latency * 1000:.0f} ms{', HTTP' if item.http else ''})",
+            )
+            for item in self._discovered.values()
+        ]
+        return self.async_show_form(
+            step_id="select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOSTS, default=list(self._discovered)): selector.SelectSelector(
+                        selector.SelectSelectorConfig(options=options, multiple=True)
+                    ),
+                }
+            ),
+        )
+
+    def _discovered_entry_data(self, host: str) -> dict:
+        """Return the entry data for a discovered host."""
+        return {
+            **self._shared_data,
+            CONF_HOST: host,
+            CONF_DEVICE_NAME: f"NetX Thermostat ({host})",
+        }
+
+    async def async_step_integration_discovery(self, discovery_info: dict) -> FlowResult:
+        """Create an entry for a thermostat picked in a scan, without a confirm step."""
+        await self.async_set_unique_id(discovery_info[CONF_HOST])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=discovery_info.get(
+                CONF_DEVICE_NAME, f"NetX Thermostat ({discovery_info[CONF_HOST]})"
+            ),
+            data=discovery_info,
+        )
+
+    @callback
+    def _async_release_clients(self) -> None:
+        """Disconnect the scan's sessions that were not handed on."""
+        for api in self._clients.values():
+            self.hass.async_create_task(api.disconnect())
+        self._clients = {}
+
+    @callback
+    def async_remove(self) -> None:
+        """Disconnect leftover sessions when the flow is abandoned."""
+        self._async_release_clients()
+
+
+class NetXOptionsFlow(config_entries.OptionsFlow):
+    """Tune polling, timeouts and HTTP sensors of a configured thermostat.
+
+    Changes are applied to the running client without reloading the entry.
+    """
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        background = options.get(
+            CONF_BACKGROUND_SETUP,
+            self.config_entry.data.get(CONF_BACKGROUND_SETUP, DEFAULT_BACKGROUND_SETUP),
+        )
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SCAN_INTERVAL, default=options.get(CONF_SCAN_INTERVAL, UPDATE_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_QUICK_POLLS, default=options.get(CONF_QUICK_POLLS, DEFAULT_QUICK_POLLS)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+                vol.Optional(
+                    CONF_CONNECT_TIMEOUT,
+                    default=options.get(CONF_CONNECT_TIMEOUT, CONNECTION_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+                vol.Optional(
+                    CONF_COMMAND_TIMEOUT,
+                    default=options.get(CONF_COMMAND_TIMEOUT, COMMAND_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=30)),
+                vol.Optional(
+                    CONF_ENABLE_HTTP, default=options.get(CONF_ENABLE_HTTP, DEFAULT_ENABLE_HTTP)
+                ): bool,
+                vol.Optional(
+                    CONF_HTTP_TIMEOUT, default=options.get(CONF_HTTP_TIMEOUT, HTTP_TIMEOUT)
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+                vol.Optional(
+                    CONF_MAX_CONCURRENCY,
+                    default=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENCY)),
+                vol.Optional(CONF_BACKGROUND_SETUP, default=background): bool,
+                vol.Optional(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                vol.Optional(
+                    CONF_HUMIDITY_DEADBAND,
+                    default=options.get(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10)),
+                vol.Optional(
+                    CONF_CO2_DEADBAND, default=options.get(CONF_CO2_DEADBAND, DEFAULT_CO2_DEADBAND)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+                vol.Optional(
+                    CONF_MIN_REPORT_INTERVAL,
+                    default=options.get(CONF_MIN_REPORT_INTERVAL, DEFAULT_MIN_REPORT_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional(
+                    CONF_EXTERNAL_STATISTICS,
+                    default=options.get(CONF_EXTERNAL_STATISTICS, DEFAULT_EXTERNAL_STATISTICS),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=data_schema)
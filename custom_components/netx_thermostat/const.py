@@ -7,9 +7,141 @@ DEFAULT_PORT = 10001
 CONNECTION_TIMEOUT = 10
 COMMAND_TIMEOUT = 5
 
+# Adaptive command timeouts: CONNECTION_TIMEOUT and COMMAND_TIMEOUT (or
+# their options) are the upper bounds
+RTT_MIN_TIMEOUT = 0.5
+RTT_MIN_CONNECT_TIMEOUT = 1.0
+RTT_CONNECT_FACTOR = 3
+RTT_MAX_BACKOFF = 16
+
+# Replies still owed to timed-out or cancelled commands before the
+# session is considered out of sync and re-established
+MAX_STALE_REPLIES = 3
+
+# Command scheduling: priority classes (lower is served first) and the
+# token bucket limiting commands per second sent to one unit
+PRIORITY_INTERACTIVE = 0
+PRIORITY_REFRESH = 1
+PRIORITY_BACKGROUND = 2
+COMMAND_RATE = 10.0
+COMMAND_BURST = 10
+
+# Bounded queues behind NetXThermostatAPI.watch()
+WATCH_QUEUE_SIZE = 16
+WATCH_DROP_OLDEST = "drop_oldest"
+WATCH_COALESCE = "coalesce"
+
 # Update interval in seconds
 UPDATE_INTERVAL = 30
 
+# Seconds a written value is shown without a poll confirming it
+OPTIMISTIC_TIMEOUT = 90
+
+# Quick polls (stage/status only) run between full polls
+CONF_QUICK_POLLS = "quick_polls"
+DEFAULT_QUICK_POLLS = 0
+
+# Options (live tuning, see the options flow)
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+CONF_HTTP_TIMEOUT = "http_timeout"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+DEFAULT_MAX_CONCURRENCY = 1
+MAX_CONCURRENCY = 4
+
+# Sensor reporting: a reading within the deadband of the last reported one
+# is not written, and readings are written at most once per interval
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_CO2_DEADBAND = "co2_deadband"
+CONF_MIN_REPORT_INTERVAL = "min_report_interval"
+DEFAULT_TEMPERATURE_DEADBAND = 0.0
+DEFAULT_HUMIDITY_DEADBAND = 1
+DEFAULT_CO2_DEADBAND = 20
+DEFAULT_MIN_REPORT_INTERVAL = 0
+DEADBAND_TEMPERATURE = "temperature"
+DEADBAND_HUMIDITY = "humidity"
+DEADBAND_CO2 = "co2"
+
+# Long-term statistics aggregated in memory and imported hourly, keyed by
+# metric, with the state field each is read from
+CONF_EXTERNAL_STATISTICS = "external_statistics"
+DEFAULT_EXTERNAL_STATISTICS = False
+STATISTIC_FIELDS = {
+    "indoor_temperature": "indoor_temp",
+    "outdoor_temperature": "outdoor_temp",
+    "humidity": "humidity",
+    "co2": "co2_level",
+}
+
+# Entry setup
+CONF_DEVICE_NAME = "device_name"
+CONF_BACKGROUND_SETUP = "background_setup"
+DEFAULT_BACKGROUND_SETUP = False
+MAX_CONCURRENT_SETUPS = 8
+
+# HTTP-backed sensors (humidity from /index.xml, CO2 from /co2.json)
+CONF_ENABLE_HTTP = "enable_http"
+DEFAULT_ENABLE_HTTP = True
+HTTP_ENDPOINT_INDEX = "index"
+HTTP_ENDPOINT_CO2 = "co2"
+HTTP_ENDPOINT_PATHS = {
+    HTTP_ENDPOINT_INDEX: "/index.xml",
+    HTTP_ENDPOINT_CO2: "/co2.json",
+}
+HTTP_TIMEOUT = 10
+HTTP_PROBE_TIMEOUT = 5
+# Weekly schedule page, read on demand and cached for SCHEDULE_MAX_AGE seconds
+HTTP_SCHEDULE_PATH = "/schedule.xml"
+SCHEDULE_MAX_AGE = 3600
+HTTP_BREAKER_THRESHOLD = 3
+HTTP_BREAKER_RESET = 300
+
+# Source planner: each poll reads the cheapest sources covering the fields
+# it needs. Latency and success rate are smoothed with PLANNER_ALPHA, a
+# source never read costs PLANNER_DEFAULT_COST seconds, and failures count
+# half as much every PLANNER_FORGET_HALF_LIFE seconds. Plans are rebuilt
+# when a cost moves by PLANNER_REPLAN_RATIO or every PLANNER_REVIEW_INTERVAL
+# seconds. The costs of sources already planned are multiplied by
+# PLANNER_INCUMBENT_FACTOR, so near-equal sources do not take turns
+PLANNER_ALPHA = 0.2
+PLANNER_DEFAULT_COST = 0.5
+PLANNER_MIN_RELIABILITY = 0.05
+PLANNER_FORGET_HALF_LIFE = 600
+PLANNER_REPLAN_RATIO = 0.25
+PLANNER_REVIEW_INTERVAL = 300
+PLANNER_INCUMBENT_FACTOR = 0.8
+
+# An unreachable unit is retried after DEVICE_BREAKER_RESET seconds, doubling
+# up to DEVICE_BREAKER_MAX_RESET, each wait shortened by up to the jitter part
+DEVICE_BREAKER_THRESHOLD = 3
+DEVICE_BREAKER_RESET = 60
+DEVICE_BREAKER_MAX_RESET = 1800
+DEVICE_BREAKER_JITTER = 0.2
+
+# Device capabilities cached in the config entry
+CONF_CAPABILITIES = "capabilities"
+CAPABILITIES_HTTP = "http"
+CAPABILITIES_COMMANDS = "commands"
+CAPABILITY_RECHECK_INTERVAL = 7 * 24 * 3600
+
+# Subnet discovery
+CONF_NETWORK = "network"
+CONF_HOSTS = "hosts"
+DEFAULT_HTTP_PORT = 80
+DISCOVERY_CONCURRENCY = 128
+DISCOVERY_VERIFY_CONCURRENCY = 16
+DISCOVERY_TIMEOUT = 0.8
+DISCOVERY_MAX_HOSTS = 4096
+
+# hass.data keys shared by all entries
+DATA_SETUP_LIMITER = f"{DOMAIN}_setup_limiter"
+DATA_PENDING_CLIENTS = f"{DOMAIN}_pending_clients"
+# Hours in progress of unloaded entries, resumed when the entry is set up again
+DATA_STATISTICS = f"{DOMAIN}_statistics"
+# Seconds a session the config flow logged in with waits for its entry
+PENDING_CLIENT_TTL = 120
+
 # Temperature limits
 MIN_TEMP_HEAT = 35
 MAX_TEMP_HEAT = 89
@@ -35,6 +167,8 @@ CMD_GET_HUMIDIFICATION = "RMHS1"
 CMD_GET_DEHUMIDIFICATION = "RMDHS1"
 CMD_GET_RELAY_STATE = "RRS1"
 CMD_GET_SYSTEM_STATE = "RSS1"
+CMD_GET_OCCUPIED_COOL = "ROC1"
+CMD_GET_COOL_STAGES = "RCS1"
 
 # API Commands - Write (Manual Mode)
 CMD_SET_MODE_MANUAL = "WNMS1D"
@@ -90,6 +224,15 @@ PRESET_TO_RELAY = {
     PRESET_DEHUMIDIFY: RELAY_MODE_DEHUM,
 }
 
+# Device mode and fan mode (None = unchanged) each HVAC mode is written as
+HVAC_MODE_WRITES = {
+    "off": ("OFF", "AUTO"),
+    "heat": ("HEAT", None),
+    "cool": ("COOL", None),
+    "heat_cool": ("AUTO", None),
+    "fan_only": ("OFF", "ON"),
+}
+
 RELAY_TO_PRESET = {
     RELAY_MODE_OFF: PRESET_NONE,
     RELAY_MODE_HUM: PRESET_HUMIDIFY,
@@ -107,3 +250,31 @@ RESP_HUMIDIFICATION = "RMHS1:"
 RESP_DEHUMIDIFICATION = "RMDHS1:"
 RESP_RELAY_STATE = "RRS1:"
 RESP_SYSTEM_STATE = "RSS1:"
+RESP_OCCUPIED_COOL = "ROC1:"
+RESP_COOL_STAGES = "RCS1:"
+
+# Error responses
+RESP_ERRORS = ("BAD COMMAND", "ERROR", "?")
+
+# Read command probe results
+PROBE_SUPPORTED = "supported"
+PROBE_UNSUPPORTED = "unsupported"
+PROBE_NO_DATA = "no_data"
+PROBE_TIMEOUT = "timeout"
+
+# bulk_apply service: per-device deadline (seconds) and units written at once
+SERVICE_BULK_APPLY = "bulk_apply"
+BULK_TIMEOUT = 10
+DEFAULT_BULK_PARALLEL = 16
+MAX_BULK_PARALLEL = 64
+
+# profile service: window length (seconds) and entries listed per section
+SERVICE_PROFILE = "profile"
+DEFAULT_PROFILE_DURATION = 60
+MAX_PROFILE_DURATION = 600
+DEFAULT_PROFILE_TOP = 40
+
+# check_schedule service: per-device deadline (seconds) and units read at once
+SERVICE_CHECK_SCHEDULE = "check_schedule"
+SCHEDULE_TIMEOUT = 15
+DEFAULT_SCHEDULE_PARALLEL = 8
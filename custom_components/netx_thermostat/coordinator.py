@@ -1,38 +1,201 @@
 """Data coordinator for NetX Thermostat integration."""
 import logging
+import time
+from collections.abc import AsyncIterator, Iterable
 from datetime import timedelta
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONCENTRATION_PARTS_PER_MILLION, PERCENTAGE, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, UPDATE_INTERVAL
-from .api import NetXThermostatAPI, NetXThermostatState
+from .const import DOMAIN, UPDATE_INTERVAL, STATISTIC_FIELDS
+from .aggregator import HourBucket, HourlyAggregator
+from .api import NetXThermostatAPI, NetXThermostatState, StateChange
+from .optimistic import OptimisticState
 
 _LOGGER = logging.getLogger(__name__)
 
+_STATISTIC_UNITS = {"humidity": PERCENTAGE, "co2": CONCENTRATION_PARTS_PER_MILLION}
+
 
 class NetXDataUpdateCoordinator(DataUpdateCoordinator[NetXThermostatState]):
-    """Class to manage fetching NetX data."""
+    """Class to manage fetching NetX data.
+
+    With ``quick_polls`` set, that many quick polls (stage and status only)
+    run evenly spaced between two full polls.
+    """
 
-    def __init__(self, hass: HomeAssistant, api: NetXThermostatAPI) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: NetXThermostatAPI,
+        quick_polls: int = 0,
+        poll_interval: float = UPDATE_INTERVAL,
+    ) -> None:
         """Initialize the coordinator."""
         self.api = api
+        self.quick_polls = quick_polls
+        self.poll_interval = poll_interval
+        self._polls_until_full = 0
+        self.deadbands: dict[str, float] = {}
+        self.min_report_interval = 0.0
+        self._statistics: HourlyAggregator | None = None
+        self._statistic_prefix = ""
+        self._statistic_name = ""
+        self._entity_fields: dict[str, frozenset[str]] = {}
+        # Writes awaiting confirmation, shared by all entities of the device
+        self.optimistic = OptimisticState()
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+            update_interval=timedelta(seconds=poll_interval / (quick_polls + 1)),
+        )
+
+    def set_poll_interval(self, poll_interval: float, quick_polls: int) -> None:
+        """Change the full-poll interval and quick-poll count live.
+
+        The new interval applies from the next scheduled refresh.
+        """
+        self.poll_interval = poll_interval
+        self.quick_polls = quick_polls
+        self._polls_until_full = min(self._polls_until_full, quick_polls)
+        self.update_interval = timedelta(seconds=poll_interval / (quick_polls + 1))
+
+    def set_reporting(self, deadbands: dict[str, float], min_report_interval: float) -> None:
+        """Change how far and how often sensors must move to be written."""
+        self.deadbands = deadbands
+        self.min_report_interval = min_report_interval
+
+    @callback
+    def set_statistics(self, statistic_prefix: str | None, name: str = "") -> None:
+        """Import hourly statistics as ``statistic_prefix``_<metric>, or stop with None.
+
+        Stopping drops the hour in progress: imported early, it would be
+        overwritten by the import of the same hour if statistics are
+        turned back on within it.
+        """
+        if statistic_prefix is None:
+            self._statistics = None
+        else:
+            if self._statistics is None:
+                self._statistics = HourlyAggregator()
+            self._statistic_prefix = statistic_prefix
+            self._statistic_name = name
+        self._async_update_wanted()
+
+    @callback
+    def async_set_entity_fields(self, key: str, fields: frozenset[str] | None) -> None:
+        """Record the state fields an added entity shows, or None once it is removed.
+
+        The client then polls only the sources of fields some entity (or
+        the statistics) needs. Disabling an entity in the registry removes
+        it and enabling one reloads the entry, so the plan follows both.
+        """
+        if fields is None:
+            self._entity_fields.pop(key, None)
+        else:
+            self._entity_fields[key] = fields
+        self._async_update_wanted()
+
+    @callback
+    def _async_update_wanted(self) -> None:
+        """Pass the union of the fields in use to the client."""
+        if not self._entity_fields:
+            # Until the platforms have added their entities, read everything
+            self.api.set_wanted_fields(None)
+            return
+        wanted = set().union(*self._entity_fields.values())
+        if self._statistics is not None:
+            wanted.update(STATISTIC_FIELDS.values())
+        self.api.set_wanted_fields(wanted)
+
+    @callback
+    def async_resume_statistics(self, aggregator: HourlyAggregator) -> None:
+        """Continue the hours in progress of an earlier setup of the entry."""
+        self._statistics = aggregator
+
+    @callback
+    def async_suspend_statistics(self) -> HourlyAggregator | None:
+        """Hand over the hours in progress, e.g. before unloading, and stop aggregating.
+
+        They are not imported here, since a reload within the hour would
+        import the same hour again with only the readings after it.
+        """
+        aggregator, self._statistics = self._statistics, None
+        return aggregator
+
+    @callback
+    def _async_aggregate(self, state: NetXThermostatState, started: float) -> None:
+        """Fold the readings this cycle refreshed into the hourly buckets."""
+        temperature = (
+            UnitOfTemperature.CELSIUS if state.temp_scale == "C" else UnitOfTemperature.FAHRENHEIT
         )
+        samples = {}
+        for metric, name in STATISTIC_FIELDS.items():
+            value = getattr(state, name)
+            if state.updated_at.get(name, 0.0) < started or value is None:
+                continue
+            # The HTTP readings are 0 when the unit has no such sensor
+            if metric in _STATISTIC_UNITS and value <= 0:
+                continue
+            samples[metric] = (value, _STATISTIC_UNITS.get(metric, temperature))
+        if closed := self._statistics.add(samples):
+            self._async_import_statistics(closed)
+
+    @callback
+    def _async_import_statistics(self, closed: list[tuple[str, HourBucket]]) -> None:
+        """Hand closed hours to the recorder as external statistics."""
+        if not closed or "recorder" not in self.hass.config.components:
+            return
+        # Only loaded when statistics are enabled, it pulls in the database layer
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        for metric, bucket in closed:
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self._statistic_name} {metric.replace('_', ' ').capitalize()}",
+                source=DOMAIN,
+                statistic_id=f"{self._statistic_prefix}_{metric}",
+                unit_of_measurement=bucket.unit,
+            )
+            row = StatisticData(
+                start=dt_util.utc_from_timestamp(bucket.start),
+                mean=bucket.mean,
+                min=bucket.minimum,
+                max=bucket.maximum,
+            )
+            async_add_external_statistics(self.hass, metadata, [row])
+
+    def watch(self, fields: Iterable[str] | None = None, **kwargs: Any) -> AsyncIterator[StateChange]:
+        """Stream changes to ``fields``, see ``NetXThermostatAPI.watch``."""
+        return self.api.watch(fields, **kwargs)
 
     async def _async_update_data(self) -> NetXThermostatState:
         """Fetch data from TCP API."""
+        full = self._polls_until_full <= 0
+        self._polls_until_full = self.quick_polls if full else self._polls_until_full - 1
+        started = time.time()
         try:
-            state = await self.api.async_update()
-            
-            if not state.connected:
-                raise UpdateFailed(f"Failed to connect: {state.last_error}")
-            
+            # A cycle never runs into the next one
+            state = await self.api.async_update(
+                full=full, budget=self.update_interval.total_seconds()
+            )
+
+            # Fields read before a failure are still worth publishing; a
+            # cycle that refreshed nothing is a failed update
+            if not state.updated_since(started):
+                if not state.connected:
+                    raise UpdateFailed(f"Failed to connect: {state.last_error}")
+                raise UpdateFailed(f"No data received: {state.last_error}")
+
+            if self._statistics is not None:
+                self._async_aggregate(state, started)
             return state
 
         except Exception as err:
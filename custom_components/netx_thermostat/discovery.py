@@ -0,0 +1,149 @@
+"""Subnet discovery of NetX thermostats.
+
+Plain asyncio with no Home Assistant imports, so the scanner can be run
+against local simulators from ``netx_tools``.
+"""
+import asyncio
+import ipaddress
+import logging
+import time
+from dataclasses import dataclass
+
+from .const import (
+    DEFAULT_PORT,
+    DEFAULT_HTTP_PORT,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_VERIFY_CONCURRENCY,
+    DISCOVERY_TIMEOUT,
+    DISCOVERY_MAX_HOSTS,
+    HTTP_ENDPOINT_PATHS,
+    HTTP_ENDPOINT_INDEX,
+)
+from .api import NetXThermostatAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class DiscoveredThermostat:
+    """A host answering on the NetX TCP API port."""
+
+    host: str
+    port: int
+    latency: float  # TCP connect time in seconds
+    http: bool = False  # /index.xml answered on the HTTP port
+
+
+def expand_network(network: str) -> list[str]:
+    """Return the host addresses of a CIDR range (or a single address)."""
+    net = ipaddress.ip_network(network.strip(), strict=False)
+    if net.num_addresses > DISCOVERY_MAX_HOSTS:
+        raise ValueError(f"{network} has more than {DISCOVERY_MAX_HOSTS} addresses")
+    if net.num_addresses == 1:
+        return [str(net.network_address)]
+    return [str(host) for host in net.hosts()]
+
+
+async def _async_probe_tcp(host: str, port: int, timeout: float) -> float | None:
+    """Return the connect time to host:port, or None if it does not answer."""
+    start = time.monotonic()
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return None
+    latency = time.monotonic() - start
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return latency
+
+
+async def _async_probe_http(host: str, port: int, timeout: float) -> bool:
+    """Return True if the host serves /index.xml (even behind auth)."""
+    path = HTTP_ENDPOINT_PATHS[HTTP_ENDPOINT_INDEX]
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return False
+    try:
+        writer.write(f"HEAD {path} HTTP/1.0\r\nHost: {host}\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+    except (asyncio.TimeoutError, OSError):
+        return False
+    finally:
+        writer.close()
+    parts = status_line.split()
+    return len(parts) >= 2 and parts[1] in (b"200", b"401")
+
+
+async def async_scan(
+    network: str,
+    port: int = DEFAULT_PORT,
+    http_port: int | None = DEFAULT_HTTP_PORT,
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    timeout: float = DISCOVERY_TIMEOUT,
+) -> list[DiscoveredThermostat]:
+    """Scan a network for hosts answering on the NetX port, fastest first."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(host: str) -> DiscoveredThermostat | None:
+        async with semaphore:
+            latency = await _async_probe_tcp(host, port, timeout)
+            if latency is None:
+                return None
+            found = DiscoveredThermostat(host, port, latency)
+            if http_port:
+                found.http = await _async_probe_http(host, http_port, timeout)
+            return found
+
+    hosts = expand_network(network)
+    start = time.monotonic()
+    results = await asyncio.gather(*(_probe(host) for host in hosts))
+    found = sorted((r for r in results if r is not None), key=lambda r: r.latency)
+    _LOGGER.debug(
+        "Scanned %d hosts in %.2fs, %d responded", len(hosts), time.monotonic() - start, len(found)
+    )
+    return found
+
+
+async def async_login(
+    found: list[DiscoveredThermostat],
+    username: str,
+    password: str,
+    concurrency: int = DISCOVERY_VERIFY_CONCURRENCY,
+) -> dict[str, NetXThermostatAPI | None]:
+    """Log in to each discovered host in parallel; return host -> live client.
+
+    Hosts that refused the credentials map to None. The caller owns the
+    returned clients and must hand them on or disconnect them.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _login(item: DiscoveredThermostat) -> NetXThermostatAPI | None:
+        api = NetXThermostatAPI(item.host, username, password, port=item.port, enable_http=False)
+        ok = False
+        async with semaphore:
+            try:
+                ok = await api.connect()
+            finally:
+                if not ok:
+                    await api.disconnect()
+        return api if ok else None
+
+    results = await asyncio.gather(*(_login(item) for item in found))
+    return {item.host: api for item, api in zip(found, results)}
+
+
+async def async_verify(
+    found: list[DiscoveredThermostat],
+    username: str,
+    password: str,
+    concurrency: int = DISCOVERY_VERIFY_CONCURRENCY,
+) -> dict[str, bool]:
+    """Log in to each discovered host in parallel; return host -> credentials ok."""
+    clients = await async_login(found, username, password, concurrency)
+    await asyncio.gather(*(api.disconnect() for api in clients.values() if api is not None))
+    return {host: api is not None for host, api in clients.items()}
@@ -0,0 +1,173 @@
+"""Shared entity base and description plumbing for NetX Thermostat."""
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, CONF_DEVICE_NAME
+from .api import NetXThermostatAPI, NetXThermostatState
+from .coordinator import NetXDataUpdateCoordinator
+from .optimistic import OptimisticState
+
+
+def build_device_info(entry: ConfigEntry) -> Mapping[str, Any]:
+    """Return the device info shared, read-only, by every entity of an entry."""
+    return MappingProxyType(
+        DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.data.get(CONF_DEVICE_NAME, "NetX Thermostat"),
+            manufacturer="NetX",
+            model="Network Thermostat",
+        )
+    )
+
+
+def field_value(name: str) -> Callable[[NetXThermostatState], Any]:
+    """Return an accessor for a state field."""
+    return attrgetter(name)
+
+
+def field_is_set(name: str) -> Callable[[NetXThermostatState], bool]:
+    """Return a check that a state field holds a value."""
+    getter = attrgetter(name)
+    return lambda state: getter(state) is not None
+
+
+def _always(api: NetXThermostatAPI) -> bool:
+    """Create the entity on every unit."""
+    return True
+
+
+@dataclass(frozen=True, kw_only=True)
+class NetXEntityDescription(EntityDescription):
+    """Describes where a NetX entity reads its state from.
+
+    ``available_fn`` is only consulted once the coordinator has data;
+    without it the entity is available whenever the last update was.
+    ``exists_fn`` decides whether a unit gets the entity at all, and
+    ``fields`` names the state fields the functions read, so that only
+    the sources of enabled entities are polled.
+    """
+
+    value_fn: Callable[[NetXThermostatState], Any]
+    fields: frozenset[str] = frozenset()
+    available_fn: Callable[[NetXThermostatState], bool] | None = None
+    attrs_fn: Callable[[NetXThermostatState], dict[str, Any]] | None = None
+    exists_fn: Callable[[NetXThermostatAPI], bool] = _always
+
+
+class NetXOptimisticEntity(CoordinatorEntity[NetXDataUpdateCoordinator]):
+    """Coordinator entity that shows its writes before the device confirms them."""
+
+    def __init__(self, coordinator: NetXDataUpdateCoordinator) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._optimistic: OptimisticState = coordinator.optimistic
+
+    @property
+    def _state(self) -> NetXThermostatState | None:
+        """Return the snapshot with pending writes applied."""
+        return self._optimistic.overlay(self.coordinator.data)
+
+    @property
+    def data_fields(self) -> frozenset[str]:
+        """Return the state fields this entity shows, which decide what is polled."""
+        return frozenset()
+
+    async def async_added_to_hass(self) -> None:
+        """Have the fields this entity shows polled."""
+        await super().async_added_to_hass()
+        self.coordinator.async_set_entity_fields(self.unique_id, self.data_fields)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop polling for this entity."""
+        self.coordinator.async_set_entity_fields(self.unique_id, None)
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _async_state_changed(self) -> None:
+        """Let subclasses drop values derived from the previous state."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Settle pending writes against the new snapshot."""
+        self._optimistic.resolve(self.coordinator.data)
+        self._async_state_changed()
+        super()._handle_coordinator_update()
+
+    async def _async_write(self, values: Mapping[str, Any], write: Awaitable[bool]) -> None:
+        """Show ``values`` right away, run ``write``, and roll back if it fails."""
+        token = self._optimistic.apply(values)
+        self._async_state_changed()
+        self.async_write_ha_state()
+        ok = False
+        try:
+            ok = await write
+        finally:
+            if not ok:
+                self._optimistic.discard(token)
+                self._async_state_changed()
+                self.async_write_ha_state()
+        if not ok:
+            raise HomeAssistantError(f"The thermostat rejected the change to {self.entity_id}")
+        self._optimistic.confirm(token)
+        await self.coordinator.async_request_refresh()
+
+
+class NetXEntity(NetXOptimisticEntity):
+    """Base class for the description-driven NetX entities."""
+
+    _attr_has_entity_name = True
+    entity_description: NetXEntityDescription
+
+    def __init__(
+        self,
+        coordinator: NetXDataUpdateCoordinator,
+        entry_id: str,
+        device_info: Mapping[str, Any],
+        description: NetXEntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry_id}_{description.key}"
+        self._attr_device_info = device_info
+
+    @property
+    def data_fields(self) -> frozenset[str]:
+        """Return the state fields the description reads."""
+        return self.entity_description.fields
+
+    @property
+    def _value(self) -> Any:
+        """Return the described value of the current snapshot."""
+        if (state := self._state) is None:
+            return None
+        return self.entity_description.value_fn(state)
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        available_fn = self.entity_description.available_fn
+        if available_fn is None:
+            return super().available
+        state = self._state
+        return super().available and state is not None and available_fn(state)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return extra state attributes."""
+        attrs_fn = self.entity_description.attrs_fn
+        state = self._state
+        attrs = attrs_fn(state) if attrs_fn is not None and state is not None else None
+        if self._optimistic.is_pending(self.data_fields):
+            return {**(attrs or {}), "pending": True}
+        return attrs
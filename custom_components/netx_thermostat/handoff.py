@@ -0,0 +1,48 @@
+"""Hand authenticated clients from the config flow over to entry setup."""
+import logging
+from functools import partial
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_PENDING_CLIENTS, PENDING_CLIENT_TTL
+from .api import NetXThermostatAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_stash_client(hass: HomeAssistant, unique_id: str, api: NetXThermostatAPI) -> None:
+    """Park a connected client until the entry it belongs to is set up."""
+    pending = hass.data.setdefault(DATA_PENDING_CLIENTS, {})
+    previous = pending.pop(unique_id, None)
+    if previous is not None:
+        previous[1]()
+        hass.async_create_task(previous[0].disconnect())
+
+    cancel = async_call_later(
+        hass, PENDING_CLIENT_TTL, partial(_async_expire_client, hass, unique_id)
+    )
+    pending[unique_id] = (api, cancel)
+
+
+@callback
+def async_claim_client(hass: HomeAssistant, unique_id: str | None) -> NetXThermostatAPI | None:
+    """Take ownership of a parked client, if one is waiting."""
+    if unique_id is None:
+        return None
+    pending = hass.data.get(DATA_PENDING_CLIENTS, {})
+    if (item := pending.pop(unique_id, None)) is None:
+        return None
+    api, cancel = item
+    cancel()
+    return api
+
+
+async def _async_expire_client(hass: HomeAssistant, unique_id: str, _now) -> None:
+    """Drop a parked client that no entry setup claimed in time."""
+    pending = hass.data.get(DATA_PENDING_CLIENTS, {})
+    if (item := pending.pop(unique_id, None)) is None:
+        return
+    _LOGGER.debug("Discarding unclaimed connection to %s", unique_id)
+    await item[0].disconnect()
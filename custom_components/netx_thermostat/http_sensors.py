@@ -0,0 +1,216 @@
+"""HTTP sensor client for NetX Thermostat (humidity and CO2).
+
+Imported lazily by the API client, only when HTTP-backed entities are
+enabled for an entry.
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+from collections.abc import Iterable
+
+import aiohttp
+
+from .const import (
+    HTTP_ENDPOINT_INDEX,
+    HTTP_ENDPOINT_CO2,
+    HTTP_ENDPOINT_PATHS,
+    HTTP_TIMEOUT,
+    HTTP_PROBE_TIMEOUT,
+    HTTP_BREAKER_THRESHOLD,
+    HTTP_BREAKER_RESET,
+)
+from .circuit import CircuitBreaker
+from .protocol import HTTP_ENDPOINT_FIELDS, NetXThermostatState
+
+_LOGGER = logging.getLogger(__name__)
+
+HUMIDITY_PATTERN = re.compile(r"<humidity>(\d+)</humidity>", re.IGNORECASE)
+
+
+class NetXHttpSensors:
+    """Reads the humidity and CO2 values only exposed over HTTP.
+
+    Only ``endpoints`` are polled. An endpoint answering 404 is dropped
+    from that set until capabilities are probed again, and each endpoint
+    sits behind its own circuit breaker so a failing one is skipped.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        endpoints: Iterable[str] | None = None,
+        timeout: float = HTTP_TIMEOUT,
+    ) -> None:
+        """Initialize the HTTP sensor client."""
+        self.host = host
+        self.timeout = timeout
+        self._auth = aiohttp.BasicAuth(username, password)
+        self._session: aiohttp.ClientSession | None = None
+        self.endpoints = set(HTTP_ENDPOINT_PATHS if endpoints is None else endpoints)
+        self._breakers = {
+            name: CircuitBreaker(HTTP_BREAKER_THRESHOLD, HTTP_BREAKER_RESET)
+            for name in HTTP_ENDPOINT_PATHS
+        }
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create HTTP session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self) -> None:
+        """Close HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get(self, name: str, timeout: float | None = None) -> tuple[int, str]:
+        """GET an endpoint, returning its status and (for 200) its body."""
+        return await self.async_get_path(HTTP_ENDPOINT_PATHS[name], timeout)
+
+    async def async_get_path(self, path: str, timeout: float | None = None) -> tuple[int, str]:
+        """GET any page of the unit, returning its status and (for 200) its body."""
+        session = await self._get_session()
+        url = f"http://{self.host}{path}"
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout if timeout is None else timeout)
+        async with session.get(url, auth=self._auth, timeout=client_timeout) as response:
+            if response.status != 200:
+                return response.status, ""
+            return response.status, await response.text()
+
+    async def async_fetch(
+        self,
+        state: NetXThermostatState,
+        concurrency: int = 1,
+        wanted: Iterable[str] | None = None,
+    ) -> dict[str, tuple[float, bool]]:
+        """Fetch humidity and CO2 data via HTTP, up to ``concurrency`` at once.
+
+        With ``wanted``, only endpoints among those are fetched. Returns
+        the seconds each fetched endpoint took and whether it was read.
+        """
+        names = [
+            name for name in HTTP_ENDPOINT_PATHS
+            if name in self.endpoints
+            and (wanted is None or name in wanted)
+            and self._allow(name)
+        ]
+        if concurrency > 1 and len(names) > 1:
+            results = await asyncio.gather(*(self._fetch_endpoint(name, state) for name in names))
+            return dict(zip(names, results))
+        return {name: await self._fetch_endpoint(name, state) for name in names}
+
+    def _allow(self, name: str) -> bool:
+        """Return True unless the endpoint's circuit is open."""
+        breaker = self._breakers[name]
+        if breaker.allow():
+            return True
+        _LOGGER.debug("HTTP %s skipped, circuit %s", name, breaker.state)
+        return False
+
+    async def _fetch_endpoint(
+        self, name: str, state: NetXThermostatState
+    ) -> tuple[float, bool]:
+        """Fetch one endpoint and parse it into the state; return its time and success."""
+        breaker = self._breakers[name]
+        started = time.monotonic()
+        try:
+            status, body = await self._get(name)
+            if status == 200:
+                _PARSERS[name](body, state)
+                state.mark_updated(HTTP_ENDPOINT_FIELDS[name], time.time())
+                breaker.record_success()
+                return time.monotonic() - started, True
+            elif status == 404:
+                _LOGGER.debug("HTTP %s not available (404), no longer polled", name)
+                self.endpoints.discard(name)
+            else:
+                _LOGGER.debug("HTTP %s returned %s", name, status)
+                breaker.record_failure()
+        except asyncio.TimeoutError:
+            _LOGGER.debug("HTTP %s fetch timeout", name)
+            breaker.record_failure()
+        except Exception as err:
+            _LOGGER.debug("HTTP %s fetch error (non-critical): %s", name, err)
+            breaker.record_failure()
+        return time.monotonic() - started, False
+
+    async def async_probe(self) -> dict[str, bool]:
+        """Check which HTTP endpoints this unit serves.
+
+        Endpoints that could not be checked (timeouts, server errors) are
+        left out of the result so they keep their previous status.
+        """
+        supported = {}
+        for name in HTTP_ENDPOINT_PATHS:
+            try:
+                status, body = await self._get(name, HTTP_PROBE_TIMEOUT)
+            except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+                _LOGGER.debug("HTTP %s probe inconclusive: %s", name, err)
+                continue
+            if status == 404:
+                supported[name] = False
+            elif status == 200:
+                try:
+                    supported[name] = _PROBES[name](body)
+                except ValueError as err:
+                    _LOGGER.debug("HTTP %s probe parse error: %s", name, err)
+                    supported[name] = False
+        return supported
+
+
+def parse_index(text: str, state: NetXThermostatState) -> None:
+    """Parse humidity from index.xml: <humidity>25</humidity>."""
+    match = HUMIDITY_PATTERN.search(text)
+    if match:
+        state.humidity = int(match.group(1))
+        _LOGGER.debug("HTTP humidity: %s%%", state.humidity)
+
+
+def _parse_int(value: str) -> int | None:
+    """Parse a numeric string, returning None when it is not a number."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def parse_co2(text: str, state: NetXThermostatState) -> None:
+    """Parse the co2.json document."""
+    # CO2 data is nested: {"co2": {"level": "635", ...}}
+    co2_data = json.loads(text).get("co2", {})
+
+    # Check if valid
+    if co2_data.get("valid", "").lower() != "true":
+        _LOGGER.debug("CO2 module reports invalid data")
+        return
+
+    # Values come as strings
+    if (level := _parse_int(co2_data.get("level", ""))) is not None:
+        state.co2_level = level
+        _LOGGER.debug("HTTP CO2 level: %s ppm", level)
+    if (peak := _parse_int(co2_data.get("peak_level", ""))) is not None:
+        state.co2_peak_level = peak
+    if (alert := _parse_int(co2_data.get("alert_level", ""))) is not None:
+        state.co2_alert_level = alert
+
+    # In alert state
+    state.co2_in_alert = co2_data.get("in_alert", "").lower() == "true"
+
+
+_PARSERS = {
+    HTTP_ENDPOINT_INDEX: parse_index,
+    HTTP_ENDPOINT_CO2: parse_co2,
+}
+
+# What a 200 body must contain for the capability to count as present
+_PROBES = {
+    HTTP_ENDPOINT_INDEX: lambda text: HUMIDITY_PATTERN.search(text) is not None,
+    HTTP_ENDPOINT_CO2: lambda text: isinstance(json.loads(text).get("co2"), dict),
+}
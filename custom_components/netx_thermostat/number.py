@@ -1,227 +1,188 @@
 """Number platform for NetX Thermostat integration."""
 import logging
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
 
-from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.components.number import NumberEntity, NumberEntityDescription, NumberMode
 from homeassistant.const import PERCENTAGE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import NetXDataUpdateCoordinator
-from .api import NetXThermostatAPI
+from .api import NetXThermostatAPI, NetXThermostatState
+from .entity import NetXEntity, NetXEntityDescription, field_value, field_is_set
+from .protocol import DEHUM_FIELDS, HUM_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def async_setup_entry(
-    hass: HomeAssistant,
-    config_entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback,
-) -> None:
-    """Set up the NetX Thermostat number platform."""
-    data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = data["coordinator"]
-    api = data["api"]
+@dataclass(frozen=True, kw_only=True)
+class NetXNumberEntityDescription(NetXEntityDescription, NumberEntityDescription):
+    """Describes a NetX number, how to write it and the state fields a write sets."""
 
-    entities = [
-        NetXHumSetpointNumber(coordinator, api, config_entry),
-        NetXHumVarianceNumber(coordinator, api, config_entry),
-        NetXDehumSetpointNumber(coordinator, api, config_entry),
-        NetXDehumVarianceNumber(coordinator, api, config_entry),
-    ]
+    set_fn: Callable[[NetXThermostatAPI, NetXThermostatState | None, int], Awaitable[bool]]
+    optimistic_fn: Callable[[int], Mapping[str, Any]]
 
-    async_add_entities(entities)
 
+def _float_field(name: str) -> Callable[[NetXThermostatState], float | None]:
+    """Return an accessor for an integer field, as a float."""
+    getter = field_value(name)
+    return lambda state: None if (value := getter(state)) is None else float(value)
 
-class NetXBaseNumber(CoordinatorEntity[NetXDataUpdateCoordinator], NumberEntity):
-    """Base class for NetX number entities."""
 
-    _attr_has_entity_name = True
+def _sets_field(name: str) -> Callable[[int], Mapping[str, Any]]:
+    """Return the optimistic update of a number stored in one state field."""
+    return lambda value: {name: value}
 
-    def __init__(
-        self,
-        coordinator: NetXDataUpdateCoordinator,
-        api: NetXThermostatAPI,
-        config_entry: ConfigEntry,
-    ) -> None:
-        """Initialize the number entity."""
-        super().__init__(coordinator)
-        self._api = api
-        device_name = config_entry.data.get("device_name", "NetX Thermostat")
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "NetX",
-            "model": "Network Thermostat",
-        }
-        self._config_entry = config_entry
-
-
-class NetXHumSetpointNumber(NetXBaseNumber):
-    """Humidification setpoint control."""
-
-    _attr_name = "Humidify Below"
-    _attr_icon = "mdi:water-plus"
-    _attr_native_min_value = 10
-    _attr_native_max_value = 90
-    _attr_native_step = 1
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_mode = NumberMode.SLIDER
-
-    def __init__(self, coordinator, api, config_entry) -> None:
-        """Initialize."""
-        super().__init__(coordinator, api, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_hum_setpoint"
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value."""
-        if self.coordinator.data and self.coordinator.data.hum_setpoint is not None:
-            return float(self.coordinator.data.hum_setpoint)
-        return None
+def _set_humidification(setting: str) -> Callable[..., Awaitable[bool]]:
+    """Return a writer changing one humidification setting, keeping the others."""
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.hum_setpoint is not None
-        )
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Set the humidification setpoint."""
-        state = self.coordinator.data
+    def set_value(
+        api: NetXThermostatAPI, state: NetXThermostatState | None, value: int
+    ) -> Awaitable[bool]:
+        """Write the humidification settings."""
         independent = state.hum_control_mode == "IH" if state else False
+        setpoint = state.hum_setpoint if state and state.hum_setpoint else 50
         variance = state.hum_variance if state and state.hum_variance else 5
-        
-        await self._api.async_set_humidification(independent, int(value), variance)
-        await self.coordinator.async_request_refresh()
+        if setting == "setpoint":
+            setpoint = value
+        else:
+            variance = value
+        return api.async_set_humidification(independent, setpoint, variance)
 
+    return set_value
 
-class NetXHumVarianceNumber(NetXBaseNumber):
-    """Humidification variance control."""
 
-    _attr_name = "Humidify Variance"
-    _attr_icon = "mdi:plus-minus-variant"
-    _attr_native_min_value = 2
-    _attr_native_max_value = 10
-    _attr_native_step = 1
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_mode = NumberMode.BOX
+def _set_dehumidification(setting: str) -> Callable[..., Awaitable[bool]]:
+    """Return a writer changing one dehumidification setting, keeping the others."""
 
-    def __init__(self, coordinator, api, config_entry) -> None:
-        """Initialize."""
-        super().__init__(coordinator, api, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_hum_variance"
+    def set_value(
+        api: NetXThermostatAPI, state: NetXThermostatState | None, value: int
+    ) -> Awaitable[bool]:
+        """Write the dehumidification settings."""
+        independent = state.dehum_control_mode == "IC" if state else True
+        setpoint = state.dehum_setpoint if state and state.dehum_setpoint else 55
+        variance = state.dehum_variance if state and state.dehum_variance else 5
+        if setting == "setpoint":
+            setpoint = value
+        else:
+            variance = value
+        return api.async_set_dehumidification(independent, setpoint, variance)
+
+    return set_value
+
+
+NUMBERS: tuple[NetXNumberEntityDescription, ...] = (
+    NetXNumberEntityDescription(
+        key="hum_setpoint",
+        name="Humidify Below",
+        icon="mdi:water-plus",
+        native_min_value=10,
+        native_max_value=90,
+        native_step=1,
+        native_unit_of_measurement=PERCENTAGE,
+        mode=NumberMode.SLIDER,
+        fields=HUM_FIELDS,
+        value_fn=_float_field("hum_setpoint"),
+        available_fn=field_is_set("hum_setpoint"),
+        optimistic_fn=_sets_field("hum_setpoint"),
+        set_fn=_set_humidification("setpoint"),
+    ),
+    NetXNumberEntityDescription(
+        key="hum_variance",
+        name="Humidify Variance",
+        icon="mdi:plus-minus-variant",
+        native_min_value=2,
+        native_max_value=10,
+        native_step=1,
+        native_unit_of_measurement=PERCENTAGE,
+        mode=NumberMode.BOX,
+        fields=HUM_FIELDS,
+        value_fn=_float_field("hum_variance"),
+        available_fn=field_is_set("hum_variance"),
+        optimistic_fn=_sets_field("hum_variance"),
+        set_fn=_set_humidification("variance"),
+    ),
+    NetXNumberEntityDescription(
+        key="dehum_setpoint",
+        name="Dehumidify Above",
+        icon="mdi:water-minus",
+        native_min_value=10,
+        native_max_value=90,
+        native_step=1,
+        native_unit_of_measurement=PERCENTAGE,
+        mode=NumberMode.SLIDER,
+        fields=DEHUM_FIELDS,
+        value_fn=_float_field("dehum_setpoint"),
+        available_fn=field_is_set("dehum_setpoint"),
+        optimistic_fn=_sets_field("dehum_setpoint"),
+        set_fn=_set_dehumidification("setpoint"),
+    ),
+    NetXNumberEntityDescription(
+        key="dehum_variance",
+        name="Dehumidify Variance",
+        icon="mdi:plus-minus-variant",
+        native_min_value=2,
+        native_max_value=10,
+        native_step=1,
+        native_unit_of_measurement=PERCENTAGE,
+        mode=NumberMode.BOX,
+        fields=DEHUM_FIELDS,
+        value_fn=_float_field("dehum_variance"),
+        available_fn=field_is_set("dehum_variance"),
+        optimistic_fn=_sets_field("dehum_variance"),
+        set_fn=_set_dehumidification("variance"),
+    ),
+)
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value."""
-        if self.coordinator.data and self.coordinator.data.hum_variance is not None:
-            return float(self.coordinator.data.hum_variance)
-        return None
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.hum_variance is not None
-        )
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the NetX Thermostat number platform."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = data["coordinator"]
+    api = data["api"]
 
-    async def async_set_native_value(self, value: float) -> None:
-        """Set the humidification variance."""
-        state = self.coordinator.data
-        independent = state.hum_control_mode == "IH" if state else False
-        setpoint = state.hum_setpoint if state and state.hum_setpoint else 50
-        
-        await self._api.async_set_humidification(independent, setpoint, int(value))
-        await self.coordinator.async_request_refresh()
+    async_add_entities(
+        NetXNumber(coordinator, api, config_entry.entry_id, data["device_info"], description)
+        for description in NUMBERS
+        if description.exists_fn(api)
+    )
 
 
-class NetXDehumSetpointNumber(NetXBaseNumber):
-    """Dehumidification setpoint control."""
+class NetXNumber(NetXEntity, NumberEntity):
+    """A NetX number driven by its description."""
 
-    _attr_name = "Dehumidify Above"
-    _attr_icon = "mdi:water-minus"
-    _attr_native_min_value = 10
-    _attr_native_max_value = 90
-    _attr_native_step = 1
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_mode = NumberMode.SLIDER
+    entity_description: NetXNumberEntityDescription
 
-    def __init__(self, coordinator, api, config_entry) -> None:
-        """Initialize."""
-        super().__init__(coordinator, api, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_dehum_setpoint"
+    def __init__(
+        self,
+        coordinator: NetXDataUpdateCoordinator,
+        api: NetXThermostatAPI,
+        entry_id: str,
+        device_info: Mapping[str, Any],
+        description: NetXNumberEntityDescription,
+    ) -> None:
+        """Initialize the number entity."""
+        super().__init__(coordinator, entry_id, device_info, description)
+        self._api = api
 
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        if self.coordinator.data and self.coordinator.data.dehum_setpoint is not None:
-            return float(self.coordinator.data.dehum_setpoint)
-        return None
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.dehum_setpoint is not None
-        )
+        return self._value
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set the dehumidification setpoint."""
-        state = self.coordinator.data
-        independent = state.dehum_control_mode == "IC" if state else True
-        variance = state.dehum_variance if state and state.dehum_variance else 5
-        
-        await self._api.async_set_dehumidification(independent, int(value), variance)
-        await self.coordinator.async_request_refresh()
-
-
-class NetXDehumVarianceNumber(NetXBaseNumber):
-    """Dehumidification variance control."""
-
-    _attr_name = "Dehumidify Variance"
-    _attr_icon = "mdi:plus-minus-variant"
-    _attr_native_min_value = 2
-    _attr_native_max_value = 10
-    _attr_native_step = 1
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_mode = NumberMode.BOX
-
-    def __init__(self, coordinator, api, config_entry) -> None:
-        """Initialize."""
-        super().__init__(coordinator, api, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_dehum_variance"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the current value."""
-        if self.coordinator.data and self.coordinator.data.dehum_variance is not None:
-            return float(self.coordinator.data.dehum_variance)
-        return None
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.dehum_variance is not None
+        """Write the new value, showing it until the device confirms or refutes it."""
+        description = self.entity_description
+        await self._async_write(
+            description.optimistic_fn(int(value)),
+            description.set_fn(self._api, self._state, int(value)),
         )
-
-    async def async_set_native_value(self, value: float) -> None:
-        """Set the dehumidification variance."""
-        state = self.coordinator.data
-        independent = state.dehum_control_mode == "IC" if state else True
-        setpoint = state.dehum_setpoint if state and state.dehum_setpoint else 55
-        
-        await self._api.async_set_dehumidification(independent, setpoint, int(value))
-        await self.coordinator.async_request_refresh()
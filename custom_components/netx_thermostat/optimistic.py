@@ -0,0 +1,73 @@
+"""Writes shown before the thermostat confirms them."""
+import dataclasses
+import itertools
+import math
+import time
+from collections.abc import Collection, Mapping
+from typing import Any
+
+from .const import OPTIMISTIC_TIMEOUT
+from .protocol import NetXThermostatState
+
+
+class OptimisticState:
+    """State fields shown ahead of the device confirming a write.
+
+    A value applies as soon as the write is requested, and is dropped at
+    once if the write fails. After a successful write it stays until a poll
+    refreshes the field, which is the device's word whether it agrees or
+    not, or until ``OPTIMISTIC_TIMEOUT`` passes without one.
+
+    The coordinator holds one instance shared by all entities of the
+    device, so a write builds on sibling writes still awaiting confirmation.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with nothing pending."""
+        self._values: dict[str, Any] = {}
+        self._since: dict[str, float] = {}
+        self._owner: dict[str, int] = {}
+        self._tokens = itertools.count()
+
+    def is_pending(self, fields: Collection[str]) -> bool:
+        """Return True while a value of any of ``fields`` awaits confirmation."""
+        return not self._values.keys().isdisjoint(fields)
+
+    def apply(self, values: Mapping[str, Any]) -> int:
+        """Show ``values`` from now on; return a token for the write."""
+        token = next(self._tokens)
+        for name, value in values.items():
+            self._values[name] = value
+            self._since[name] = math.inf
+            self._owner[name] = token
+        return token
+
+    def confirm(self, token: int) -> None:
+        """Mark the write as accepted; polls after this moment settle it."""
+        now = time.time()
+        for name, owner in self._owner.items():
+            if owner == token:
+                self._since[name] = now
+
+    def discard(self, token: int) -> None:
+        """Drop the values of a failed write, unless a newer write took them over."""
+        for name in [name for name, owner in self._owner.items() if owner == token]:
+            self._drop(name)
+
+    def resolve(self, state: NetXThermostatState | None) -> None:
+        """Drop values a newer poll has settled, and the ones that expired."""
+        now = time.time()
+        updated_at = state.updated_at if state is not None else {}
+        for name, since in list(self._since.items()):
+            if updated_at.get(name, 0.0) >= since or now - since > OPTIMISTIC_TIMEOUT:
+                self._drop(name)
+
+    def overlay(self, state: NetXThermostatState | None) -> NetXThermostatState | None:
+        """Return the state with the pending values applied."""
+        if not self._values or state is None:
+            return state
+        return dataclasses.replace(state, **self._values)
+
+    def _drop(self, name: str) -> None:
+        """Forget one pending value."""
+        del self._values[name], self._since[name], self._owner[name]
@@ -0,0 +1,147 @@
+"""Cost-based choice of the sources a poll reads.
+
+Some fields can be read from more than one source: the stage from RAS1 or
+RSS1, humidity from RRHS1 or /index.xml. The planner measures how long
+each source of a unit takes and how often it answers, and picks the
+cheapest set of sources that covers the fields a poll needs. A source that
+slows down or starts failing becomes expensive and is replaced by an
+alternative; its failures are forgotten over time, so it is tried again
+later and regains its place if it has recovered.
+"""
+import time
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    PLANNER_ALPHA,
+    PLANNER_DEFAULT_COST,
+    PLANNER_MIN_RELIABILITY,
+    PLANNER_FORGET_HALF_LIFE,
+    PLANNER_REPLAN_RATIO,
+    PLANNER_REVIEW_INTERVAL,
+    PLANNER_INCUMBENT_FACTOR,
+)
+
+
+@dataclass(slots=True)
+class SourceStats:
+    """Measured latency and success rate of one source."""
+
+    latency: float | None = None  # Smoothed seconds per read, failed ones included
+    reliability: float = 1.0  # Smoothed share of reads that succeeded
+    samples: int = 0
+    failures: int = 0
+    measured_at: float = 0.0  # Monotonic time of the last read
+
+    def reliability_at(self, now: float) -> float:
+        """Return the success rate with failures faded by their age."""
+        fade = 0.5 ** ((now - self.measured_at) / PLANNER_FORGET_HALF_LIFE)
+        return 1.0 - (1.0 - self.reliability) * fade
+
+
+class SourcePlanner:
+    """Per-unit source costs and the cheapest cover of the fields needed.
+
+    A source costs its expected time per successful read: the smoothed
+    time of its reads, a timeout counting in full, divided by its success
+    rate. Until a source has been read, ``priors`` (e.g. probe latencies)
+    or ``PLANNER_DEFAULT_COST`` stand in for the latency.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no measurements."""
+        self.stats: dict[str, SourceStats] = {}
+        self.priors: dict[str, float] = {}
+        self._planned: dict[str, float] = {}  # Cost of each source when last planned
+        self._review_at = 0.0
+
+    def record(self, source: str, latency: float, ok: bool) -> None:
+        """Count one read of ``source`` that took ``latency`` seconds."""
+        now = time.monotonic()
+        stats = self.stats.get(source)
+        if stats is None:
+            stats = self.stats[source] = SourceStats()
+        stats.reliability = stats.reliability_at(now)
+        stats.reliability += PLANNER_ALPHA * (float(ok) - stats.reliability)
+        stats.samples += 1
+        stats.measured_at = now
+        if not ok:
+            stats.failures += 1
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency += PLANNER_ALPHA * (latency - stats.latency)
+
+        planned = self._planned.get(source)
+        if planned is not None and abs(self.cost(source) - planned) > PLANNER_REPLAN_RATIO * planned:
+            # Review at once rather than at the next interval
+            self._review_at = 0.0
+
+    def cost(self, source: str) -> float:
+        """Return the expected seconds per successful read of ``source``."""
+        stats = self.stats.get(source)
+        if stats is None or stats.latency is None:
+            latency = self.priors.get(source, PLANNER_DEFAULT_COST)
+        else:
+            latency = stats.latency
+        if stats is None:
+            return latency
+        return latency / max(PLANNER_MIN_RELIABILITY, stats.reliability_at(time.monotonic()))
+
+    @property
+    def needs_review(self) -> bool:
+        """Return True when plans may no longer be the cheapest."""
+        return time.monotonic() >= self._review_at
+
+    def choose(
+        self,
+        sources: Mapping[str, frozenset[str]],
+        needed: Collection[str],
+        current: Collection[str] = (),
+    ) -> list[str]:
+        """Return the cheapest sources carrying ``needed``, in ``sources`` order.
+
+        A greedy weighted set cover: the source with the lowest cost per
+        missing field it carries is taken until no field a source carries
+        is missing, then taken sources made redundant by later ones are
+        dropped, most expensive first. Sources in ``current`` count
+        ``PLANNER_INCUMBENT_FACTOR`` of their cost.
+        """
+        costs = {source: self.cost(source) for source in sources}
+        self._planned.update(costs)
+        self._review_at = time.monotonic() + PLANNER_REVIEW_INTERVAL
+        weights = {
+            source: cost * PLANNER_INCUMBENT_FACTOR if source in current else cost
+            for source, cost in costs.items()
+        }
+
+        needed = set(needed)
+        missing = needed & set().union(*sources.values())
+        chosen: list[str] = []
+        while missing:
+            best = min(
+                (source for source, fields in sources.items() if fields & missing),
+                key=lambda source: weights[source] / len(sources[source] & missing),
+            )
+            chosen.append(best)
+            missing -= sources[best]
+
+        for source in sorted(chosen, key=weights.__getitem__, reverse=True):
+            others = [sources[other] for other in chosen if other != source]
+            if sources[source] & needed <= set().union(*others):
+                chosen.remove(source)
+        return [source for source in sources if source in chosen]
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return each measured source's cost and success rate, costs in milliseconds."""
+        now = time.monotonic()
+        return {
+            source: {
+                "cost_ms": round(self.cost(source) * 1000, 1),
+                "reliability": round(stats.reliability_at(now), 3),
+                "samples": stats.samples,
+                "failures": stats.failures,
+            }
+            for source, stats in self.stats.items()
+        }
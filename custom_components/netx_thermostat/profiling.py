@@ -0,0 +1,99 @@
+"""Bounded profiling window restricted to the integration's own code."""
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from pathlib import Path
+from typing import NamedTuple
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_PACKAGE_PATTERN = re.escape(PACKAGE_DIR + os.sep)
+_TRACE_FILTERS = (tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*")),)
+
+
+class ProfileResult(NamedTuple):
+    """What one profiling window collected."""
+
+    stats: pstats.Stats
+    snapshot: tracemalloc.Snapshot
+    baseline: tracemalloc.Snapshot
+    elapsed: float
+
+
+class ProfileWindow:
+    """cProfile and tracemalloc, running only between ``start`` and ``stop``.
+
+    Nothing is hooked outside the window. Both tools see the whole
+    thread while it is open; the report keeps only the functions and
+    allocation sites in this package, which covers the poll cycle, the
+    reply parsers and the entities' properties.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a window that has not started."""
+        self._profiler: cProfile.Profile | None = None
+        self._own_tracing = False
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._started = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Return True while the window is open."""
+        return self._profiler is not None
+
+    def start(self) -> None:
+        """Open the window; raises ValueError if another profiler is active."""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        self._profiler = profiler
+        # Leave tracing alone if someone else (e.g. the profiler integration) runs it
+        self._own_tracing = not tracemalloc.is_tracing()
+        if self._own_tracing:
+            tracemalloc.start()
+        self._baseline = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        self._started = time.monotonic()
+
+    def stop(self) -> ProfileResult:
+        """Close the window and return what it collected."""
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        elapsed = time.monotonic() - self._started
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        if self._own_tracing:
+            tracemalloc.stop()
+        baseline, self._baseline = self._baseline, None
+        return ProfileResult(pstats.Stats(profiler), snapshot, baseline, elapsed)
+
+
+def write_report(path: Path, result: ProfileResult, top: int) -> dict[str, int | float]:
+    """Write the report (and ``.prof`` stats next to it); return its summary."""
+    stats = result.stats
+    stats.dump_stats(path.with_suffix(".prof"))
+    out = io.StringIO()
+    stats.stream = out
+    out.write(f"NetX Thermostat profile, {result.elapsed:.1f}s window\n")
+    out.write(f"Restricted to {PACKAGE_DIR}\n\n")
+    out.write("=== By cumulative time ===\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_PACKAGE_PATTERN, top)
+    out.write("=== By own time ===\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(_PACKAGE_PATTERN, top)
+
+    current = result.snapshot.statistics("lineno")
+    out.write("=== Live allocations by site ===\n")
+    for stat in current[:top]:
+        out.write(f"{stat}\n")
+    out.write("\n=== Growth during the window ===\n")
+    for stat in result.snapshot.compare_to(result.baseline, "lineno")[:top]:
+        out.write(f"{stat}\n")
+    path.write_text(out.getvalue(), encoding="utf-8")
+
+    own = [timing for func, timing in stats.stats.items() if func[0].startswith(PACKAGE_DIR)]
+    return {
+        "elapsed_s": round(result.elapsed, 1),
+        "calls": sum(timing[1] for timing in own),
+        "own_time_ms": round(sum(timing[2] for timing in own) * 1000, 1),
+        "allocated_kib": round(sum(stat.size for stat in current) / 1024, 1),
+    }
@@ -0,0 +1,630 @@
+"""NetX Thermostat TCP protocol codec.
+
+Pure encoding and parsing helpers with no I/O, shared by the client and
+the tooling around it.
+"""
+import base64
+import hashlib
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from .const import (
+    CMD_LOGIN,
+    CMD_GET_TEMP_SCALE,
+    CMD_GET_ALL_STATES,
+    CMD_GET_HUMIDITY,
+    CMD_GET_OPERATION_MODE,
+    CMD_GET_RELAY_MODE,
+    CMD_GET_HUMIDIFICATION,
+    CMD_GET_DEHUMIDIFICATION,
+    CMD_GET_RELAY_STATE,
+    CMD_GET_SYSTEM_STATE,
+    CMD_GET_OCCUPIED_COOL,
+    CMD_GET_COOL_STAGES,
+    RESP_LOGIN_OK,
+    RESP_TEMP_SCALE,
+    RESP_ALL_STATES,
+    RESP_HUMIDITY,
+    RESP_OPERATION_MODE,
+    RESP_RELAY_MODE,
+    RESP_HUMIDIFICATION,
+    RESP_DEHUMIDIFICATION,
+    RESP_RELAY_STATE,
+    RESP_SYSTEM_STATE,
+    RESP_OCCUPIED_COOL,
+    RESP_COOL_STAGES,
+    RESP_ERRORS,
+    PROBE_SUPPORTED,
+    PROBE_UNSUPPORTED,
+    PROBE_NO_DATA,
+    PROBE_TIMEOUT,
+    OPERATION_MODE_MANUAL,
+    HTTP_ENDPOINT_INDEX,
+    HTTP_ENDPOINT_CO2,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+LINE_END = "\r\n"
+TRUE_TOKENS = ("YES", "Y", "TRUE", "1")
+EMPTY_TEMPS = ("NA", "--", "", "N/A")
+_UNSET = object()
+
+
+@dataclass
+class NetXThermostatState:
+    """Representation of thermostat state from TCP API."""
+
+    # Basic state from RAS1
+    indoor_temp: float | None = None
+    outdoor_temp: float | None = None
+    hvac_mode: str | None = None
+    fan_mode: str | None = None
+    override_active: bool = False
+    recovery_active: bool = False
+    cool_setpoint: int | None = None
+    heat_setpoint: int | None = None
+    operating_status: str | None = None
+    stage: int | None = None
+    event: str | None = None
+
+    # Derived state
+    is_idle: bool = True  # True when stage=0
+
+    # From other commands
+    temp_scale: str = "F"
+    is_manual_mode: bool = True
+    operation_mode: str = "Manual"
+
+    # Humidity relay
+    relay1_mode: str | None = None
+    relay2_mode: str | None = None
+    relay_state: str | None = None
+
+    # Humidification settings
+    hum_control_mode: str | None = None
+    hum_setpoint: int | None = None
+    hum_variance: int | None = None
+
+    # Dehumidification settings
+    dehum_control_mode: str | None = None
+    dehum_setpoint: int | None = None
+    dehum_variance: int | None = None
+
+    # Extended reads (only on units whose probe found them)
+    occupied_cool_setpoint: int | None = None  # From ROC1
+    cool_stage_config: str | None = None  # From RCS1
+
+    # HTTP-sourced sensor data
+    humidity: int | None = None  # From index.xml (or RRHS1)
+    co2_level: int | None = None  # From co2.json
+    co2_peak_level: int | None = None  # Peak CO2 from co2.json
+    co2_alert_level: int | None = None  # Alert threshold
+    co2_in_alert: bool = False  # Currently in alert state
+
+    # Connection status
+    connected: bool = False
+    last_error: str | None = None
+
+    # Poll bookkeeping
+    partial: bool = False  # Last poll cycle stopped before reading everything
+    updated_at: dict[str, float] = field(default_factory=dict)  # Field -> time.time()
+
+    def mark_updated(self, names: Iterable[str], when: float) -> None:
+        """Record that fields were refreshed at ``when``."""
+        for name in names:
+            self.updated_at[name] = when
+
+    def updated_since(self, when: float) -> bool:
+        """Return True if any field was refreshed at or after ``when``."""
+        return any(stamp >= when for stamp in self.updated_at.values())
+
+
+def generate_auth_hash(username: str, password: str) -> str:
+    """Generate the authentication hash."""
+    auth_string = f"{username}:{password}"
+    sha256_hash = hashlib.sha256(auth_string.encode()).digest()
+    return base64.b64encode(sha256_hash).decode()
+
+
+def encode_command(command: str) -> bytes:
+    """Encode a command line for the wire."""
+    return f"{command}{LINE_END}".encode()
+
+
+def build_login(username: str, password: str) -> str:
+    """Build the login command."""
+    return f"{CMD_LOGIN}{username},{generate_auth_hash(username, password)}"
+
+
+def is_login_ok(response: str) -> bool:
+    """Return True if the login response grants a session."""
+    return response.startswith(RESP_LOGIN_OK)
+
+
+def strip_prefix(response: str | None, prefix: str) -> str | None:
+    """Return the payload of a response, or None if the prefix does not match."""
+    if response and response.startswith(prefix):
+        return response[len(prefix):]
+    return None
+
+
+def parse_temp(temp_str: str) -> float | None:
+    """Parse temperature value."""
+    temp_str = temp_str.strip().upper()
+    if temp_str in EMPTY_TEMPS:
+        return None
+    try:
+        return float(temp_str)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_temp_scale(data: str, state: NetXThermostatState) -> None:
+    """Parse RTS1 response."""
+    state.temp_scale = "F" if "FAHRENHEIT" in data.strip().upper() else "C"
+
+
+def parse_all_states(data: str, state: NetXThermostatState) -> None:
+    """Parse RAS1 response."""
+    try:
+        parts = data.split(",")
+        if len(parts) >= 11:
+            state.indoor_temp = parse_temp(parts[0])
+            state.outdoor_temp = parse_temp(parts[1])
+            state.hvac_mode = parts[2].strip().upper()
+
+            fan_str = parts[3].strip().upper()
+            state.fan_mode = "ON" if "ON" in fan_str else "AUTO"
+
+            state.override_active = parts[4].strip().upper() in TRUE_TOKENS
+            state.recovery_active = parts[5].strip().upper() in TRUE_TOKENS
+
+            try:
+                state.cool_setpoint = int(parts[6].strip())
+            except (ValueError, TypeError):
+                pass
+
+            try:
+                state.heat_setpoint = int(parts[7].strip())
+            except (ValueError, TypeError):
+                pass
+
+            state.operating_status = parts[8].strip().upper()
+
+            try:
+                state.stage = int(parts[9].strip())
+                # Stage 0 = idle, Stage >= 1 = actively running
+                state.is_idle = (state.stage == 0)
+            except (ValueError, TypeError):
+                state.stage = None
+                state.is_idle = True
+
+            event = parts[10].strip()
+            state.event = event if event.upper() != "NONE" else None
+
+    except Exception as err:
+        _LOGGER.error("Error parsing RAS1 '%s': %s", data, err)
+
+
+def parse_operation_mode(data: str, state: NetXThermostatState) -> None:
+    """Parse RNS1 response."""
+    state.is_manual_mode = (data.strip() == OPERATION_MODE_MANUAL)
+    state.operation_mode = "Manual" if state.is_manual_mode else "Schedule"
+
+
+def parse_relay_mode(data: str, state: NetXThermostatState) -> None:
+    """Parse RMRF1 response."""
+    try:
+        parts = data.split(",")
+        if len(parts) >= 2:
+            state.relay1_mode = parts[0].strip().upper()
+            state.relay2_mode = parts[1].strip().upper()
+        elif len(parts) == 1:
+            state.relay1_mode = parts[0].strip().upper()
+    except Exception as err:
+        _LOGGER.error("Error parsing RMRF1 '%s': %s", data, err)
+
+
+def parse_humidification(data: str, state: NetXThermostatState) -> None:
+    """Parse RMHS1 response."""
+    try:
+        parts = data.split(",")
+        if len(parts) >= 3:
+            state.hum_control_mode = parts[0].strip().upper()
+            state.hum_setpoint = int(parts[1].strip())
+            state.hum_variance = int(parts[2].strip())
+    except Exception as err:
+        _LOGGER.error("Error parsing RMHS1 '%s': %s", data, err)
+
+
+def parse_dehumidification(data: str, state: NetXThermostatState) -> None:
+    """Parse RMDHS1 response."""
+    try:
+        parts = data.split(",")
+        if len(parts) >= 3:
+            state.dehum_control_mode = parts[0].strip().upper()
+            state.dehum_setpoint = int(parts[1].strip())
+            state.dehum_variance = int(parts[2].strip())
+    except Exception as err:
+        _LOGGER.error("Error parsing RMDHS1 '%s': %s", data, err)
+
+
+def parse_relay_state(data: str, state: NetXThermostatState) -> None:
+    """Parse RRS1 response."""
+    state.relay_state = data.strip()
+
+
+def parse_system_state(data: str, state: NetXThermostatState) -> None:
+    """Parse RSS1 response."""
+    try:
+        parts = data.split(",")
+        if len(parts) >= 2:
+            state.operating_status = parts[0].strip().upper()
+            state.stage = int(parts[1].strip())
+            state.is_idle = (state.stage == 0)
+    except Exception as err:
+        _LOGGER.error("Error parsing RSS1 '%s': %s", data, err)
+
+
+def parse_room_humidity(data: str, state: NetXThermostatState) -> None:
+    """Parse RRHS1 response (0 means the unit has no TCP humidity reading)."""
+    try:
+        humidity = int(data.strip())
+    except ValueError:
+        return
+    if humidity > 0:
+        state.humidity = humidity
+
+
+def parse_occupied_cool(data: str, state: NetXThermostatState) -> None:
+    """Parse ROC1 response."""
+    try:
+        state.occupied_cool_setpoint = int(data.strip())
+    except ValueError:
+        pass
+
+
+def parse_cool_stages(data: str, state: NetXThermostatState) -> None:
+    """Parse RCS1 response."""
+    state.cool_stage_config = data.strip().upper() or None
+
+
+# Byte-level parsing of the per-poll replies. The line is split as read,
+# numbers are parsed from the byte fields directly and enum tokens resolve
+# to shared constants, so no decoded, stripped or upper-cased copies are
+# made. Each parser fills the state exactly like its string counterpart.
+
+_ERROR_LINES = frozenset(token.encode() for token in RESP_ERRORS)
+_TRUE_BYTES = frozenset(token.encode() for token in TRUE_TOKENS)
+_MANUAL_BYTES = OPERATION_MODE_MANUAL.encode()
+
+
+def _token_table(*tokens: str) -> dict[bytes, str]:
+    """Map the wire form of each token to its string constant."""
+    return {token.encode(): token for token in tokens}
+
+
+_HVAC_TOKENS = _token_table("OFF", "HEAT", "COOL", "AUTO")
+_STATUS_TOKENS = _token_table("OFF", "HEAT", "COOL", "FAN", "IDLE")
+_FAN_TOKENS = {b"FAN AUTO": "AUTO", b"FAN ON": "ON", b"AUTO": "AUTO", b"ON": "ON"}
+_RELAY_TOKENS = _token_table("OFF", "HUM", "DEHUM")
+_HUM_TOKENS = _token_table("IH", "WH")
+_DEHUM_TOKENS = _token_table("IC", "WC")
+
+
+def _fields(line: bytes, start: int) -> list[bytes]:
+    """Split a raw reply into its fields, dropping the ``start`` prefix bytes."""
+    fields = line.split(b",")
+    fields[0] = fields[0][start:]
+    return fields
+
+
+def _token(raw: bytes, table: dict[bytes, str]) -> str:
+    """Return the constant for a token the table missed as sent (case, spacing)."""
+    raw = raw.strip().upper()
+    return table.get(raw) or raw.decode(errors="replace")
+
+
+def _temp(raw: bytes) -> float | None:
+    """Parse a temperature field, None for the empty markers."""
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def _flag(raw: bytes) -> bool:
+    """Parse a yes/no field."""
+    return raw in _TRUE_BYTES or raw.strip().upper() in _TRUE_BYTES
+
+
+def parse_temp_scale_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RTS1 reply."""
+    fahrenheit = line.find(b"FAHRENHEIT", start) >= 0 or b"FAHRENHEIT" in line[start:].upper()
+    state.temp_scale = "F" if fahrenheit else "C"
+
+
+def parse_all_states_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RAS1 reply, its payload starting at ``start``."""
+    try:
+        fields = _fields(line, start)
+        if len(fields) < 11:
+            return
+        state.indoor_temp = _temp(fields[0])
+        state.outdoor_temp = _temp(fields[1])
+        raw = fields[2]
+        state.hvac_mode = _HVAC_TOKENS.get(raw) or _token(raw, _HVAC_TOKENS)
+
+        raw = fields[3]
+        state.fan_mode = _FAN_TOKENS.get(raw) or ("ON" if b"ON" in raw.upper() else "AUTO")
+
+        state.override_active = _flag(fields[4])
+        state.recovery_active = _flag(fields[5])
+
+        try:
+            state.cool_setpoint = int(fields[6])
+        except ValueError:
+            pass
+        try:
+            state.heat_setpoint = int(fields[7])
+        except ValueError:
+            pass
+
+        raw = fields[8]
+        state.operating_status = _STATUS_TOKENS.get(raw) or _token(raw, _STATUS_TOKENS)
+
+        # Stage 0 = idle, Stage >= 1 = actively running
+        try:
+            state.stage = int(fields[9])
+            state.is_idle = state.stage == 0
+        except ValueError:
+            state.stage = None
+            state.is_idle = True
+
+        event = fields[10].strip()
+        state.event = None if event.upper() == b"NONE" else event.decode(errors="replace")
+
+    except Exception as err:
+        _LOGGER.error("Error parsing RAS1 '%s': %s", line, err)
+
+
+def parse_system_state_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RSS1 reply."""
+    fields = _fields(line, start)
+    if len(fields) < 2:
+        return
+    raw = fields[0]
+    state.operating_status = _STATUS_TOKENS.get(raw) or _token(raw, _STATUS_TOKENS)
+    try:
+        state.stage = int(fields[1])
+    except ValueError as err:
+        _LOGGER.error("Error parsing RSS1 '%s': %s", line, err)
+        return
+    state.is_idle = state.stage == 0
+
+
+def parse_operation_mode_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RNS1 reply."""
+    state.is_manual_mode = line[start:].strip() == _MANUAL_BYTES
+    state.operation_mode = "Manual" if state.is_manual_mode else "Schedule"
+
+
+def parse_relay_mode_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RMRF1 reply."""
+    fields = _fields(line, start)
+    raw = fields[0]
+    state.relay1_mode = _RELAY_TOKENS.get(raw) or _token(raw, _RELAY_TOKENS)
+    if len(fields) >= 2:
+        # The last field still ends the line
+        state.relay2_mode = _token(fields[1], _RELAY_TOKENS)
+
+
+def parse_humidification_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RMHS1 reply."""
+    fields = _fields(line, start)
+    if len(fields) < 3:
+        return
+    raw = fields[0]
+    state.hum_control_mode = _HUM_TOKENS.get(raw) or _token(raw, _HUM_TOKENS)
+    try:
+        state.hum_setpoint = int(fields[1])
+        state.hum_variance = int(fields[2])
+    except ValueError as err:
+        _LOGGER.error("Error parsing RMHS1 '%s': %s", line, err)
+
+
+def parse_dehumidification_bytes(line: bytes, start: int, state: NetXThermostatState) -> None:
+    """Parse a raw RMDHS1 reply."""
+    fields = _fields(line, start)
+    if len(fields) < 3:
+        return
+    raw = fields[0]
+    state.dehum_control_mode = _DEHUM_TOKENS.get(raw) or _token(raw, _DEHUM_TOKENS)
+    try:
+        state.dehum_setpoint = int(fields[1])
+        state.dehum_variance = int(fields[2])
+    except ValueError as err:
+        _LOGGER.error("Error parsing RMDHS1 '%s': %s", line, err)
+
+
+@dataclass(frozen=True, slots=True)
+class ReadCommand:
+    """A read command, how to parse it and the state fields it fills."""
+
+    command: str
+    prefix: str
+    parse: Callable[[str, NetXThermostatState], None]
+    fields: frozenset[str]
+    # Polled unless a probe proved it unsupported; others need a probe first
+    core: bool = True
+    # Configuration that only changes at the panel (or through our own
+    # writes, which re-read it): read once per session
+    static: bool = False
+    # Parses the raw reply in place; without it the reply is decoded first
+    parse_bytes: Callable[[bytes, int, NetXThermostatState], None] | None = None
+    raw_prefix: bytes = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Encode the prefix once, for matching raw replies."""
+        object.__setattr__(self, "raw_prefix", self.prefix.encode())
+
+    def apply(self, line: bytes, state: NetXThermostatState) -> bool:
+        """Parse a raw reply into the state; return False if it is not ours."""
+        if not line.startswith(self.raw_prefix):
+            return False
+        if self.parse_bytes is not None:
+            self.parse_bytes(line, len(self.raw_prefix), state)
+        else:
+            self.parse(line.decode().strip()[len(self.prefix):], state)
+        return True
+
+
+STAGE_FIELDS = frozenset({"operating_status", "stage", "is_idle"})
+ALL_STATES_FIELDS = frozenset({
+    "indoor_temp", "outdoor_temp", "hvac_mode", "fan_mode", "override_active",
+    "recovery_active", "cool_setpoint", "heat_setpoint", "event",
+}) | STAGE_FIELDS
+HUM_FIELDS = frozenset({"hum_control_mode", "hum_setpoint", "hum_variance"})
+DEHUM_FIELDS = frozenset({"dehum_control_mode", "dehum_setpoint", "dehum_variance"})
+CO2_FIELDS = frozenset({"co2_level", "co2_peak_level", "co2_alert_level", "co2_in_alert"})
+HTTP_FIELDS = frozenset({"humidity", "co2_level", "co2_peak_level", "co2_alert_level"})
+
+# State fields each HTTP endpoint refreshes
+HTTP_ENDPOINT_FIELDS = {
+    HTTP_ENDPOINT_INDEX: frozenset({"humidity"}),
+    HTTP_ENDPOINT_CO2: CO2_FIELDS,
+}
+
+# Every known read command, in full-poll order
+READ_COMMANDS: dict[str, ReadCommand] = {
+    rc.command: rc
+    for rc in (
+        ReadCommand(
+            CMD_GET_TEMP_SCALE,
+            RESP_TEMP_SCALE,
+            parse_temp_scale,
+            frozenset({"temp_scale"}),
+            static=True,
+            parse_bytes=parse_temp_scale_bytes,
+        ),
+        ReadCommand(
+            CMD_GET_ALL_STATES,
+            RESP_ALL_STATES,
+            parse_all_states,
+            ALL_STATES_FIELDS,
+            parse_bytes=parse_all_states_bytes,
+        ),
+        ReadCommand(
+            CMD_GET_OPERATION_MODE,
+            RESP_OPERATION_MODE,
+            parse_operation_mode,
+            frozenset({"is_manual_mode", "operation_mode"}),
+            parse_bytes=parse_operation_mode_bytes,
+        ),
+        ReadCommand(
+            CMD_GET_RELAY_MODE,
+            RESP_RELAY_MODE,
+            parse_relay_mode,
+            frozenset({"relay1_mode", "relay2_mode"}),
+            static=True,
+            parse_bytes=parse_relay_mode_bytes,
+        ),
+        ReadCommand(
+            CMD_GET_HUMIDIFICATION,
+            RESP_HUMIDIFICATION,
+            parse_humidification,
+            HUM_FIELDS,
+            parse_bytes=parse_humidification_bytes,
+        ),
+        ReadCommand(
+            CMD_GET_DEHUMIDIFICATION,
+            RESP_DEHUMIDIFICATION,
+            parse_dehumidification,
+            DEHUM_FIELDS,
+            parse_bytes=parse_dehumidification_bytes,
+        ),
+        ReadCommand(CMD_GET_RELAY_STATE, RESP_RELAY_STATE, parse_relay_state, frozenset({"relay_state"})),
+        ReadCommand(
+            CMD_GET_SYSTEM_STATE,
+            RESP_SYSTEM_STATE,
+            parse_system_state,
+            STAGE_FIELDS,
+            core=False,
+            parse_bytes=parse_system_state_bytes,
+        ),
+        ReadCommand(CMD_GET_HUMIDITY, RESP_HUMIDITY, parse_room_humidity, frozenset({"humidity"}), core=False),
+        ReadCommand(
+            CMD_GET_OCCUPIED_COOL,
+            RESP_OCCUPIED_COOL,
+            parse_occupied_cool,
+            frozenset({"occupied_cool_setpoint"}),
+            core=False,
+        ),
+        ReadCommand(
+            CMD_GET_COOL_STAGES,
+            RESP_COOL_STAGES,
+            parse_cool_stages,
+            frozenset({"cool_stage_config"}),
+            core=False,
+            static=True,
+        ),
+    )
+}
+
+
+def classify_response(rc: ReadCommand, response: str | None) -> str:
+    """Classify a probe reply as supported, unsupported, empty or timed out."""
+    if response is None:
+        return PROBE_TIMEOUT
+    if response.strip().upper() in RESP_ERRORS:
+        return PROBE_UNSUPPORTED
+    payload = strip_prefix(response, rc.prefix)
+    if payload is None:
+        return PROBE_UNSUPPORTED
+
+    # A field still holding the sentinel after parsing was not filled
+    probe = NetXThermostatState()
+    for name in rc.fields:
+        setattr(probe, name, _UNSET)
+    rc.parse(payload, probe)
+    if all(getattr(probe, name) is _UNSET for name in rc.fields):
+        return PROBE_NO_DATA
+    return PROBE_SUPPORTED
+
+
+_READ_PREFIXES = tuple(rc.raw_prefix for rc in READ_COMMANDS.values())
+_MAX_ERROR_LINE = max(len(token) for token in _ERROR_LINES) + 4
+
+
+def is_error_reply(line: bytes) -> bool:
+    """Return True for the generic error replies, which name no command."""
+    return len(line) <= _MAX_ERROR_LINE and line.strip().upper() in _ERROR_LINES
+
+
+def reply_matches(command: str, line: bytes) -> bool:
+    """Return True if the raw ``line`` can be the reply to ``command``.
+
+    Reads must carry their own prefix. Writes echo the command before the
+    colon, so a write reply must not belong to a read or to another write.
+    """
+    if (rc := READ_COMMANDS.get(command)) is not None:
+        return line.startswith(rc.raw_prefix) or is_error_reply(line)
+    if is_error_reply(line):
+        return True
+    if line.startswith(_READ_PREFIXES):
+        return False
+    head = line.strip().partition(b":")[0]
+    return not head or command.encode().startswith(head)
+
+
+def is_write_ok(command: str, response: str | None) -> bool:
+    """Validate a write command response."""
+    if response is None:
+        return False
+    if ":" not in response:
+        _LOGGER.warning("Unexpected response format: %s", response)
+        return False
+    _LOGGER.debug("Write successful: %s -> %s", command, response)
+    return True
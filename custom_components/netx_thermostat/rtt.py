@@ -0,0 +1,84 @@
+"""Round-trip time estimator driving the adaptive command timeouts."""
+from typing import Any
+
+from .const import (
+    COMMAND_TIMEOUT,
+    RTT_MIN_TIMEOUT,
+    RTT_MIN_CONNECT_TIMEOUT,
+    RTT_CONNECT_FACTOR,
+    RTT_MAX_BACKOFF,
+)
+
+# Gains and variance multiplier from RFC 6298
+ALPHA = 1 / 8
+BETA = 1 / 4
+K = 4
+
+
+class RttEstimator:
+    """Smoothed RTT and variance, turned into a retransmission-style timeout.
+
+    Until the first sample the timeout is ``max_timeout``. Every timeout
+    doubles the next one (up to ``RTT_MAX_BACKOFF`` times) and a good
+    sample resets the backoff. The result always stays within
+    ``[min_timeout, max_timeout]``.
+    """
+
+    def __init__(
+        self, min_timeout: float = RTT_MIN_TIMEOUT, max_timeout: float = COMMAND_TIMEOUT
+    ) -> None:
+        """Initialize the estimator."""
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.samples = 0
+        self.timeouts = 0
+        self._backoff = 1
+
+    def sample(self, rtt: float) -> None:
+        """Feed the round-trip time of an exchange that got its reply."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - ALPHA) * self.srtt + ALPHA * rtt
+        self.samples += 1
+        self._backoff = 1
+
+    def record_timeout(self) -> None:
+        """Back off after an exchange ran into its deadline."""
+        self.timeouts += 1
+        self._backoff = min(self._backoff * 2, RTT_MAX_BACKOFF)
+
+    @property
+    def timeout(self) -> float:
+        """Return the deadline for the next command."""
+        if self.srtt is None:
+            return self.max_timeout
+        rto = (self.srtt + K * self.rttvar) * self._backoff
+        return max(self.min_timeout, min(self.max_timeout, rto))
+
+    @property
+    def expected(self) -> float:
+        """Return how long a healthy exchange is expected to take."""
+        if self.srtt is None:
+            return self.min_timeout
+        return self.srtt + K * self.rttvar
+
+    def connect_timeout(self, upper: float) -> float:
+        """Return the deadline for opening a connection, at most ``upper``."""
+        if self.srtt is None:
+            return upper
+        return max(RTT_MIN_CONNECT_TIMEOUT, min(upper, RTT_CONNECT_FACTOR * self.timeout))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimate for diagnostics, in milliseconds."""
+        return {
+            "srtt_ms": None if self.srtt is None else round(self.srtt * 1000, 1),
+            "rttvar_ms": None if self.rttvar is None else round(self.rttvar * 1000, 1),
+            "timeout_ms": round(self.timeout * 1000),
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,63 @@
+"""Weekly schedule as read from /schedule.xml, and diffs against it.
+
+The layout of the document is not published, so it is read as a flat
+mapping of element paths to their text, e.g. ``day[2]/period[0]/heat``
+(indexes only on repeated siblings). A desired schedule uses the same
+paths, which lets schedules be compared period by period without
+assuming tag names.
+
+Schedules are only read: the unit's upload interface is not documented,
+so nothing here writes one back.
+"""
+from collections import Counter
+from collections.abc import Mapping
+from xml.etree import ElementTree
+
+# Leaf changes are grouped by their parent element, one period each
+Changes = dict[str, dict[str, tuple[str, str]]]
+
+
+def parse_schedule(text: str) -> dict[str, str]:
+    """Flatten the schedule document into ``{path: text}`` for every leaf."""
+    root = ElementTree.fromstring(text)
+    leaves: dict[str, str] = {}
+
+    def walk(element: ElementTree.Element, path: str) -> None:
+        """Record the leaves below ``element``."""
+        children = list(element)
+        if not children:
+            leaves[path] = (element.text or "").strip()
+            return
+        counts = Counter(child.tag for child in children)
+        repeated = {tag for tag, count in counts.items() if count > 1}
+        seen: Counter = Counter()
+        for child in children:
+            name = child.tag
+            if name in repeated:
+                name = f"{child.tag}[{seen[child.tag]}]"
+                seen[child.tag] += 1
+            walk(child, f"{path}/{name}" if path else name)
+
+    walk(root, "")
+    return leaves
+
+
+def diff_schedule(
+    current: Mapping[str, str], desired: Mapping[str, object]
+) -> tuple[Changes, list[str]]:
+    """Return the periods ``desired`` changes, and its paths the unit does not have.
+
+    Values are compared as text, so ``68`` matches ``"68"``. Paths of
+    ``current`` that ``desired`` leaves out are kept as they are.
+    """
+    changes: Changes = {}
+    unknown = []
+    for path, value in desired.items():
+        if path not in current:
+            unknown.append(path)
+            continue
+        new = str(value).strip()
+        if current[path] != new:
+            period, _, leaf = path.rpartition("/")
+            changes.setdefault(period, {})[leaf] = (current[path], new)
+    return changes, unknown
@@ -0,0 +1,157 @@
+"""Priority and rate-limited admission of commands to one thermostat session."""
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .const import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_REFRESH,
+    PRIORITY_BACKGROUND,
+    COMMAND_RATE,
+    COMMAND_BURST,
+)
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_REFRESH: "refresh",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class _ClassStats:
+    """Queue metrics of one priority class."""
+
+    __slots__ = ("queued", "granted", "total_wait", "max_wait")
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.queued = 0
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the metrics, waits in milliseconds."""
+        mean = self.total_wait / self.granted if self.granted else 0.0
+        return {
+            "queued": self.queued,
+            "granted": self.granted,
+            "mean_wait_ms": round(mean * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+class CommandScheduler:
+    """Grants the session to one exchange at a time.
+
+    Waiters are served by priority class (interactive writes, then refresh
+    reads, then background probes) and in arrival order within a class,
+    so a write never queues behind the rest of a poll. Every grant that
+    sends a line takes a token from a bucket refilled at ``rate`` per
+    second up to ``burst``, which keeps bursts gentle on the unit's stack.
+    """
+
+    def __init__(self, rate: float = COMMAND_RATE, burst: int = COMMAND_BURST) -> None:
+        """Initialize an idle scheduler with a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future, bool, float]] = []
+        self._order = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._stats = {priority: _ClassStats() for priority in PRIORITY_NAMES}
+
+    @property
+    def depth(self) -> int:
+        """Return the number of exchanges waiting for the session."""
+        return sum(stats.queued for stats in self._stats.values())
+
+    @property
+    def mean_wait(self) -> float:
+        """Return the mean time an exchange waited for the session, in seconds."""
+        granted = sum(stats.granted for stats in self._stats.values())
+        total = sum(stats.total_wait for stats in self._stats.values())
+        return total / granted if granted else 0.0
+
+    def as_dict(self) -> dict[str, dict[str, float | int]]:
+        """Return the queue metrics of every priority class."""
+        return {
+            PRIORITY_NAMES[priority]: stats.as_dict() for priority, stats in self._stats.items()
+        }
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: int = PRIORITY_REFRESH, limited: bool = True
+    ) -> AsyncIterator[None]:
+        """Hold the session for one exchange; ``limited`` ones spend a token."""
+        await self._acquire(priority, limited)
+        try:
+            yield
+        finally:
+            self._busy = False
+            self._grant_next()
+
+    async def _acquire(self, priority: int, limited: bool) -> None:
+        """Wait until this exchange is granted the session."""
+        stats = self._stats[priority]
+        if not self._busy and not self._waiters and self._take(limited):
+            self._busy = True
+            stats.granted += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._order), future, limited, time.monotonic())
+        heapq.heappush(self._waiters, entry)
+        stats.queued += 1
+        if not self._busy and self._timer is None:
+            self._grant_next()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller gave up: pass the session on
+                self._busy = False
+                self._grant_next()
+            raise
+        finally:
+            stats.queued -= 1
+
+    def _take(self, limited: bool) -> bool:
+        """Spend a token if the exchange needs one; return False if none is left."""
+        if not limited:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _grant_next(self) -> None:
+        """Hand the free session to the most urgent waiter, once a token allows."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters and not self._busy:
+            priority, _order, future, limited, queued_at = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take(limited):
+                delay = (1 - self._tokens) / self.rate
+                self._timer = asyncio.get_running_loop().call_later(delay, self._grant_next)
+                return
+            heapq.heappop(self._waiters)
+            self._busy = True
+            wait = time.monotonic() - queued_at
+            stats = self._stats[priority]
+            stats.granted += 1
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+            future.set_result(None)
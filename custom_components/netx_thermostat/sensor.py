@@ -1,20 +1,287 @@
 """Sensor platform for NetX Thermostat integration."""
 import logging
-
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
-from homeassistant.const import UnitOfTemperature, PERCENTAGE, CONCENTRATION_PARTS_PER_MILLION
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    UnitOfTemperature,
+    UnitOfTime,
+    PERCENTAGE,
+    CONCENTRATION_PARTS_PER_MILLION,
+)
 from homeassistant.helpers.entity import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import NetXDataUpdateCoordinator
+from .const import (
+    DOMAIN,
+    HTTP_ENDPOINT_INDEX,
+    HTTP_ENDPOINT_CO2,
+    CMD_GET_OCCUPIED_COOL,
+    CMD_GET_COOL_STAGES,
+    DEADBAND_TEMPERATURE,
+    DEADBAND_HUMIDITY,
+    DEADBAND_CO2,
+)
+from .circuit import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+from .api import NetXThermostatState
+from .protocol import CO2_FIELDS, DEHUM_FIELDS, HUM_FIELDS, STAGE_FIELDS
+from .entity import NetXEntity, NetXEntityDescription, field_value, field_is_set
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class NetXSensorEntityDescription(NetXEntityDescription, SensorEntityDescription):
+    """Describes a NetX sensor.
+
+    ``temperature`` sensors follow the unit's temperature scale, and
+    ``http_endpoint`` sensors only exist while that endpoint is polled.
+    Sensors with a ``deadband`` (the kind whose option applies) skip
+    readings too close to the last one written, see ``NetXSensor``.
+    """
+
+    temperature: bool = False
+    http_endpoint: str | None = None
+    deadband: str | None = None
+
+
+def _positive(name: str) -> Callable[[NetXThermostatState], bool]:
+    """Return a check that a reading is present and above zero."""
+    getter = field_value(name)
+    return lambda state: (getter(state) or 0) > 0
+
+
+def _operating_status(state: NetXThermostatState) -> str:
+    """Return the operating status, Idle while no stage runs."""
+    if state.is_idle or not state.operating_status:
+        return "Idle"
+    return state.operating_status.capitalize()
+
+
+def _operating_attrs(state: NetXThermostatState) -> dict[str, Any]:
+    """Return the operating status attributes."""
+    attrs = {
+        "stage": state.stage,
+        "is_idle": state.is_idle,
+        "override_active": state.override_active,
+        "recovery_active": state.recovery_active,
+    }
+    if state.event:
+        attrs["event"] = state.event
+    return attrs
+
+
+def _stage_attrs(state: NetXThermostatState) -> dict[str, Any]:
+    """Describe the running stage."""
+    if state.stage == 0:
+        return {"description": "Idle - at setpoint"}
+    if state.stage:
+        return {"description": f"Stage {state.stage} active"}
+    return {}
+
+
+def _co2_attrs(state: NetXThermostatState) -> dict[str, Any]:
+    """Return the CO2 peak, alert level and alert state."""
+    attrs = {}
+    if state.co2_peak_level:
+        attrs["peak_level"] = state.co2_peak_level
+    if state.co2_alert_level:
+        attrs["alert_level"] = state.co2_alert_level
+    attrs["in_alert"] = state.co2_in_alert
+    return attrs
+
+
+def _control_mode(
+    prefix: str, labels: dict[str, str]
+) -> Callable[[NetXThermostatState], str | None]:
+    """Return a readable (de)humidification control mode accessor."""
+    getter = field_value(f"{prefix}_control_mode")
+    return lambda state: labels.get(mode, mode) if (mode := getter(state)) else None
+
+
+def _control_attrs(prefix: str) -> Callable[[NetXThermostatState], dict[str, Any]]:
+    """Return the (de)humidification settings as attributes."""
+    mode, setpoint, variance = (
+        field_value(f"{prefix}_{name}") for name in ("control_mode", "setpoint", "variance")
+    )
+
+    def attrs(state: NetXThermostatState) -> dict[str, Any]:
+        """Return the mode code, setpoint and variance."""
+        result = {"mode_code": mode(state)}
+        if setpoint(state) is not None:
+            result["setpoint"] = setpoint(state)
+        if variance(state) is not None:
+            result["variance"] = variance(state)
+        return result
+
+    return attrs
+
+
+SENSORS: tuple[NetXSensorEntityDescription, ...] = (
+    NetXSensorEntityDescription(
+        key="outdoor_temp",
+        name="Outdoor Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer",
+        temperature=True,
+        deadband=DEADBAND_TEMPERATURE,
+        fields=frozenset({"outdoor_temp"}),
+        value_fn=field_value("outdoor_temp"),
+        available_fn=field_is_set("outdoor_temp"),
+    ),
+    NetXSensorEntityDescription(
+        key="humidity",
+        name="Humidity",
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:water-percent",
+        http_endpoint=HTTP_ENDPOINT_INDEX,
+        deadband=DEADBAND_HUMIDITY,
+        fields=frozenset({"humidity"}),
+        value_fn=field_value("humidity"),
+        available_fn=_positive("humidity"),
+        attrs_fn=lambda state: {"source": "HTTP API (/index.xml)"},
+    ),
+    NetXSensorEntityDescription(
+        key="co2",
+        name="CO2",
+        device_class=SensorDeviceClass.CO2,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=CONCENTRATION_PARTS_PER_MILLION,
+        icon="mdi:molecule-co2",
+        http_endpoint=HTTP_ENDPOINT_CO2,
+        deadband=DEADBAND_CO2,
+        fields=CO2_FIELDS,
+        value_fn=field_value("co2_level"),
+        available_fn=_positive("co2_level"),
+        attrs_fn=_co2_attrs,
+    ),
+    NetXSensorEntityDescription(
+        key="operation_mode",
+        name="Operation Mode",
+        icon="mdi:cog",
+        fields=frozenset({"operation_mode"}),
+        value_fn=field_value("operation_mode"),
+    ),
+    NetXSensorEntityDescription(
+        key="operating_status",
+        name="Operating Status",
+        icon="mdi:hvac",
+        fields=STAGE_FIELDS | {"override_active", "recovery_active", "event"},
+        value_fn=_operating_status,
+        attrs_fn=_operating_attrs,
+    ),
+    NetXSensorEntityDescription(
+        key="stage",
+        name="Stage",
+        icon="mdi:stairs",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        fields=frozenset({"stage"}),
+        value_fn=field_value("stage"),
+        attrs_fn=_stage_attrs,
+    ),
+    NetXSensorEntityDescription(
+        key="relay_state",
+        name="Relay State",
+        icon="mdi:electric-switch",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        fields=frozenset({"relay_state"}),
+        value_fn=field_value("relay_state"),
+        available_fn=field_is_set("relay_state"),
+    ),
+    NetXSensorEntityDescription(
+        key="hum_mode",
+        name="Humidification Mode",
+        icon="mdi:water-plus",
+        fields=HUM_FIELDS,
+        value_fn=_control_mode("hum", {"IH": "Independent of Heating", "WH": "With Heating"}),
+        available_fn=field_is_set("hum_control_mode"),
+        attrs_fn=_control_attrs("hum"),
+    ),
+    NetXSensorEntityDescription(
+        key="dehum_mode",
+        name="Dehumidification Mode",
+        icon="mdi:water-minus",
+        fields=DEHUM_FIELDS,
+        value_fn=_control_mode("dehum", {"IC": "Independent of Cooling", "WC": "With Cooling"}),
+        available_fn=field_is_set("dehum_control_mode"),
+        attrs_fn=_control_attrs("dehum"),
+    ),
+    # Extended reads the capability probe found on this unit
+    NetXSensorEntityDescription(
+        key="occupied_cool_setpoint",
+        name="Occupied Cool Setpoint",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        icon="mdi:snowflake-thermometer",
+        temperature=True,
+        exists_fn=lambda api: api.is_command_supported(CMD_GET_OCCUPIED_COOL),
+        fields=frozenset({"occupied_cool_setpoint"}),
+        value_fn=field_value("occupied_cool_setpoint"),
+        available_fn=field_is_set("occupied_cool_setpoint"),
+    ),
+    NetXSensorEntityDescription(
+        key="cool_stages",
+        name="Cool Stages",
+        icon="mdi:stairs",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        exists_fn=lambda api: api.is_command_supported(CMD_GET_COOL_STAGES),
+        fields=frozenset({"cool_stage_config"}),
+        value_fn=field_value("cool_stage_config"),
+        available_fn=field_is_set("cool_stage_config"),
+    ),
+)
+
+# Reads the client's RTT estimate rather than the state, see NetXResponseTimeSensor
+RESPONSE_TIME = NetXSensorEntityDescription(
+    key="response_time",
+    name="Response Time",
+    icon="mdi:timer-outline",
+    device_class=SensorDeviceClass.DURATION,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    value_fn=lambda state: None,
+)
+
+# Reads the client's command scheduler, see NetXCommandWaitSensor
+COMMAND_WAIT = NetXSensorEntityDescription(
+    key="command_wait",
+    name="Command Wait",
+    icon="mdi:tray-full",
+    device_class=SensorDeviceClass.DURATION,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    value_fn=lambda state: None,
+)
+
+# Reads the client's circuit breaker, see NetXCircuitSensor
+CIRCUIT = NetXSensorEntityDescription(
+    key="circuit",
+    name="Connection Circuit",
+    translation_key="circuit",
+    icon="mdi:connection",
+    device_class=SensorDeviceClass.ENUM,
+    options=[STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN],
+    entity_category=EntityCategory.DIAGNOSTIC,
+    value_fn=lambda state: None,
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -23,332 +290,167 @@ async def async_setup_entry(
     """Set up the NetX Thermostat sensor platform."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = data["coordinator"]
-
-    sensors = [
-        NetXOutdoorTemperatureSensor(coordinator, config_entry),
-        NetXHumiditySensor(coordinator, config_entry),
-        NetXCO2Sensor(coordinator, config_entry),
-        NetXOperationModeSensor(coordinator, config_entry),
-        NetXOperatingStatusSensor(coordinator, config_entry),
-        NetXStageSensor(coordinator, config_entry),
-        NetXHumControlModeSensor(coordinator, config_entry),
-        NetXDehumControlModeSensor(coordinator, config_entry),
+    api = data["api"]
+    device_info = data["device_info"]
+    entry_id = config_entry.entry_id
+
+    sensors: list[NetXSensor] = [
+        NetXSensor(coordinator, entry_id, device_info, description)
+        for description in SENSORS
+        if description.http_endpoint is None and description.exists_fn(api)
     ]
-
+    sensors.append(NetXResponseTimeSensor(coordinator, entry_id, device_info, RESPONSE_TIME))
+    sensors.append(NetXCommandWaitSensor(coordinator, entry_id, device_info, COMMAND_WAIT))
+    sensors.append(NetXCircuitSensor(coordinator, entry_id, device_info, CIRCUIT))
+
+    # Humidity and CO2 are only exposed over HTTP, and only on some units.
+    # HTTP can be switched on later from the options, without a reload.
+    http_added: set[str] = set()
+
+    @callback
+    def async_add_http_sensors() -> None:
+        """Add the HTTP-backed sensors not created yet."""
+        new_sensors = []
+        for description in SENSORS:
+            endpoint = description.http_endpoint
+            if endpoint in api.http_endpoints and endpoint not in http_added:
+                http_added.add(endpoint)
+                new_sensors.append(NetXSensor(coordinator, entry_id, device_info, description))
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+    data["add_http_sensors"] = async_add_http_sensors
     async_add_entities(sensors)
+    if api.enable_http:
+        async_add_http_sensors()
+
+
+class NetXSensor(NetXEntity, SensorEntity):
+    """A NetX sensor driven by its description.
+
+    A reading within the deadband of the last one written, or arriving
+    sooner than the minimum report interval after it, is not written;
+    every poll would otherwise add a state row for sensor jitter. Changes
+    of availability, unit or attributes are always written.
+    """
+
+    entity_description: NetXSensorEntityDescription
+    # Change with the running stage; the Stage and Operating Status states hold them
+    _unrecorded_attributes = frozenset({"stage", "is_idle", "description", "pending"})
+    # Availability, unit and attributes plus the value of the last reading written
+    _reported: tuple | None = None
+    _reported_at = 0.0
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new reading unless the deadband filters it out."""
+        if self._should_report():
+            super()._handle_coordinator_update()
+
+    def _should_report(self) -> bool:
+        """Return True if the current reading is worth a state write."""
+        kind = self.entity_description.deadband
+        if kind is None:
+            return True
+        value = self.native_value
+        key = (self.available, self.native_unit_of_measurement, self.extra_state_attributes)
+        previous, self._reported = self._reported, (key, value)
+        if previous is not None and previous[0] == key and None not in (value, previous[1]):
+            coordinator = self.coordinator
+            if (
+                abs(value - previous[1]) <= coordinator.deadbands.get(kind, 0)
+                or time.monotonic() - self._reported_at < coordinator.min_report_interval
+            ):
+                # Compare the next reading with the one last written
+                self._reported = previous
+                return False
+        self._reported_at = time.monotonic()
+        return True
 
+    @property
+    def native_value(self) -> Any:
+        """Return the sensor value."""
+        return self._value
 
-class NetXBaseSensor(CoordinatorEntity[NetXDataUpdateCoordinator], SensorEntity):
-    """Base class for NetX sensors."""
-
-    _attr_has_entity_name = True
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        device_name = config_entry.data.get("device_name", "NetX Thermostat")
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "NetX",
-            "model": "Network Thermostat",
-        }
-        self._config_entry = config_entry
-
-
-class NetXOutdoorTemperatureSensor(NetXBaseSensor):
-    """Outdoor temperature sensor."""
-
-    _attr_name = "Outdoor Temperature"
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_icon = "mdi:thermometer"
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_outdoor_temp"
+    @property
+    def data_fields(self) -> frozenset[str]:
+        """Return the fields read, with the scale for temperatures."""
+        if self.entity_description.temperature:
+            return self.entity_description.fields | {"temp_scale"}
+        return self.entity_description.fields
 
     @property
-    def native_unit_of_measurement(self) -> str:
+    def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
+        if not self.entity_description.temperature:
+            return super().native_unit_of_measurement
         if self.coordinator.data and self.coordinator.data.temp_scale == "C":
             return UnitOfTemperature.CELSIUS
         return UnitOfTemperature.FAHRENHEIT
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the outdoor temperature."""
-        if self.coordinator.data:
-            return self.coordinator.data.outdoor_temp
-        return None
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.outdoor_temp is not None
-        )
-
 
-class NetXHumiditySensor(NetXBaseSensor):
-    """Humidity sensor (from HTTP API)."""
+class NetXResponseTimeSensor(NetXSensor):
+    """Smoothed TCP API response time, with the adaptive command timeout."""
 
-    _attr_name = "Humidity"
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = PERCENTAGE
-    _attr_icon = "mdi:water-percent"
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_humidity"
+    _unrecorded_attributes = NetXSensor._unrecorded_attributes | {"sources"}
 
     @property
-    def native_value(self) -> int | None:
-        """Return the humidity."""
-        if self.coordinator.data:
-            return self.coordinator.data.humidity
-        return None
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.humidity is not None
-            and self.coordinator.data.humidity > 0
-        )
+    def native_value(self) -> float | None:
+        """Return the smoothed response time."""
+        return self.coordinator.api.rtt.as_dict()["srtt_ms"]
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        return {"source": "HTTP API (/index.xml)"}
-
-
-class NetXCO2Sensor(NetXBaseSensor):
-    """CO2 sensor (from HTTP API)."""
-
-    _attr_name = "CO2"
-    _attr_device_class = SensorDeviceClass.CO2
-    _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_native_unit_of_measurement = CONCENTRATION_PARTS_PER_MILLION
-    _attr_icon = "mdi:molecule-co2"
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_co2"
-
-    @property
-    def native_value(self) -> int | None:
-        """Return the CO2 level."""
-        if self.coordinator.data:
-            return self.coordinator.data.co2_level
-        return None
+        """Return the variance, the current command timeout and the cost of each source."""
+        attrs = self.coordinator.api.rtt.as_dict()
+        del attrs["srtt_ms"]
+        attrs["sources"] = self.coordinator.api.planner.as_dict()
+        return attrs
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.co2_level is not None
-            and self.coordinator.data.co2_level > 0
-        )
+        return self.coordinator.api.rtt.srtt is not None
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        attrs = {}
-        if self.coordinator.data:
-            if self.coordinator.data.co2_peak_level:
-                attrs["peak_level"] = self.coordinator.data.co2_peak_level
-            if self.coordinator.data.co2_alert_level:
-                attrs["alert_level"] = self.coordinator.data.co2_alert_level
-            attrs["in_alert"] = self.coordinator.data.co2_in_alert
-        return attrs
-
-
-class NetXOperationModeSensor(NetXBaseSensor):
-    """Operation mode sensor (Manual vs Schedule)."""
-
-    _attr_name = "Operation Mode"
-    _attr_icon = "mdi:cog"
 
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_operation_mode"
+class NetXCommandWaitSensor(NetXSensor):
+    """Mean time commands wait for the session, with per-priority queue metrics."""
 
     @property
-    def native_value(self) -> str | None:
-        """Return the operation mode."""
-        if self.coordinator.data:
-            return self.coordinator.data.operation_mode
-        return None
-
-
-class NetXOperatingStatusSensor(NetXBaseSensor):
-    """Operating status sensor."""
-
-    _attr_name = "Operating Status"
-    _attr_icon = "mdi:hvac"
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_operating_status"
-
-    @property
-    def native_value(self) -> str | None:
-        """Return the operating status."""
-        if self.coordinator.data:
-            state = self.coordinator.data
-            if state.is_idle:
-                return "Idle"
-            return state.operating_status.capitalize() if state.operating_status else "Idle"
-        return None
+    def native_value(self) -> float:
+        """Return the mean wait."""
+        return round(self.coordinator.api.scheduler.mean_wait * 1000, 2)
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        attrs = {}
-        if self.coordinator.data:
-            attrs["stage"] = self.coordinator.data.stage
-            attrs["is_idle"] = self.coordinator.data.is_idle
-            attrs["override_active"] = self.coordinator.data.override_active
-            attrs["recovery_active"] = self.coordinator.data.recovery_active
-            if self.coordinator.data.event:
-                attrs["event"] = self.coordinator.data.event
-        return attrs
-
-
-class NetXStageSensor(NetXBaseSensor):
-    """Stage sensor."""
-
-    _attr_name = "Stage"
-    _attr_icon = "mdi:stairs"
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_stage"
-
-    @property
-    def native_value(self) -> int | None:
-        """Return the current stage."""
-        if self.coordinator.data:
-            return self.coordinator.data.stage
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        attrs = {}
-        if self.coordinator.data:
-            stage = self.coordinator.data.stage
-            if stage == 0:
-                attrs["description"] = "Idle - at setpoint"
-            elif stage == 1:
-                attrs["description"] = "Stage 1 active"
-            elif stage == 2:
-                attrs["description"] = "Stage 2 active"
-            elif stage and stage >= 3:
-                attrs["description"] = f"Stage {stage} active"
-        return attrs
-
-
-class NetXHumControlModeSensor(NetXBaseSensor):
-    """Humidification control mode sensor."""
-
-    _attr_name = "Humidification Mode"
-    _attr_icon = "mdi:water-plus"
-
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_hum_mode"
-
-    @property
-    def native_value(self) -> str | None:
-        """Return the humidification mode."""
-        if self.coordinator.data and self.coordinator.data.hum_control_mode:
-            mode = self.coordinator.data.hum_control_mode
-            if mode == "IH":
-                return "Independent of Heating"
-            elif mode == "WH":
-                return "With Heating"
-            return mode
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        attrs = {}
-        if self.coordinator.data:
-            attrs["mode_code"] = self.coordinator.data.hum_control_mode
-            if self.coordinator.data.hum_setpoint is not None:
-                attrs["setpoint"] = self.coordinator.data.hum_setpoint
-            if self.coordinator.data.hum_variance is not None:
-                attrs["variance"] = self.coordinator.data.hum_variance
-        return attrs
+        """Return the queue depth and the waits of each priority class."""
+        scheduler = self.coordinator.api.scheduler
+        return {"depth": scheduler.depth, **scheduler.as_dict()}
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.hum_control_mode is not None
-        )
-
+        return True
 
-class NetXDehumControlModeSensor(NetXBaseSensor):
-    """Dehumidification control mode sensor."""
 
-    _attr_name = "Dehumidification Mode"
-    _attr_icon = "mdi:water-minus"
+class NetXCircuitSensor(NetXSensor):
+    """State of the breaker that stops polling an unreachable unit."""
 
-    def __init__(self, coordinator: NetXDataUpdateCoordinator, config_entry: ConfigEntry) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_dehum_mode"
+    _unrecorded_attributes = NetXSensor._unrecorded_attributes | {"retry_in_s"}
 
     @property
-    def native_value(self) -> str | None:
-        """Return the dehumidification mode."""
-        if self.coordinator.data and self.coordinator.data.dehum_control_mode:
-            mode = self.coordinator.data.dehum_control_mode
-            if mode == "IC":
-                return "Independent of Cooling"
-            elif mode == "WC":
-                return "With Cooling"
-            return mode
-        return None
+    def native_value(self) -> str:
+        """Return closed, open or half_open."""
+        return self.coordinator.api.breaker.state
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        attrs = {}
-        if self.coordinator.data:
-            attrs["mode_code"] = self.coordinator.data.dehum_control_mode
-            if self.coordinator.data.dehum_setpoint is not None:
-                attrs["setpoint"] = self.coordinator.data.dehum_setpoint
-            if self.coordinator.data.dehum_variance is not None:
-                attrs["variance"] = self.coordinator.data.dehum_variance
+        """Return the failure counts and the seconds until the next attempt."""
+        attrs = self.coordinator.api.breaker.as_dict()
+        del attrs["state"]
         return attrs
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.dehum_control_mode is not None
-        )
+        return True
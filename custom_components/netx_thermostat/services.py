@@ -0,0 +1,363 @@
+"""Services of the NetX Thermostat integration."""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate import (
+    ATTR_HVAC_MODE,
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_TARGET_TEMP_LOW,
+)
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .const import (
+    DOMAIN,
+    MIN_TEMP,
+    MAX_TEMP,
+    HVAC_MODE_WRITES,
+    PRESET_TO_RELAY,
+    SERVICE_BULK_APPLY,
+    BULK_TIMEOUT,
+    DEFAULT_BULK_PARALLEL,
+    MAX_BULK_PARALLEL,
+    SERVICE_PROFILE,
+    DEFAULT_PROFILE_DURATION,
+    MAX_PROFILE_DURATION,
+    DEFAULT_PROFILE_TOP,
+    SERVICE_CHECK_SCHEDULE,
+    SCHEDULE_TIMEOUT,
+    SCHEDULE_MAX_AGE,
+    DEFAULT_SCHEDULE_PARALLEL,
+)
+from .api import NetXThermostatAPI
+from .profiling import ProfileWindow, write_report
+from .schedule import diff_schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_FAN_MODE = "fan_mode"
+ATTR_PRESET_MODE = "preset_mode"
+ATTR_TIMEOUT = "timeout"
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_DURATION = "duration"
+ATTR_TOP = "top"
+ATTR_SCHEDULE = "schedule"
+ATTR_REFRESH = "refresh"
+
+_SETTINGS = (
+    ATTR_HVAC_MODE,
+    ATTR_FAN_MODE,
+    ATTR_TEMPERATURE,
+    ATTR_TARGET_TEMP_LOW,
+    ATTR_TARGET_TEMP_HIGH,
+    ATTR_PRESET_MODE,
+)
+
+_TEMPERATURE = vol.All(vol.Coerce(int), vol.Range(min=MIN_TEMP, max=MAX_TEMP))
+
+BULK_APPLY_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **cv.ENTITY_SERVICE_FIELDS,
+            vol.Optional(ATTR_HVAC_MODE): vol.In(list(HVAC_MODE_WRITES)),
+            vol.Optional(ATTR_FAN_MODE): vol.All(vol.Lower, vol.In(["auto", "on"])),
+            vol.Optional(ATTR_TEMPERATURE): _TEMPERATURE,
+            vol.Optional(ATTR_TARGET_TEMP_LOW): _TEMPERATURE,
+            vol.Optional(ATTR_TARGET_TEMP_HIGH): _TEMPERATURE,
+            vol.Optional(ATTR_PRESET_MODE): vol.In(list(PRESET_TO_RELAY)),
+            vol.Optional(ATTR_TIMEOUT, default=BULK_TIMEOUT): vol.All(
+                vol.Coerce(float), vol.Range(min=1, max=120)
+            ),
+            vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_BULK_PARALLEL): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_BULK_PARALLEL)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(*_SETTINGS),
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+        vol.Optional(ATTR_TOP, default=DEFAULT_PROFILE_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=500)
+        ),
+    }
+)
+
+
+CHECK_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_SCHEDULE): vol.Schema({cv.string: cv.string}),
+        vol.Optional(ATTR_REFRESH, default=False): cv.boolean,
+        vol.Optional(ATTR_TIMEOUT, default=SCHEDULE_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=120)
+        ),
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_SCHEDULE_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_BULK_PARALLEL)
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_bulk_apply(call: ServiceCall) -> ServiceResponse:
+        """Write one target state to many thermostats at once."""
+        return await _async_bulk_apply(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_APPLY,
+        async_bulk_apply,
+        schema=BULK_APPLY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_check_schedule(call: ServiceCall) -> ServiceResponse:
+        """Compare the weekly schedule of many thermostats with a desired one."""
+        return await _async_check_schedule(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CHECK_SCHEDULE,
+        async_check_schedule,
+        schema=CHECK_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    window = ProfileWindow()
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the integration for a while and write a report."""
+        return await _async_profile(hass, call, window)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_target_entries(
+    hass: HomeAssistant, call: ServiceCall, require_target: bool = False
+) -> list[str]:
+    """Return the loaded entries a call targets, every one if it names none.
+
+    With ``require_target``, as for writes, a call naming no target is
+    rejected rather than applied to the whole fleet.
+    """
+    loaded = hass.data.get(DOMAIN, {})
+    if not any(key in call.data for key in cv.ENTITY_SERVICE_FIELDS):
+        if require_target:
+            raise ServiceValidationError(
+                f"{DOMAIN}.{call.service} needs a target: entities, devices or areas"
+            )
+        return list(loaded)
+    referenced = await async_extract_config_entry_ids(hass, call)
+    return [entry_id for entry_id in loaded if entry_id in referenced]
+
+
+def _device_settings(api: NetXThermostatAPI, data: dict[str, Any]) -> dict[str, Any]:
+    """Translate the requested state into the settings one unit needs written.
+
+    A single ``temperature`` follows the same rule as the climate entity:
+    it is the heat or cool setpoint in those modes, and otherwise the heat
+    setpoint with the cool setpoint 3 degrees above it.
+    """
+    settings: dict[str, Any] = {}
+    if (hvac_mode := data.get(ATTR_HVAC_MODE)) is not None:
+        settings["hvac_mode"], fan_mode = HVAC_MODE_WRITES[hvac_mode]
+        if fan_mode is not None:
+            settings["fan_mode"] = fan_mode
+    if (fan_mode := data.get(ATTR_FAN_MODE)) is not None:
+        settings["fan_mode"] = fan_mode.upper()
+    if (temperature := data.get(ATTR_TEMPERATURE)) is not None:
+        mode = settings.get("hvac_mode", api.state.hvac_mode)
+        if mode == "HEAT":
+            settings["heat_setpoint"] = temperature
+        elif mode == "COOL":
+            settings["cool_setpoint"] = temperature
+        else:
+            settings["heat_setpoint"] = temperature
+            settings["cool_setpoint"] = temperature + 3
+    if (low := data.get(ATTR_TARGET_TEMP_LOW)) is not None:
+        settings["heat_setpoint"] = low
+    if (high := data.get(ATTR_TARGET_TEMP_HIGH)) is not None:
+        settings["cool_setpoint"] = high
+    if (preset := data.get(ATTR_PRESET_MODE)) is not None:
+        settings["relay_mode"] = PRESET_TO_RELAY[preset]
+    return settings
+
+
+async def _async_apply_one(
+    api: NetXThermostatAPI, data: dict[str, Any], limiter: asyncio.Semaphore, timeout: float
+) -> dict[str, Any]:
+    """Write the requested state to one unit, within its deadline."""
+    async with limiter:
+        start = time.monotonic()
+        result: dict[str, Any] = {"host": api.host}
+        try:
+            async with asyncio.timeout(timeout):
+                written = await api.async_apply(**_device_settings(api, data))
+        except TimeoutError:
+            result.update(success=False, error=f"No answer within {timeout:g}s")
+        else:
+            result.update(success=all(written.values()), written=written)
+            if not result["success"]:
+                result["error"] = api.state.last_error or "Rejected by the thermostat"
+        result["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
+        return result
+
+
+async def _async_bulk_apply(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Fan the writes out to every targeted unit, then refresh each once."""
+    entry_ids = await _async_target_entries(hass, call, require_target=True)
+    if not entry_ids:
+        raise ServiceValidationError("No NetX thermostat matches the given targets")
+
+    entries = hass.data[DOMAIN]
+    limiter = asyncio.Semaphore(call.data[ATTR_MAX_PARALLEL])
+    timeout = call.data[ATTR_TIMEOUT]
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            _async_apply_one(entries[entry_id]["api"], call.data, limiter, timeout)
+            for entry_id in entry_ids
+        )
+    )
+    by_entry = dict(zip(entry_ids, results))
+
+    # One refresh per unit once everything is written, instead of one per
+    # setting; timed-out units may have taken some of the writes too
+    await asyncio.gather(
+        *(
+            entries[entry_id]["coordinator"].async_request_refresh()
+            for entry_id in entry_ids
+            if entry_id in entries
+        )
+    )
+
+    failed = [result["host"] for result in results if not result["success"]]
+    if failed:
+        _LOGGER.warning(
+            "bulk_apply failed on %d of %d thermostats: %s",
+            len(failed),
+            len(results),
+            ", ".join(failed),
+        )
+    return {
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+        "results": by_entry,
+    }
+
+
+async def _async_check_one(
+    api: NetXThermostatAPI, data: dict[str, Any], limiter: asyncio.Semaphore, timeout: float
+) -> dict[str, Any]:
+    """Read one unit's schedule, within its deadline, and diff it."""
+    async with limiter:
+        result: dict[str, Any] = {"host": api.host}
+        max_age = None if data[ATTR_REFRESH] else SCHEDULE_MAX_AGE
+        try:
+            async with asyncio.timeout(timeout):
+                current = await api.async_get_schedule(max_age)
+        except TimeoutError:
+            return {**result, "success": False, "error": f"No answer within {timeout:g}s"}
+        except Exception as err:  # aiohttp errors and unreadable pages alike
+            return {**result, "success": False, "error": str(err) or type(err).__name__}
+
+        if (desired := data.get(ATTR_SCHEDULE)) is None:
+            return {**result, "success": True, "schedule": current}
+        changes, unknown = diff_schedule(current, desired)
+        return {
+            **result,
+            "success": not unknown,
+            "in_sync": not changes and not unknown,
+            "changes": {
+                period: {
+                    leaf: {"current": old, "desired": new} for leaf, (old, new) in leaves.items()
+                }
+                for period, leaves in changes.items()
+            },
+            "unknown": unknown,
+        }
+
+
+async def _async_check_schedule(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Read the targeted units' schedules in parallel and report the periods that differ.
+
+    Without a ``schedule`` each unit's flattened schedule is returned, which
+    gives the paths a desired schedule is written in.
+    """
+    entry_ids = await _async_target_entries(hass, call)
+    if not entry_ids:
+        raise ServiceValidationError("No NetX thermostat matches the given targets")
+
+    entries = hass.data[DOMAIN]
+    limiter = asyncio.Semaphore(call.data[ATTR_MAX_PARALLEL])
+    timeout = call.data[ATTR_TIMEOUT]
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(
+            _async_check_one(entries[entry_id]["api"], call.data, limiter, timeout)
+            for entry_id in entry_ids
+        )
+    )
+    response: dict[str, Any] = {
+        "failed": sum(not result["success"] for result in results),
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+        "results": dict(zip(entry_ids, results)),
+    }
+    if ATTR_SCHEDULE in call.data:
+        response["out_of_sync"] = sum(not result.get("in_sync", False) for result in results)
+    return response
+
+
+async def _async_profile(
+    hass: HomeAssistant, call: ServiceCall, window: ProfileWindow
+) -> ServiceResponse:
+    """Open the profiling window for the requested time, then write its report.
+
+    The profilers run on the event loop's thread, so they see polling,
+    parsing and state writes; nothing stays hooked once the call returns.
+    """
+    if window.running:
+        raise ServiceValidationError("A NetX profile is already running")
+    try:
+        window.start()
+    except ValueError as err:
+        # cProfile refuses to start while another profiler is active
+        raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+
+    duration = call.data[ATTR_DURATION]
+    _LOGGER.info("Profiling the NetX integration for %gs", duration)
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        result = window.stop()
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = Path(hass.config.path(f"netx_profile_{stamp}.txt"))
+    summary = await hass.async_add_executor_job(
+        write_report, path, result, call.data[ATTR_TOP]
+    )
+    _LOGGER.info("NetX profile written to %s", path)
+    return {"report": str(path), "stats": str(path.with_suffix(".prof")), **summary}
@@ -1,19 +1,87 @@
 """Switch platform for NetX Thermostat integration."""
 import logging
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
 
-from homeassistant.components.switch import SwitchEntity
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import NetXDataUpdateCoordinator
-from .api import NetXThermostatAPI
+from .api import NetXThermostatAPI, NetXThermostatState
+from .entity import NetXEntity, NetXEntityDescription, field_is_set
+from .protocol import DEHUM_FIELDS, HUM_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class NetXSwitchEntityDescription(NetXEntityDescription, SwitchEntityDescription):
+    """Describes a NetX switch, how to write it and the state fields a write sets."""
+
+    set_fn: Callable[[NetXThermostatAPI, NetXThermostatState | None, bool], Awaitable[bool]]
+    optimistic_fn: Callable[[bool], Mapping[str, Any]]
+
+
+def _set_hum_independent(
+    api: NetXThermostatAPI, state: NetXThermostatState | None, on: bool
+) -> Awaitable[bool]:
+    """Switch humidification between independent (IH) and with heating (WH)."""
+    setpoint = state.hum_setpoint if state and state.hum_setpoint else 50
+    variance = state.hum_variance if state and state.hum_variance else 5
+    return api.async_set_humidification(on, setpoint, variance)
+
+
+def _set_dehum_independent(
+    api: NetXThermostatAPI, state: NetXThermostatState | None, on: bool
+) -> Awaitable[bool]:
+    """Switch dehumidification between independent (IC) and with cooling (WC)."""
+    setpoint = state.dehum_setpoint if state and state.dehum_setpoint else 55
+    variance = state.dehum_variance if state and state.dehum_variance else 5
+    return api.async_set_dehumidification(on, setpoint, variance)
+
+
+SWITCHES: tuple[NetXSwitchEntityDescription, ...] = (
+    NetXSwitchEntityDescription(
+        key="hum_independent",
+        name="Humidify Independent Mode",
+        icon="mdi:water-plus-outline",
+        fields=HUM_FIELDS,
+        value_fn=lambda state: state.hum_control_mode == "IH",
+        available_fn=field_is_set("hum_control_mode"),
+        attrs_fn=lambda state: {
+            "description": (
+                "When ON (IH), humidification runs independently of heating. "
+                "When OFF (WH), humidification only runs when heating is active."
+            ),
+            "mode_code": state.hum_control_mode,
+        },
+        set_fn=_set_hum_independent,
+        optimistic_fn=lambda on: {"hum_control_mode": "IH" if on else "WH"},
+    ),
+    NetXSwitchEntityDescription(
+        key="dehum_independent",
+        name="Dehumidify Independent Mode",
+        icon="mdi:water-minus-outline",
+        fields=DEHUM_FIELDS,
+        value_fn=lambda state: state.dehum_control_mode == "IC",
+        available_fn=field_is_set("dehum_control_mode"),
+        attrs_fn=lambda state: {
+            "description": (
+                "When ON (IC), dehumidification runs independently of cooling. "
+                "When OFF (WC), dehumidification only runs when cooling is active."
+            ),
+            "mode_code": state.dehum_control_mode,
+        },
+        set_fn=_set_dehum_independent,
+        optimistic_fn=lambda on: {"dehum_control_mode": "IC" if on else "WC"},
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -24,147 +92,47 @@ async def async_setup_entry(
     coordinator = data["coordinator"]
     api = data["api"]
 
-    switches = [
-        NetXHumIndependentSwitch(coordinator, api, config_entry),
-        NetXDehumIndependentSwitch(coordinator, api, config_entry),
-    ]
-
-    async_add_entities(switches)
+    async_add_entities(
+        NetXSwitch(coordinator, api, config_entry.entry_id, data["device_info"], description)
+        for description in SWITCHES
+        if description.exists_fn(api)
+    )
 
 
-class NetXBaseSwitch(CoordinatorEntity[NetXDataUpdateCoordinator], SwitchEntity):
-    """Base class for NetX switches."""
+class NetXSwitch(NetXEntity, SwitchEntity):
+    """A NetX switch driven by its description."""
 
-    _attr_has_entity_name = True
+    entity_description: NetXSwitchEntityDescription
 
     def __init__(
         self,
         coordinator: NetXDataUpdateCoordinator,
         api: NetXThermostatAPI,
-        config_entry: ConfigEntry,
+        entry_id: str,
+        device_info: Mapping[str, Any],
+        description: NetXSwitchEntityDescription,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entry_id, device_info, description)
         self._api = api
-        device_name = config_entry.data.get("device_name", "NetX Thermostat")
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "NetX",
-            "model": "Network Thermostat",
-        }
-        self._config_entry = config_entry
-
-
-class NetXHumIndependentSwitch(NetXBaseSwitch):
-    """Humidification Independent Mode Switch."""
-
-    _attr_name = "Humidify Independent Mode"
-    _attr_icon = "mdi:water-plus-outline"
-
-    def __init__(self, coordinator, api, config_entry) -> None:
-        """Initialize."""
-        super().__init__(coordinator, api, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_hum_independent"
 
     @property
     def is_on(self) -> bool:
-        """Return true if independent mode is enabled."""
-        if self.coordinator.data and self.coordinator.data.hum_control_mode:
-            return self.coordinator.data.hum_control_mode == "IH"
-        return False
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.hum_control_mode is not None
+        """Return true if the switch is on."""
+        return bool(self._value)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the switch on."""
+        await self._async_turn(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the switch off."""
+        await self._async_turn(False)
+
+    async def _async_turn(self, on: bool) -> None:
+        """Write the new position, showing it until the device confirms or refutes it."""
+        description = self.entity_description
+        await self._async_write(
+            description.optimistic_fn(on),
+            description.set_fn(self._api, self._state, on),
         )
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        return {
-            "description": (
-                "When ON (IH), humidification runs independently of heating. "
-                "When OFF (WH), humidification only runs when heating is active."
-            ),
-            "mode_code": self.coordinator.data.hum_control_mode if self.coordinator.data else None,
-        }
-
-    async def async_turn_on(self, **kwargs) -> None:
-        """Set to independent mode (IH)."""
-        state = self.coordinator.data
-        setpoint = state.hum_setpoint if state and state.hum_setpoint else 50
-        variance = state.hum_variance if state and state.hum_variance else 5
-        
-        await self._api.async_set_humidification(True, setpoint, variance)
-        await self.coordinator.async_request_refresh()
-
-    async def async_turn_off(self, **kwargs) -> None:
-        """Set to with heating mode (WH)."""
-        state = self.coordinator.data
-        setpoint = state.hum_setpoint if state and state.hum_setpoint else 50
-        variance = state.hum_variance if state and state.hum_variance else 5
-        
-        await self._api.async_set_humidification(False, setpoint, variance)
-        await self.coordinator.async_request_refresh()
-
-
-class NetXDehumIndependentSwitch(NetXBaseSwitch):
-    """Dehumidification Independent Mode Switch."""
-
-    _attr_name = "Dehumidify Independent Mode"
-    _attr_icon = "mdi:water-minus-outline"
-
-    def __init__(self, coordinator, api, config_entry) -> None:
-        """Initialize."""
-        super().__init__(coordinator, api, config_entry)
-        self._attr_unique_id = f"{config_entry.entry_id}_dehum_independent"
-
-    @property
-    def is_on(self) -> bool:
-        """Return true if independent mode is enabled."""
-        if self.coordinator.data and self.coordinator.data.dehum_control_mode:
-            return self.coordinator.data.dehum_control_mode == "IC"
-        return False
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return (
-            self.coordinator.last_update_success
-            and self.coordinator.data is not None
-            and self.coordinator.data.dehum_control_mode is not None
-        )
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        """Return extra state attributes."""
-        return {
-            "description": (
-                "When ON (IC), dehumidification runs independently of cooling. "
-                "When OFF (WC), dehumidification only runs when cooling is active."
-            ),
-            "mode_code": self.coordinator.data.dehum_control_mode if self.coordinator.data else None,
-        }
-
-    async def async_turn_on(self, **kwargs) -> None:
-        """Set to independent mode (IC)."""
-        state = self.coordinator.data
-        setpoint = state.dehum_setpoint if state and state.dehum_setpoint else 55
-        variance = state.dehum_variance if state and state.dehum_variance else 5
-        
-        await self._api.async_set_dehumidification(True, setpoint, variance)
-        await self.coordinator.async_request_refresh()
-
-    async def async_turn_off(self, **kwargs) -> None:
-        """Set to with cooling mode (WC)."""
-        state = self.coordinator.data
-        setpoint = state.dehum_setpoint if state and state.dehum_setpoint else 55
-        variance = state.dehum_variance if state and state.dehum_variance else 5
-        
-        await self._api.async_set_dehumidification(False, setpoint, variance)
-        await self.coordinator.async_request_refresh()
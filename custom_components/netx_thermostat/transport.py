@@ -0,0 +1,182 @@
+"""Line-oriented TCP transport for the NetX Thermostat API."""
+import asyncio
+import logging
+import time
+
+from .const import PRIORITY_INTERACTIVE, PRIORITY_REFRESH
+from .protocol import encode_command, is_error_reply, reply_matches
+from .rtt import RttEstimator
+from .scheduler import CommandScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ExchangeTimeout(asyncio.TimeoutError):
+    """A command got no reply within ``elapsed`` seconds on the wire."""
+
+    def __init__(self, elapsed: float) -> None:
+        """Initialize with the time spent waiting for the reply."""
+        super().__init__(f"No reply after {elapsed:.3f}s")
+        self.elapsed = elapsed
+
+
+class NetXTransport:
+    """A single TCP session exchanging CRLF-terminated lines.
+
+    Every exchange holds a slot of the ``scheduler`` so a request and its
+    reply are never interleaved with another caller's; slots go to the
+    most urgent caller first and are rate limited. Errors are raised to
+    the caller.
+
+    Exchanges without an explicit timeout use the deadline from ``rtt``,
+    which outlives reconnects and learns from every reply.
+
+    A command that times out or is cancelled after being written still
+    gets its reply later. ``stale`` counts those owed replies; they are
+    recognised by their prefix and skipped, so the stream stays in step
+    without reconnecting.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize the transport."""
+        self.host = host
+        self.port = port
+        self.rtt = RttEstimator()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self.scheduler = CommandScheduler()
+        self.stale = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while a socket is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def open(self, greeting: str, connect_timeout: float) -> str:
+        """(Re)open the socket and send the first line, returning its reply.
+
+        ``connect_timeout`` caps the adaptive connection deadline.
+        """
+        async with self.scheduler.slot(PRIORITY_INTERACTIVE):
+            await self._close_locked()
+
+            _LOGGER.debug("Connecting to %s:%s", self.host, self.port)
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port),
+                    timeout=self.rtt.connect_timeout(connect_timeout),
+                )
+            except asyncio.TimeoutError:
+                self.rtt.record_timeout()
+                raise
+            line, _ = await self._exchange_locked(greeting, None, match=False)
+            return line.decode().strip()
+
+    async def request(
+        self,
+        command: str,
+        timeout: float | None = None,
+        limit: float | None = None,
+        priority: int = PRIORITY_REFRESH,
+        raw: bool = False,
+    ) -> str | bytes | None:
+        """Send one command and return its reply, or None without a socket.
+
+        Without ``timeout`` the adaptive deadline applies, cut short to
+        ``limit`` if given; an explicit one (e.g. for capability probes)
+        neither backs the estimate off nor feeds it. Neither covers the
+        time spent waiting for a slot. ``raw`` returns the line as read,
+        line end included, for the byte-level parsers.
+        """
+        reply, _ = await self.request_timed(command, timeout, limit, priority, raw)
+        return reply
+
+    async def request_timed(
+        self,
+        command: str,
+        timeout: float | None = None,
+        limit: float | None = None,
+        priority: int = PRIORITY_REFRESH,
+        raw: bool = False,
+    ) -> tuple[str | bytes | None, float | None]:
+        """Like ``request``, also returning the seconds the exchange took on the wire.
+
+        The time is None when nothing was sent. A timeout raises
+        ``ExchangeTimeout``, which carries the time waited.
+        """
+        async with self.scheduler.slot(priority):
+            if not self._writer or not self._reader:
+                return None, None
+            line, elapsed = await self._exchange_locked(command, timeout, limit=limit)
+            return (line if raw else line.decode().strip()), elapsed
+
+    async def close(self) -> None:
+        """Close the socket."""
+        async with self.scheduler.slot(PRIORITY_INTERACTIVE, limited=False):
+            await self._close_locked()
+
+    async def _exchange_locked(
+        self, command: str, timeout: float | None, match: bool = True, limit: float | None = None
+    ) -> tuple[bytes, float]:
+        """Write a line; return its raw reply and the seconds it took (must hold lock).
+
+        Stale replies to earlier commands are skipped.
+        """
+        adaptive = timeout is None
+        if adaptive:
+            timeout = self.rtt.timeout
+            # Running into a caller's limit says nothing about the unit
+            backoff = limit is None or limit >= timeout
+            if limit is not None:
+                timeout = min(timeout, limit)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + timeout
+        skipped = False
+        try:
+            self._writer.write(encode_command(command))
+            await self._writer.drain()
+
+            while True:
+                line = await asyncio.wait_for(
+                    self._reader.readline(), timeout=max(0.0, deadline - loop.time())
+                )
+                if not line:
+                    raise ConnectionResetError("Connection closed by thermostat")
+                if not match or (
+                    reply_matches(command, line) and not (self.stale and is_error_reply(line))
+                ):
+                    break
+                # Replies come in order: a line that is not ours answers
+                # an abandoned command (an error is charged to the oldest)
+                _LOGGER.debug("Skipping stale reply to an earlier command: %s", line)
+                self.stale = max(0, self.stale - 1)
+                skipped = True
+        except asyncio.TimeoutError as err:
+            self.stale += 1
+            if adaptive and backoff:
+                self.rtt.record_timeout()
+            raise ExchangeTimeout(loop.time() - start) from err
+        except asyncio.CancelledError:
+            # The command went out; its reply will arrive later
+            self.stale += 1
+            raise
+
+        # A reply to this command means every earlier one was received or lost
+        elapsed = loop.time() - start
+        self.stale = 0
+        if adaptive and not skipped:
+            self.rtt.sample(elapsed)
+        return line, elapsed
+
+    async def _close_locked(self) -> None:
+        """Close connection (must hold lock)."""
+        if self._writer:
+            try:
+                self._writer.close()
+                await self._writer.wait_closed()
+            except Exception:
+                pass
+        self._reader = None
+        self._writer = None
+        self.stale = 0
@@ -0,0 +1,131 @@
+"""Streams of state changes for consumers outside the entity layer.
+
+Every subscriber gets its own bounded queue, so a slow consumer never
+holds up polling: once its queue is full, the oldest change is dropped
+(``WATCH_DROP_OLDEST``) or the new change is folded into the newest
+queued one (``WATCH_COALESCE``).
+"""
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, fields
+from typing import Any
+
+from .const import WATCH_QUEUE_SIZE, WATCH_DROP_OLDEST, WATCH_COALESCE
+from .protocol import NetXThermostatState
+
+# Bookkeeping fields never reported as changes
+_IGNORED = frozenset({"updated_at"})
+STATE_FIELDS = tuple(f.name for f in fields(NetXThermostatState) if f.name not in _IGNORED)
+
+
+@dataclass(frozen=True, slots=True)
+class StateChange:
+    """Fields that changed in one update, with their new values."""
+
+    timestamp: float  # time.time() of the update that changed them
+    changes: dict[str, Any]
+
+
+class _Subscriber:
+    """One consumer's bounded queue of changes."""
+
+    def __init__(self, names: frozenset[str], maxsize: int, policy: str) -> None:
+        """Initialize the subscriber."""
+        self.names = names
+        self.policy = policy
+        self.dropped = 0
+        self._queue: deque[StateChange] = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+
+    def put(self, change: StateChange) -> None:
+        """Queue a change without ever blocking the publisher."""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+            if self.policy == WATCH_COALESCE:
+                newest = self._queue.pop()
+                change = StateChange(change.timestamp, {**newest.changes, **change.changes})
+        self._queue.append(change)
+        self._ready.set()
+
+    async def get(self) -> StateChange:
+        """Wait for the next change."""
+        while not self._queue:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+
+class StateBroadcaster:
+    """Diffs successive states and fans the changes out to subscribers.
+
+    Costs nothing while nobody is watching: the previous values are only
+    kept while there is at least one subscriber.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the broadcaster."""
+        self._subscribers: set[_Subscriber] = set()
+        self._last: dict[str, Any] | None = None
+
+    def publish(self, state: NetXThermostatState) -> None:
+        """Send the fields changed since the previous call to every subscriber."""
+        if not self._subscribers:
+            return
+        current = {name: getattr(state, name) for name in STATE_FIELDS}
+        previous, self._last = self._last, current
+        if previous is None:
+            return
+        changed = {name: value for name, value in current.items() if previous[name] != value}
+        if not changed:
+            return
+        now = time.time()
+        for subscriber in self._subscribers:
+            if own := {name: changed[name] for name in subscriber.names if name in changed}:
+                subscriber.put(StateChange(now, own))
+
+    def watch(
+        self,
+        state: NetXThermostatState,
+        names: Iterable[str] | None = None,
+        maxsize: int = WATCH_QUEUE_SIZE,
+        policy: str = WATCH_DROP_OLDEST,
+        initial: bool = True,
+    ) -> AsyncIterator[StateChange]:
+        """Return the changes of ``names`` (all fields by default).
+
+        The arguments are checked here, so bad ones raise ValueError at the
+        call; the subscription only starts with the first item.
+        """
+        names = frozenset(STATE_FIELDS if names is None else names)
+        if unknown := names - set(STATE_FIELDS):
+            raise ValueError(f"Unknown state fields: {', '.join(sorted(unknown))}")
+        if policy not in (WATCH_DROP_OLDEST, WATCH_COALESCE):
+            raise ValueError(f"Unknown watch policy: {policy}")
+        if maxsize < 1:
+            raise ValueError(f"Watch queue size must be at least 1, got {maxsize}")
+        return self._stream(state, names, maxsize, policy, initial)
+
+    async def _stream(
+        self,
+        state: NetXThermostatState,
+        names: frozenset[str],
+        maxsize: int,
+        policy: str,
+        initial: bool,
+    ) -> AsyncIterator[StateChange]:
+        """Yield the changes of ``names`` until the iterator is closed."""
+        subscriber = _Subscriber(names, maxsize, policy)
+        if not self._subscribers:
+            self._last = {name: getattr(state, name) for name in STATE_FIELDS}
+        self._subscribers.add(subscriber)
+        try:
+            if initial:
+                yield StateChange(time.time(), {name: getattr(state, name) for name in names})
+            while True:
+                yield await subscriber.get()
+        finally:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._last = None
@@ -0,0 +1,30 @@
+"""Developer tooling for the NetX Thermostat integration.
+
+The integration package's ``__init__`` imports Home Assistant. The
+client modules (``api``, ``protocol``, ``transport``...) do not, so
+``load_integration`` registers the package without executing its
+``__init__``. That lets the tools here run on a machine without Home
+Assistant installed.
+"""
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+PACKAGE_NAME = "netx_thermostat"
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / PACKAGE_NAME
+
+
+def load_integration(module: str | None = None):
+    """Return the integration package, or one of its submodules."""
+    if PACKAGE_NAME not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE_NAME,
+            PACKAGE_DIR / "__init__.py",
+            submodule_search_locations=[str(PACKAGE_DIR)],
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[PACKAGE_NAME] = package
+    if module is None:
+        return sys.modules[PACKAGE_NAME]
+    return importlib.import_module(f"{PACKAGE_NAME}.{module}")
@@ -0,0 +1,80 @@
+"""Import-time and memory benchmark for the NetX client modules.
+
+Each case runs in a fresh interpreter, so module caches never leak
+between measurements::
+
+    python -m netx_tools.bench_import [--runs 20]
+
+``client`` is what a unit without HTTP sensors pays now that the HTTP
+module is lazy. ``client+http`` adds the HTTP sensor module, which is
+what every unit paid when ``api.py`` imported ``aiohttp`` eagerly.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+CASES = {
+    "client": ["api"],
+    "client+http": ["api", "http_sensors"],
+}
+
+# tracemalloc slows imports down a lot, so time and memory are separate runs
+_PROBE = """
+import json, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+from netx_tools import load_integration
+baseline = len(sys.modules)
+if {trace_memory!r}:
+    tracemalloc.start()
+start = time.perf_counter()
+for name in {modules!r}:
+    load_integration(name)
+elapsed = time.perf_counter() - start
+current, _peak = tracemalloc.get_traced_memory()
+print(json.dumps({{"seconds": elapsed, "bytes": current, "modules": len(sys.modules) - baseline}}))
+"""
+
+
+def _run_case(root: str, modules: list[str], trace_memory: bool = False) -> dict | None:
+    """Import the modules in a fresh interpreter and return its measurements."""
+    probe = _PROBE.format(root=root, modules=modules, trace_memory=trace_memory)
+    proc = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr.strip().splitlines()[-1], file=sys.stderr)
+        return None
+    return json.loads(proc.stdout)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    from netx_tools import PACKAGE_DIR
+
+    root = str(PACKAGE_DIR.parent.parent)
+    print(f"{'case':<12} {'median ms':>10} {'min ms':>8} {'KiB':>8} {'new mods':>8}")
+    for case, modules in CASES.items():
+        samples = [s for s in (_run_case(root, modules) for _ in range(args.runs)) if s]
+        if not samples:
+            print(f"{case:<12} {'unavailable':>10}")
+            continue
+        times = [s["seconds"] * 1000 for s in samples]
+        memory = _run_case(root, modules, trace_memory=True) or samples[-1]
+        print(
+            f"{case:<12} {statistics.median(times):>10.2f} {min(times):>8.2f} "
+            f"{memory['bytes'] / 1024:>8.0f} {samples[-1]['modules']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
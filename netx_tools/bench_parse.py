@@ -0,0 +1,124 @@
+"""Benchmark the byte-level reply parsers against the string path.
+
+Parses the replies of one full poll over and over, both ways::
+
+    python -m netx_tools.bench_parse [--polls 20000] [--repeat 5]
+
+``string`` is what the client did per reply before: decode and strip the
+line, check it for an error reply and its prefix, strip the prefix, then
+split and upper-case each field. ``bytes`` matches the line as read and
+hands it to ``ReadCommand.apply``. For each path it reports the best time
+per poll over ``--repeat`` runs, the peak of the short-lived objects one
+poll allocates and how many generation 0 collections a run triggered.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from netx_tools import load_integration
+
+const = load_integration("const")
+protocol = load_integration("protocol")
+
+_ERRORS = const.RESP_ERRORS
+
+# One full poll's replies, as the simulator sends them
+REPLIES = (
+    b"RTS1:FAHRENHEIT\r\n",
+    b"RAS1:71.5,NA,HEAT,FAN AUTO,NO,NO,77,68,HEAT,1,NONE\r\n",
+    b"RNS1:OFF\r\n",
+    b"RMRF1:HUM,OFF\r\n",
+    b"RMHS1:IH,45,5\r\n",
+    b"RMDHS1:IC,55,5\r\n",
+    b"RRS1:HUM\r\n",
+    b"RSS1:HEAT,1\r\n",
+)
+
+
+def _pairs() -> list[tuple]:
+    """Match every reply with its read command."""
+    by_prefix = {rc.raw_prefix: rc for rc in protocol.READ_COMMANDS.values()}
+    return [
+        (next(rc for prefix, rc in by_prefix.items() if line.startswith(prefix)), line)
+        for line in REPLIES
+    ]
+
+
+def _string_poll(pairs, state) -> None:
+    """Match and parse one poll the way the client did before."""
+    for rc, raw in pairs:
+        line = raw.decode().strip()
+        if line.strip().upper() in _ERRORS or not line.startswith(rc.prefix):
+            continue
+        rc.parse(protocol.strip_prefix(line, rc.prefix), state)
+
+
+def _bytes_poll(pairs, state) -> None:
+    """Match and parse one poll from the raw lines."""
+    for rc, line in pairs:
+        if protocol.reply_matches(rc.command, line):
+            rc.apply(line, state)
+
+
+PATHS = {"string": _string_poll, "bytes": _bytes_poll}
+
+
+def _measure(poll, polls: int, repeat: int) -> dict:
+    """Time ``polls`` parses and count the collections they trigger."""
+    pairs = _pairs()
+    state = protocol.NetXThermostatState()
+    for _ in range(1000):
+        poll(pairs, state)
+
+    elapsed = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        collections = gc.get_stats()[0]["collections"]
+        start = time.perf_counter()
+        for _ in range(polls):
+            poll(pairs, state)
+        elapsed = min(elapsed, time.perf_counter() - start)
+        collections = gc.get_stats()[0]["collections"] - collections
+
+    # Peak of the transient objects of one poll, above what the state holds
+    tracemalloc.start()
+    poll(pairs, state)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    poll(pairs, state)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "us_per_poll": round(elapsed / polls * 1e6, 2),
+        "peak_bytes_per_poll": peak - current,
+        "gen0_collections": collections,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print one JSON line per path")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print(f"{'path':<7} {'us/poll':>8} {'peak B/poll':>12} {'gen0 GCs':>9}")
+    for name, poll in PATHS.items():
+        record = {"path": name, **_measure(poll, args.polls, args.repeat)}
+        if args.json:
+            print(json.dumps(record))
+            continue
+        print(
+            f"{name:<7} {record['us_per_poll']:>8.2f} {record['peak_bytes_per_poll']:>12} "
+            f"{record['gen0_collections']:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+"""Run the config flow's subnet discovery from the command line.
+
+    python -m netx_tools.discover 192.168.1.0/24 --username admin --password secret
+
+Against local simulators (every 127.x address is loopback on Linux)::
+
+    python -m netx_tools.simulator --network 127.0.1.0/28 --http-port 8080 &
+    python -m netx_tools.discover 127.0.1.0/24 --http-port 8080 --password admin
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from netx_tools import load_integration
+
+const = load_integration("const")
+discovery = load_integration("discovery")
+
+
+async def _run(args: argparse.Namespace) -> int:
+    """Scan, verify and print the results."""
+    start = time.monotonic()
+    found = await discovery.async_scan(
+        args.network,
+        port=args.port,
+        http_port=args.http_port,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+    )
+    scanned = time.monotonic() - start
+    verified = {}
+    if args.password is not None:
+        verified = await discovery.async_verify(found, args.username, args.password)
+
+    for item in found:
+        login = {True: "login ok", False: "login failed"}.get(verified.get(item.host), "")
+        http = "http" if item.http else ""
+        print(f"{item.host:<16} {item.port:>6} {item.latency * 1000:>8.1f} ms  {http:<5} {login}")
+    print(f"{len(found)} found, scan {scanned:.2f}s, total {time.monotonic() - start:.2f}s")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="Scan a network for NetX thermostats")
+    parser.add_argument("network")
+    parser.add_argument("--port", type=int, default=const.DEFAULT_PORT)
+    parser.add_argument("--http-port", type=int, default=const.DEFAULT_HTTP_PORT)
+    parser.add_argument("--concurrency", type=int, default=const.DISCOVERY_CONCURRENCY)
+    parser.add_argument("--timeout", type=float, default=const.DISCOVERY_TIMEOUT)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", help="verify the credentials on every host found")
+    return asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
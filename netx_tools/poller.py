@@ -0,0 +1,247 @@
+"""Poll and benchmark thermostats with the real client, without Home Assistant.
+
+Print snapshots as JSON lines, one per host and poll::
+
+    python -m netx_tools.poller poll 192.168.1.20 192.168.1.21 --password secret
+    python -m netx_tools.poller poll --simulate 4 --interval 2 --changes
+
+Time ``async_update`` and the setters, per transport mode::
+
+    python -m netx_tools.poller bench --simulate 20 --latency-ms 15 --updates 50
+
+``--simulate N`` starts N in-process simulators on free loopback ports
+instead of polling real hosts.
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import statistics
+import sys
+import time
+
+from netx_tools import load_integration
+from netx_tools.simulator import start_fleet
+
+const = load_integration("const")
+api_module = load_integration("api")
+
+# Transport modes compared by ``bench``: client options and update arguments
+MODES = {
+    "sequential": ({"max_concurrency": 1}, {"full": True}),
+    "parallel": ({"max_concurrency": const.MAX_CONCURRENCY}, {"full": True}),
+    "tcp-only": ({"enable_http": False}, {"full": True}),
+    "quick": ({}, {"full": False}),
+}
+
+
+def _parse_target(target: str) -> tuple[str, int]:
+    """Split ``host[:port]``."""
+    host, _, port = target.partition(":")
+    return host, int(port) if port else const.DEFAULT_PORT
+
+
+async def _targets(args: argparse.Namespace) -> tuple[list[tuple[str, int]], list]:
+    """Return the hosts to use and the simulators started for them."""
+    if not args.simulate:
+        return [_parse_target(target) for target in args.hosts], []
+    fleet = await start_fleet(
+        count=args.simulate,
+        username=args.username,
+        password=args.password,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+    )
+    return [(host, port) for _sim, host, port in fleet], [sim for sim, _host, _port in fleet]
+
+
+def _client(args: argparse.Namespace, host: str, port: int, **options):
+    """Build a client for one host."""
+    options.setdefault("enable_http", not args.simulate and not args.no_http)
+    return api_module.NetXThermostatAPI(host, args.username, args.password, port, **options)
+
+
+def _emit(record: dict) -> None:
+    """Print one JSON line."""
+    print(json.dumps(record, default=str), flush=True)
+
+
+async def _print_changes(host: str, changes) -> None:
+    """Print every change a watch iterator yields."""
+    async for change in changes:
+        _emit({"host": host, "ts": change.timestamp, **change.changes})
+
+
+async def _poll_one(args: argparse.Namespace, host: str, port: int) -> None:
+    """Poll one host and print its snapshots (or only its changes)."""
+    api = _client(args, host, port)
+    label = f"{host}:{port}"
+    printer = None
+    if args.changes:
+        printer = asyncio.create_task(_print_changes(label, api.watch(args.fields or None)))
+    try:
+        for index in range(args.count or sys.maxsize):
+            if index:
+                await asyncio.sleep(args.interval)
+            full = index % (args.quick_polls + 1) == 0
+            start = time.perf_counter()
+            state = await api.async_update(full=full, budget=args.interval)
+            if printer is not None:
+                continue
+            snapshot = dataclasses.asdict(state)
+            if args.fields:
+                snapshot = {name: snapshot[name] for name in args.fields}
+            elapsed = round((time.perf_counter() - start) * 1000, 2)
+            _emit({"host": label, "ts": time.time(), "full": full, "ms": elapsed, **snapshot})
+    finally:
+        if printer is not None:
+            await asyncio.sleep(0)
+            printer.cancel()
+        await api.disconnect()
+
+
+async def _run_poll(args: argparse.Namespace) -> int:
+    """Poll every target concurrently."""
+    targets, simulators = await _targets(args)
+    try:
+        await asyncio.gather(*(_poll_one(args, host, port) for host, port in targets))
+    finally:
+        for sim in simulators:
+            await sim.close()
+    return 0
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    """Return a nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _summary(samples: list[float]) -> dict:
+    """Summarize latencies in milliseconds."""
+    if not samples:
+        return {"n": 0}
+    ms = [sample * 1000 for sample in samples]
+    return {
+        "n": len(ms),
+        "p50": round(statistics.median(ms), 2),
+        "p95": round(_percentile(ms, 0.95), 2),
+        "max": round(max(ms), 2),
+    }
+
+
+async def _bench_one(
+    args: argparse.Namespace, host: str, port: int, options: dict, update: dict
+) -> tuple[list[float], list[float], int]:
+    """Time updates and setters against one host; return their latencies and failures."""
+    api = _client(args, host, port, **options)
+    updates, setters, failures = [], [], 0
+    try:
+        if not (await api.async_update()).connected:
+            return updates, setters, args.updates + args.setters
+        for _ in range(args.updates):
+            start = time.perf_counter()
+            state = await api.async_update(**update)
+            updates.append(time.perf_counter() - start)
+            failures += not state.connected
+        # Setters write the current value back, so the unit is left as found
+        for index in range(args.setters):
+            start = time.perf_counter()
+            if index % 2:
+                ok = await api.async_set_fan_mode(api.state.fan_mode or "AUTO")
+            else:
+                ok = await api.async_set_cool_setpoint(api.state.cool_setpoint or 77)
+            setters.append(time.perf_counter() - start)
+            failures += not ok
+    finally:
+        await api.disconnect()
+    return updates, setters, failures
+
+
+async def _run_bench(args: argparse.Namespace) -> int:
+    """Benchmark every mode against every target, one mode at a time."""
+    targets, simulators = await _targets(args)
+    modes = args.modes or list(MODES)
+    if not args.json:
+        print(
+            f"{'mode':<11} {'upd/s':>8} {'upd p50':>8} {'p95':>8} {'max':>8} "
+            f"{'set p50':>8} {'p95':>8} {'fail':>5}"
+        )
+    try:
+        for mode in modes:
+            options, update = MODES[mode]
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(_bench_one(args, host, port, options, update) for host, port in targets)
+            )
+            wall = time.perf_counter() - start
+            updates = [sample for result in results for sample in result[0]]
+            setters = [sample for result in results for sample in result[1]]
+            record = {
+                "mode": mode,
+                "hosts": len(targets),
+                "wall_s": round(wall, 3),
+                "updates_per_s": round(len(updates) / wall, 1) if wall else None,
+                "update_ms": _summary(updates),
+                "setter_ms": _summary(setters),
+                "failures": sum(result[2] for result in results),
+            }
+            if args.json:
+                _emit(record)
+                continue
+            upd, sets = record["update_ms"], record["setter_ms"]
+            print(
+                f"{mode:<11} {record['updates_per_s'] or 0:>8.1f} {upd.get('p50', 0):>8.2f} "
+                f"{upd.get('p95', 0):>8.2f} {upd.get('max', 0):>8.2f} {sets.get('p50', 0):>8.2f} "
+                f"{sets.get('p95', 0):>8.2f} {record['failures']:>5}"
+            )
+    finally:
+        for sim in simulators:
+            await sim.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("hosts", nargs="*", help="host[:port] of each thermostat")
+    common.add_argument("--username", default="admin")
+    common.add_argument("--password", default="admin")
+    common.add_argument("--no-http", action="store_true", help="skip the HTTP sensors")
+    common.add_argument("--simulate", type=int, default=0, help="poll this many local simulators")
+    common.add_argument("--latency-ms", type=float, default=0.0, help="simulator reply latency")
+    common.add_argument("--jitter-ms", type=float, default=0.0, help="simulator reply jitter")
+
+    poll = sub.add_parser("poll", parents=[common], help="print snapshots as JSON lines")
+    poll.add_argument("--interval", type=float, default=const.UPDATE_INTERVAL)
+    poll.add_argument("--count", type=int, default=0, help="polls per host (0 = forever)")
+    poll.add_argument("--quick-polls", type=int, default=0)
+    poll.add_argument("--fields", nargs="*", help="only print these state fields")
+    poll.add_argument("--changes", action="store_true", help="print only changed fields")
+
+    bench = sub.add_parser("bench", parents=[common], help="time updates and setters")
+    bench.add_argument("--updates", type=int, default=20, help="updates per host and mode")
+    bench.add_argument("--setters", type=int, default=10, help="setter calls per host and mode")
+    bench.add_argument("--modes", nargs="*", choices=list(MODES))
+    bench.add_argument("--json", action="store_true", help="print one JSON line per mode")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point."""
+    args = build_parser().parse_args(argv)
+    if not args.hosts and not args.simulate:
+        print("Give at least one host, or --simulate N", file=sys.stderr)
+        return 2
+    runner = _run_poll if args.command == "poll" else _run_bench
+    try:
+        return asyncio.run(runner(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""NetX thermostat protocol simulator.
+
+Serves the TCP API (login, every read command in ``protocol.READ_COMMANDS``
+and the write commands) and, optionally, ``/index.xml``, ``/co2.json`` and
+a read-only ``/schedule.xml`` over HTTP. Run one or many::
+
+    python -m netx_tools.simulator --count 20 --base-port 20001
+    python -m netx_tools.simulator --network 127.0.1.0/28 --http-port 8080
+
+Every 127.x.y.z address is loopback on Linux, so ``--network`` starts one
+simulator per address on the same port, which is what subnet discovery
+expects to find.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+
+from netx_tools import load_integration
+
+const = load_integration("const")
+protocol = load_integration("protocol")
+
+
+@dataclass
+class SimulatorStats:
+    """Counters for one simulator."""
+
+    connections: int = 0
+    commands: int = 0
+    http_requests: int = 0
+
+
+@dataclass
+class SimulatedState:
+    """Mutable device state behind the simulated API."""
+
+    indoor_temp: float = 70.0
+    outdoor_temp: float | None = None
+    hvac_mode: str = "HEAT"
+    fan_mode: str = "AUTO"
+    cool_setpoint: int = 77
+    heat_setpoint: int = 68
+    stage: int = 0
+    manual: bool = True
+    relay_mode: str = "OFF"
+    hum: tuple[str, int, int] = ("WH", 50, 5)
+    dehum: tuple[str, int, int] = ("IC", 55, 5)
+    humidity: int = 35
+    co2: int = 600
+    scale: str = "FAHRENHEIT"
+    cool_stages: str = "MAN2"
+    # (start, heat, cool) of each period, the same every day. The real
+    # schedule page's layout is not documented; this one is made up.
+    schedule: list[tuple[str, int, int]] = field(
+        default_factory=lambda: [
+            ("06:00", 68, 77), ("08:00", 62, 82), ("17:00", 68, 77), ("22:00", 62, 80)
+        ]
+    )
+
+
+@dataclass
+class ThermostatSimulator:
+    """One simulated thermostat."""
+
+    username: str = "admin"
+    password: str = "admin"
+    latency: float = 0.0  # seconds added before every reply
+    jitter: float = 0.0  # extra random delay, up to this many seconds
+    co2_module: bool = True
+    unsupported: frozenset[str] = frozenset()  # read commands answered with BAD COMMAND
+    state: SimulatedState = field(default_factory=SimulatedState)
+    stats: SimulatorStats = field(default_factory=SimulatorStats)
+
+    def __post_init__(self) -> None:
+        """Prepare the servers."""
+        self._servers: list[asyncio.base_events.Server] = []
+        self._auth = protocol.build_login(self.username, self.password)
+        self._rng = random.Random()
+
+    async def start(self, host: str, port: int, http_port: int | None = None) -> int:
+        """Start serving; return the bound TCP port (useful with port 0)."""
+        server = await asyncio.start_server(self._handle_tcp, host, port)
+        self._servers.append(server)
+        if http_port is not None:
+            self._servers.append(await asyncio.start_server(self._handle_http, host, http_port))
+        return server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop serving."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+
+    async def _delay(self) -> None:
+        """Apply the configured reply latency."""
+        delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _tick(self) -> None:
+        """Let the readings drift a little between polls."""
+        s = self.state
+        s.indoor_temp = round(s.indoor_temp + self._rng.choice((-0.5, 0, 0, 0.5)), 1)
+        s.humidity = max(10, min(90, s.humidity + self._rng.choice((-1, 0, 0, 1))))
+        s.co2 = max(400, s.co2 + self._rng.randint(-15, 15))
+        target = s.heat_setpoint if s.hvac_mode == "HEAT" else s.cool_setpoint
+        s.stage = 0 if s.hvac_mode == "OFF" or abs(s.indoor_temp - target) < 1 else 1
+
+    def respond(self, line: str) -> str:
+        """Return the reply to one command line."""
+        s = self.state
+        if line.startswith(const.CMD_LOGIN):
+            return "OK,ADMIN,NO" if line == self._auth else "ERROR"
+        if line in self.unsupported:
+            return "BAD COMMAND"
+
+        if line == const.CMD_GET_ALL_STATES:
+            self._tick()
+            outdoor = "NA" if s.outdoor_temp is None else f"{s.outdoor_temp:g}"
+            status = s.hvac_mode if s.stage else "OFF"
+            return (
+                f"RAS1:{s.indoor_temp:g},{outdoor},{s.hvac_mode},FAN {s.fan_mode},NO,NO,"
+                f"{s.cool_setpoint},{s.heat_setpoint},{status},{s.stage},NONE"
+            )
+        reads = {
+            const.CMD_GET_TEMP_SCALE: lambda: f"RTS1:{s.scale}",
+            const.CMD_GET_OPERATION_MODE: lambda: f"RNS1:{'ON' if s.manual else 'OFF'}",
+            const.CMD_GET_RELAY_MODE: lambda: f"RMRF1:{s.relay_mode},OFF",
+            const.CMD_GET_HUMIDIFICATION: lambda: "RMHS1:{},{},{}".format(*s.hum),
+            const.CMD_GET_DEHUMIDIFICATION: lambda: "RMDHS1:{},{},{}".format(*s.dehum),
+            const.CMD_GET_RELAY_STATE: lambda: f"RRS1:{s.relay_mode}",
+            const.CMD_GET_SYSTEM_STATE: lambda: f"RSS1:{s.hvac_mode if s.stage else 'OFF'},{s.stage}",
+            const.CMD_GET_HUMIDITY: lambda: "RRHS1:0",
+            const.CMD_GET_OCCUPIED_COOL: lambda: f"ROC1:{s.cool_setpoint}",
+            const.CMD_GET_COOL_STAGES: lambda: f"RCS1:{s.cool_stages}",
+        }
+        if line in reads:
+            return reads[line]()
+        return self._write(line)
+
+    def _write(self, line: str) -> str:
+        """Apply a write command and echo it the way the device does."""
+        s = self.state
+        for prefix in (const.CMD_SET_MODE_MANUAL, const.CMD_SET_MODE_SCHEDULE):
+            if line.startswith(prefix):
+                s.hvac_mode = line[len(prefix):]
+                return f"{line}:{s.hvac_mode}"
+        for prefix in (const.CMD_SET_FAN_MANUAL, const.CMD_SET_FAN_SCHEDULE):
+            if line.startswith(prefix):
+                s.fan_mode = line[len(prefix):]
+                return f"{line}:{s.fan_mode}"
+        for prefix in (const.CMD_SET_HEAT_MANUAL, const.CMD_SET_HEAT_SCHEDULE):
+            if line.startswith(prefix):
+                s.heat_setpoint = int(line[len(prefix):])
+                return f"{line}:{s.heat_setpoint}"
+        for prefix in (const.CMD_SET_COOL_MANUAL, const.CMD_SET_COOL_SCHEDULE):
+            if line.startswith(prefix):
+                s.cool_setpoint = int(line[len(prefix):])
+                return f"{line}:{s.cool_setpoint}"
+        if line.startswith(const.CMD_SET_RELAY_MODE):
+            s.relay_mode = line[len(const.CMD_SET_RELAY_MODE):]
+            return f"{line}:{s.relay_mode}"
+        if line.startswith(const.CMD_SET_DEHUMIDIFICATION):
+            mode, setpoint, variance = line[len(const.CMD_SET_DEHUMIDIFICATION):].split(",")
+            s.dehum = (mode, int(setpoint), int(variance))
+            return f"{line}:{mode}"
+        if line.startswith(const.CMD_SET_HUMIDIFICATION):
+            mode, setpoint, variance = line[len(const.CMD_SET_HUMIDIFICATION):].split(",")
+            s.hum = (mode, int(setpoint), int(variance))
+            return f"{line}:{mode}"
+        return "BAD COMMAND"
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one TCP session."""
+        self.stats.connections += 1
+        authenticated = False
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip()
+                if not command:
+                    continue
+                self.stats.commands += 1
+                if not authenticated and not command.startswith(const.CMD_LOGIN):
+                    reply = "ERROR"
+                else:
+                    reply = self.respond(command)
+                    if command.startswith(const.CMD_LOGIN):
+                        authenticated = reply.startswith("OK")
+                await self._delay()
+                writer.write(f"{reply}\r\n".encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP/1.0-style request."""
+        self.stats.http_requests += 1
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            method, path, *_ = request.decode().split()
+            self._tick()
+            if path == "/index.xml":
+                status, ctype = "200 OK", "text/xml"
+                body = (
+                    f'<?xml version="1.0"?><thermostat><temperature>{self.state.indoor_temp:g}'
+                    f"</temperature><humidity>{self.state.humidity}</humidity>"
+                    f"<mode>{self.state.hvac_mode}</mode></thermostat>"
+                )
+            elif path == "/co2.json" and self.co2_module:
+                status, ctype = "200 OK", "application/json"
+                body = json.dumps({"co2": {
+                    "type": "MODULE", "valid": "true", "in_alert": "false",
+                    "level": str(self.state.co2), "peak_level": "1067", "alert_level": "1100",
+                }})
+            elif path == const.HTTP_SCHEDULE_PATH:
+                status, ctype = "200 OK", "text/xml"
+                days = "".join(
+                    "<day>" + "".join(
+                        f"<period><start>{start}</start><heat>{heat}</heat><cool>{cool}</cool></period>"
+                        for start, heat, cool in self.state.schedule
+                    ) + "</day>"
+                    for _ in range(7)
+                )
+                body = f'<?xml version="1.0"?><schedule>{days}</schedule>'
+            else:
+                status, ctype, body = "404 Not Found", "text/plain", "Not Found"
+            await self._delay()
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+            )
+            if method != "HEAD":
+                writer.write(payload)
+            await writer.drain()
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def start_fleet(
+    count: int = 1,
+    host: str = "127.0.0.1",
+    base_port: int = 0,
+    network: str | None = None,
+    port: int = const.DEFAULT_PORT,
+    http_port: int | None = None,
+    **kwargs,
+) -> list[tuple[ThermostatSimulator, str, int]]:
+    """Start simulators; return ``(simulator, host, tcp_port)`` for each.
+
+    With ``network`` one simulator binds ``port`` on every host address of
+    the range; otherwise ``count`` simulators bind consecutive ports on
+    ``host`` starting at ``base_port`` (0 picks free ports, and HTTP is
+    then only served when ``http_port`` is also 0).
+    """
+    fleet = []
+    if network:
+        hosts = [str(h) for h in ipaddress.ip_network(network, strict=False).hosts()]
+        for address in hosts:
+            sim = ThermostatSimulator(**kwargs)
+            fleet.append((sim, address, await sim.start(address, port, http_port)))
+        return fleet
+
+    for index in range(count):
+        sim = ThermostatSimulator(**kwargs)
+        tcp_port = base_port + index if base_port else 0
+        sim_http = None if http_port is None else (http_port + index if http_port else 0)
+        fleet.append((sim, host, await sim.start(host, tcp_port, sim_http)))
+    return fleet
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run simulators until interrupted."""
+    fleet = await start_fleet(
+        count=args.count,
+        host=args.host,
+        base_port=args.base_port,
+        network=args.network,
+        port=args.port,
+        http_port=args.http_port,
+        username=args.username,
+        password=args.password,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        co2_module=not args.no_co2,
+        unsupported=frozenset(args.unsupported),
+    )
+    for _sim, host, port in fleet:
+        print(f"{host}:{port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description="NetX thermostat protocol simulator")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=20001)
+    parser.add_argument("--network", help="start one simulator per address of this range")
+    parser.add_argument("--port", type=int, default=const.DEFAULT_PORT, help="TCP port with --network")
+    parser.add_argument("--http-port", type=int, help="also serve /index.xml and /co2.json")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--no-co2", action="store_true", help="answer /co2.json with 404")
+    parser.add_argument("--unsupported", nargs="*", default=[], help="read commands to reject")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point."""
+    try:
+        asyncio.run(_serve(build_parser().parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
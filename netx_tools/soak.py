@@ -0,0 +1,415 @@
+"""Soak and load test the client against a fleet of simulated thermostats.
+
+Starts ``--devices`` simulators in a separate process (so they do not
+share the measured event loop), polls every one of them for
+``--duration`` seconds and writes a JSON report::
+
+    python -m netx_tools.soak --devices 500 --duration 300 --interval 30 \\
+        --latency-ms 20 --report soak-500.json
+    python -m netx_tools.soak --devices 500 --report new.json --compare soak-500.json
+
+With Home Assistant installed, each device is polled by a real
+``NetXDataUpdateCoordinator``; otherwise (or with ``--driver api``) a
+loop calls ``NetXThermostatAPI.async_update`` on the coordinator's
+schedule. The report holds event-loop lag, poll-cycle latency, memory
+per device (RSS, and tracemalloc with ``--tracemalloc``), open sockets,
+reconnects and command failures, plus the run parameters so reports of
+different commits can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from netx_tools import PACKAGE_DIR, load_integration
+from netx_tools.simulator import start_fleet
+
+const = load_integration("const")
+api_module = load_integration("api")
+
+ROOT = PACKAGE_DIR.parent.parent
+LAG_INTERVAL = 0.05
+RESOURCE_INTERVAL = 5.0
+
+# Report keys compared by --compare, and whether lower is better
+COMPARED = {
+    ("loop_lag_ms", "p95"): True,
+    ("loop_lag_ms", "max"): True,
+    ("cycle_ms", "p50"): True,
+    ("cycle_ms", "p95"): True,
+    ("cycle_ms", "p99"): True,
+    ("cycles", "failed"): True,
+    ("memory", "rss_per_device_kib"): True,
+    ("memory", "traced_per_device_kib"): True,
+    ("sockets", "peak"): True,
+    ("totals", "reconnects"): True,
+    ("totals", "command_failures"): True,
+}
+
+
+def _percentiles(samples: list[float]) -> dict:
+    """Summarize samples given in seconds, in milliseconds."""
+    if not samples:
+        return {"n": 0}
+    ms = sorted(sample * 1000 for sample in samples)
+
+    def rank(fraction: float) -> float:
+        return round(ms[min(len(ms) - 1, int(fraction * len(ms)))], 2)
+
+    return {
+        "n": len(ms),
+        "mean": round(statistics.fmean(ms), 2),
+        "p50": rank(0.50),
+        "p95": rank(0.95),
+        "p99": rank(0.99),
+        "max": round(ms[-1], 2),
+    }
+
+
+def _rss() -> int | None:
+    """Return the resident set size of this process in bytes (Linux only)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _open_sockets() -> int | None:
+    """Return how many sockets this process holds open (Linux only)."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            count += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            continue
+    return count
+
+
+def _raise_fd_limit() -> None:
+    """Allow as many open files as the hard limit permits."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def _git_revision() -> str | None:
+    """Return the commit the tree is at, if it is a git checkout."""
+    proc = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    return proc.stdout.strip() or None
+
+
+class Recorder:
+    """Collects the measurements of one run."""
+
+    def __init__(self) -> None:
+        """Start with nothing recorded."""
+        self.lags: list[float] = []
+        self.cycles: list[float] = []
+        self.failed = 0
+        self.partial = 0
+        self.socket_peak = 0
+
+    def instrument(self, api) -> None:
+        """Time every update of ``api`` and count the failed ones."""
+        update = api.async_update
+
+        async def timed_update(*args, **kwargs):
+            started = time.time()
+            start = time.perf_counter()
+            state = await update(*args, **kwargs)
+            self.cycles.append(time.perf_counter() - start)
+            if not state.updated_since(started):
+                self.failed += 1
+            elif state.partial:
+                self.partial += 1
+            return state
+
+        api.async_update = timed_update
+
+    async def sample_lag(self) -> None:
+        """Measure how late the loop runs a timer, until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+    async def sample_resources(self) -> None:
+        """Track the socket count peak, until cancelled."""
+        while True:
+            self.socket_peak = max(self.socket_peak, _open_sockets() or 0)
+            await asyncio.sleep(RESOURCE_INTERVAL)
+
+
+async def _start_simulators(args: argparse.Namespace) -> tuple[list[tuple[str, int]], object]:
+    """Start the simulators; return their addresses and a handle to stop them."""
+    if args.in_process:
+        fleet = await start_fleet(
+            count=args.devices,
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+        )
+        return [(host, port) for _sim, host, port in fleet], [sim for sim, _h, _p in fleet]
+
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "netx_tools.simulator",
+        "--count", str(args.devices),
+        "--base-port", "0",
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        cwd=ROOT,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    targets = []
+    while len(targets) < args.devices:
+        line = await proc.stdout.readline()
+        if not line:
+            raise RuntimeError("Simulator process exited early")
+        host, _, port = line.decode().strip().rpartition(":")
+        targets.append((host, int(port)))
+    return targets, proc
+
+
+async def _stop_simulators(handle) -> None:
+    """Stop what ``_start_simulators`` started."""
+    if isinstance(handle, list):
+        for sim in handle:
+            await sim.close()
+        return
+    handle.terminate()
+    await handle.wait()
+
+
+async def _drive_api(args: argparse.Namespace, apis: list) -> None:
+    """Poll every client on the coordinator's schedule until the duration ends."""
+    tick = args.interval / (args.quick_polls + 1)
+    loop = asyncio.get_running_loop()
+    end = loop.time() + args.duration
+
+    async def run(api) -> None:
+        # Spread the first polls over one tick, like entries set up one by one
+        await asyncio.sleep(random.random() * tick)
+        polls = 0
+        while loop.time() < end:
+            started = loop.time()
+            await api.async_update(full=polls % (args.quick_polls + 1) == 0, budget=tick)
+            polls += 1
+            await asyncio.sleep(max(0.0, min(started + tick, end) - loop.time()))
+
+    await asyncio.gather(*(run(api) for api in apis))
+
+
+async def _drive_coordinator(args: argparse.Namespace, apis: list) -> None:
+    """Poll every client through a real coordinator until the duration ends."""
+    from homeassistant.core import HomeAssistant
+
+    coordinator_module = load_integration("coordinator")
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinators = []
+        try:
+            for api in apis:
+                coordinator = coordinator_module.NetXDataUpdateCoordinator(
+                    hass, api, quick_polls=args.quick_polls, poll_interval=args.interval
+                )
+                # A listener keeps the coordinator's refresh schedule running
+                coordinator.async_add_listener(lambda: None)
+                coordinators.append(coordinator)
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+            await asyncio.sleep(args.duration)
+        finally:
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+            await hass.async_stop(force=True)
+
+
+def _has_home_assistant() -> bool:
+    """Return True if Home Assistant can be imported."""
+    try:
+        import homeassistant.helpers.update_coordinator  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    """Run the soak and return its report."""
+    driver = args.driver
+    if driver == "auto":
+        driver = "coordinator" if _has_home_assistant() else "api"
+
+    recorder = Recorder()
+    targets, simulators = await _start_simulators(args)
+    rss_before = _rss()
+    if args.tracemalloc:
+        tracemalloc.start()
+    traced_before = tracemalloc.get_traced_memory()[0] if args.tracemalloc else 0
+
+    apis = []
+    for host, port in targets:
+        api = api_module.NetXThermostatAPI(host, "admin", "admin", port, enable_http=False)
+        recorder.instrument(api)
+        apis.append(api)
+
+    samplers = [
+        asyncio.create_task(recorder.sample_lag()),
+        asyncio.create_task(recorder.sample_resources()),
+    ]
+    started = time.monotonic()
+    try:
+        if driver == "coordinator":
+            await _drive_coordinator(args, apis)
+        else:
+            await _drive_api(args, apis)
+        rss_after = _rss()
+        traced_after = tracemalloc.get_traced_memory()[0] if args.tracemalloc else 0
+        sockets = _open_sockets()
+    finally:
+        for task in samplers:
+            task.cancel()
+        await asyncio.gather(*samplers, return_exceptions=True)
+        for api in apis:
+            await api.disconnect()
+        if args.tracemalloc:
+            tracemalloc.stop()
+        await _stop_simulators(simulators)
+    elapsed = time.monotonic() - started
+
+    devices = len(apis)
+    waits = [api.scheduler.mean_wait for api in apis]
+    return {
+        "generated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "driver": driver,
+            "devices": devices,
+            "duration_s": args.duration,
+            "interval_s": args.interval,
+            "quick_polls": args.quick_polls,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "in_process": args.in_process,
+        },
+        "elapsed_s": round(elapsed, 1),
+        "loop_lag_ms": _percentiles(recorder.lags),
+        "cycle_ms": _percentiles(recorder.cycles),
+        "cycles": {
+            "total": len(recorder.cycles),
+            "failed": recorder.failed,
+            "partial": recorder.partial,
+            "per_second": round(len(recorder.cycles) / elapsed, 1) if elapsed else None,
+        },
+        "memory": {
+            "rss_mib": round(rss_after / 2**20, 1) if rss_after else None,
+            "rss_per_device_kib": (
+                round((rss_after - rss_before) / devices / 1024, 1)
+                if rss_after and rss_before and devices
+                else None
+            ),
+            "traced_per_device_kib": (
+                round((traced_after - traced_before) / devices / 1024, 1)
+                if args.tracemalloc and devices
+                else None
+            ),
+        },
+        "sockets": {"end": sockets, "peak": max(recorder.socket_peak, sockets or 0)},
+        "totals": {
+            "reconnects": sum(max(0, api.connects - 1) for api in apis),
+            "never_connected": sum(api.connects == 0 for api in apis),
+            "command_failures": sum(api.command_failures for api in apis),
+            "mean_queue_wait_ms": round(statistics.fmean(waits) * 1000, 2) if waits else None,
+        },
+    }
+
+
+def _compare(report: dict, baseline: dict) -> None:
+    """Print the compared metrics of two reports side by side."""
+    print(f"{'metric':<34} {'baseline':>10} {'this run':>10} {'change':>8}")
+    for (section, key), lower_is_better in COMPARED.items():
+        old = baseline.get(section, {}).get(key)
+        new = report.get(section, {}).get(key)
+        if old is None or new is None:
+            continue
+        change = "" if not old else f"{(new - old) / old * 100:+.0f}%"
+        worse = (new > old) if lower_is_better else (new < old)
+        flag = " !" if worse and old and abs(new - old) / old > 0.1 else ""
+        print(f"{section + '.' + key:<34} {old:>10} {new:>10} {change:>8}{flag}")
+
+
+def _print_summary(report: dict) -> None:
+    """Print the headline numbers of a report."""
+    params, lag, cycle = report["params"], report["loop_lag_ms"], report["cycle_ms"]
+    print(
+        f"{params['devices']} devices, {params['driver']} driver, {report['elapsed_s']}s: "
+        f"{report['cycles']['total']} cycles ({report['cycles']['failed']} failed, "
+        f"{report['cycles']['partial']} partial)"
+    )
+    print(f"  loop lag ms   p50 {lag.get('p50')}  p95 {lag.get('p95')}  max {lag.get('max')}")
+    print(f"  cycle ms      p50 {cycle.get('p50')}  p95 {cycle.get('p95')}  p99 {cycle.get('p99')}")
+    print(f"  memory        {report['memory']}")
+    print(f"  sockets       {report['sockets']}")
+    print(f"  totals        {report['totals']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds to poll for")
+    parser.add_argument("--interval", type=float, default=const.UPDATE_INTERVAL)
+    parser.add_argument("--quick-polls", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="simulator reply latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="simulator reply jitter")
+    parser.add_argument("--driver", choices=("auto", "coordinator", "api"), default="auto")
+    parser.add_argument(
+        "--in-process", action="store_true", help="run the simulators on the measured loop"
+    )
+    parser.add_argument("--tracemalloc", action="store_true", help="also trace Python allocations")
+    parser.add_argument("--report", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="compare with an earlier report")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point."""
+    args = build_parser().parse_args(argv)
+    _raise_fd_limit()
+    try:
+        report = asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        return 1
+    _print_summary(report)
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        _compare(report, json.loads(args.compare.read_text()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())